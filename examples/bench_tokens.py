@@ -0,0 +1,80 @@
+"""Micro-benchmark for p8.utils.tokens — exact, cached/batched and approximate paths.
+
+Builds a corpus of prose-like chunks plus a few large documents and times:
+
+1. ``estimate_tokens`` one text at a time (cold — what callers used to do)
+2. ``estimate_tokens_many`` cold (one ``encode_ordinary_batch`` across threads)
+3. ``estimate_tokens_many`` warm (every text served from the LRU)
+4. ``estimate_tokens(..., approximate=True)`` on the large documents,
+   with the observed error against the exact count
+
+Usage:
+    uv run python examples/bench_tokens.py [--chunks 2000] [--doc-mb 4]
+"""
+
+import argparse
+import random
+import time
+
+from p8.utils import tokens
+
+_WORDS = (
+    "the memory graph links moments resources and sessions so agents can recall "
+    "what happened when and why; embeddings rank candidates while the kv store "
+    "resolves keys — données, überprüfung, 東京, 123.45, snake_case_names, URLs"
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _reset_cache() -> None:
+    tokens._count_cache.clear()
+
+
+def _timed(label: str, fn):
+    t0 = time.perf_counter()
+    result = fn()
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"  {label:<38} {ms:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--doc-mb", type=float, default=4.0)
+    parser.add_argument("--model", default="gpt-4o")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    chunks = [_text(rng, rng.randint(80, 600)) for _ in range(args.chunks)]
+    doc_words = int(args.doc_mb * 1_000_000 / 7)
+    docs = [_text(rng, doc_words) for _ in range(3)]
+    corpus = chunks + docs
+    tokens.estimate_tokens("warm up encoder", args.model)
+
+    print(f"{len(chunks)} chunks + {len(docs)} × {args.doc_mb:g} MB documents, model={args.model}")
+
+    _reset_cache()
+    serial = _timed("estimate_tokens (serial, cold)",
+                    lambda: [tokens.estimate_tokens(t, args.model) for t in corpus])
+    _reset_cache()
+    batched = _timed("estimate_tokens_many (cold)",
+                     lambda: tokens.estimate_tokens_many(corpus, args.model))
+    _timed("estimate_tokens_many (warm LRU)",
+           lambda: tokens.estimate_tokens_many(corpus, args.model))
+    assert serial == batched, "batched counts differ from serial counts"
+
+    approx = _timed("estimate_tokens approximate (docs)",
+                    lambda: [tokens.estimate_tokens(d, args.model, approximate=True) for d in docs])
+    _timed("estimate_tokens exact (docs, cold)",
+           lambda: (_reset_cache(), [tokens.estimate_tokens(d, args.model) for d in docs])[1])
+    for exact, est in zip(batched[-len(docs):], approx):
+        print(f"    approx {est:>10,}  exact {exact:>10,}  error {100 * (est - exact) / exact:+.2f}%")
+    print(f"  cache: {tokens.token_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
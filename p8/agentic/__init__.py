@@ -13,7 +13,7 @@ from p8.agentic.core_agents import (
     DREAMING_AGENT,
     GENERAL_AGENT,
 )
-from p8.agentic.delegate import get_child_event_sink, set_child_event_sink
+from p8.agentic.delegate import EventChannel, get_child_event_sink, set_child_event_sink
 from p8.agentic.routing import DefaultClassifier, Router, RouterClassifier, default_router
 from p8.agentic.streaming import (
     format_child_event,
@@ -77,6 +77,7 @@ __all__ = [
     "DefaultClassifier",
     "default_router",
     # Delegation
+    "EventChannel",
     "get_child_event_sink",
     "set_child_event_sink",
 ]
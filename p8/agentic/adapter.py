@@ -45,7 +45,7 @@ from p8.agentic.types import ContextAttributes, ContextInjector, RoutingState
 from p8.ontology.types import Moment, Schema
 from p8.services.database import Database
 from p8.services.encryption import EncryptionService
-from p8.services.memory import MemoryService, format_moment_context
+from p8.services.memory import MemoryService, default_context_cache, format_moment_context
 from p8.services.repository import Repository
 
 
@@ -209,7 +209,7 @@ class AgentAdapter:
         self.schema = schema
         self.db = db
         self.encryption = encryption
-        self.memory = MemoryService(db, encryption)
+        self.memory = MemoryService(db, encryption, context_cache=default_context_cache())
         self.agent_schema = AgentSchema.from_schema_row(schema)
 
         # For built-in agents, propagate _source_output_model from code definition
@@ -261,6 +261,11 @@ class AgentAdapter:
     # Tool resolution
     # ------------------------------------------------------------------
 
+    @property
+    def has_delegate_tools(self) -> bool:
+        """True when the schema declares a delegate tool (e.g. ask_agent)."""
+        return any(t.name in DELEGATE_TOOL_NAMES for t in self.agent_schema.tools)
+
     def _get_delegate_tools(self) -> list:
         """Get delegate tool functions declared in the schema.
 
@@ -661,101 +666,88 @@ class AgentAdapter:
     ) -> None:
         """Persist a conversation turn — user, tool_call(s), assistant.
 
-        When all_messages contains tool calls, inserts messages individually
-        in order: user → tool_call(s) → assistant. Tool call rows store both
-        the call metadata (name, args, id) in tool_calls JSONB and the tool
-        response in content. This is especially important for ask_agent
+        Everything goes through rem_persist_turn: one statement, one
+        transaction, one round-trip regardless of how many tools ran.
+        When all_messages contains tool calls, tool_call/tool_response rows
+        are passed as an ordered array and stored between the user and
+        assistant messages. Tool call rows store the call metadata (name,
+        args, id) in tool_calls JSONB; tool_response rows store the tool
+        output in content. This is especially important for ask_agent
         delegation where structured output is the artifact.
 
-        When no tool calls are present, uses rem_persist_turn for efficiency
-        (single SQL round-trip).
-
         When tenant_id is provided, message content is encrypted with the
-        tenant's DEK and encryption_level is stamped on the message rows.
-        Sealed mode is capped to 'platform' for chat messages — the server
-        must be able to decrypt history for the LLM.
+        tenant's DEK in a single pass (DEK and mode resolved once per turn)
+        and encryption_level is stamped on every row. Sealed mode is capped
+        to 'platform' for chat messages — the server must be able to decrypt
+        history for the LLM.
         """
         from p8.ontology.types import Message
+        from p8.utils.tokens import aestimate_tokens_many
         from uuid import uuid4
 
-        # Resolve encryption mode
+        # Resolve encryption mode once for the whole turn
         encryption_level: str | None = None
-        store_user = user_prompt
-        store_assistant = assistant_text
-        user_msg_id: UUID | None = None
-        asst_msg_id: UUID | None = None
+        encrypt = False
         if tenant_id:
             await self.encryption.get_dek(tenant_id)
             mode = await self.encryption.get_tenant_mode(tenant_id)
             if mode == "sealed":
                 mode = "platform"
             encryption_level = mode if mode != "disabled" else "disabled"
-            if mode in ("platform", "client"):
-                user_msg_id = uuid4()
-                asst_msg_id = uuid4()
-                user_data = self.encryption.encrypt_fields(
-                    Message, {"id": user_msg_id, "content": user_prompt}, tenant_id,
-                )
-                store_user = user_data.get("content", user_prompt)
-                asst_data = self.encryption.encrypt_fields(
-                    Message, {"id": asst_msg_id, "content": assistant_text}, tenant_id,
-                )
-                store_assistant = asst_data.get("content", assistant_text)
+            encrypt = mode in ("platform", "client")
+
+        def _seal(msg_id: UUID, content: str) -> str:
+            # Message id is part of the AAD, so ids are generated up front
+            if not encrypt:
+                return content
+            data = self.encryption.encrypt_fields(
+                Message, {"id": msg_id, "content": content}, tenant_id,
+            )
+            return data.get("content", content)  # type: ignore[no-any-return]
 
-        # Extract tool calls from pydantic-ai messages
-        tool_calls = self._extract_tool_calls(all_messages)
+        user_msg_id: UUID | None = uuid4() if encrypt else None
+        asst_msg_id: UUID | None = uuid4() if encrypt else None
+        store_user = _seal(user_msg_id, user_prompt) if user_msg_id else user_prompt
+        store_assistant = _seal(asst_msg_id, assistant_text) if asst_msg_id else assistant_text
 
-        if tool_calls:
-            # Slow path: insert user, tool_call/tool_response pairs, assistant.
-            # Pass plain text — Repository.upsert() handles encryption via
-            # tenant_id. Using store_user/store_assistant here would double-encrypt.
-            await self.memory.persist_message(
-                session_id, "user", user_prompt,
-                user_id=user_id, tenant_id=tenant_id,
-            )
-            for tc in tool_calls:
-                # tool_call row — call metadata, no content
-                await self.memory.persist_message(
-                    session_id, "tool_call", None,
-                    user_id=user_id, tenant_id=tenant_id,
-                    token_count=0,
-                    agent_name=agent_name,
-                    tool_calls={
-                        "name": tc["tool_name"],
-                        "id": tc["tool_call_id"],
-                        "arguments": tc["arguments"],
-                    },
-                )
-                # tool_response row — the result content
-                if tc.get("result") is not None:
-                    await self.memory.persist_message(
-                        session_id, "tool_response", tc["result"],
-                        user_id=user_id, tenant_id=tenant_id,
-                        agent_name=agent_name,
-                        tool_calls={
-                            "name": tc["tool_name"],
-                            "id": tc["tool_call_id"],
-                        },
-                    )
-            # Assistant message with usage metrics
-            await self.memory.persist_message(
-                session_id, "assistant", assistant_text,
-                user_id=user_id, tenant_id=tenant_id,
-                agent_name=agent_name, model=model,
-                input_tokens=input_tokens, output_tokens=output_tokens,
-                latency_ms=latency_ms, encryption_level=encryption_level,
-            )
-        else:
-            # Fast path: single SQL round-trip via rem_persist_turn
-            await self.db.rem_persist_turn(
-                session_id, store_user, store_assistant,
-                user_id=user_id, tenant_id=tenant_id,
-                moment_threshold=moment_threshold if not background_compaction else 0,
-                input_tokens=input_tokens, output_tokens=output_tokens,
-                latency_ms=latency_ms, model=model, agent_name=agent_name,
-                encryption_level=encryption_level,
-                user_msg_id=user_msg_id, asst_msg_id=asst_msg_id,
-            )
+        # tool_call row carries call metadata only; tool_response row the result
+        tool_calls = self._extract_tool_calls(all_messages)
+        result_tokens = iter(await aestimate_tokens_many(
+            [tc["result"] for tc in tool_calls if tc.get("result") is not None]
+        ))
+        tool_messages: list[dict] = []
+        for tc in tool_calls:
+            tool_messages.append({
+                "id": uuid4(),
+                "message_type": "tool_call",
+                "content": None,
+                "token_count": 0,
+                "tool_calls": {
+                    "name": tc["tool_name"],
+                    "id": tc["tool_call_id"],
+                    "arguments": tc["arguments"],
+                },
+            })
+            if tc.get("result") is not None:
+                resp_id = uuid4()
+                tool_messages.append({
+                    "id": resp_id,
+                    "message_type": "tool_response",
+                    "content": _seal(resp_id, tc["result"]),
+                    "token_count": next(result_tokens),
+                    "tool_calls": {"name": tc["tool_name"], "id": tc["tool_call_id"]},
+                })
+
+        await self.db.rem_persist_turn(
+            session_id, store_user, store_assistant,
+            user_id=user_id, tenant_id=tenant_id,
+            moment_threshold=moment_threshold if not background_compaction else 0,
+            input_tokens=input_tokens, output_tokens=output_tokens,
+            latency_ms=latency_ms, model=model, agent_name=agent_name,
+            encryption_level=encryption_level,
+            user_msg_id=user_msg_id, asst_msg_id=asst_msg_id,
+            tool_messages=tool_messages or None,
+        )
 
         if background_compaction:
             import asyncio
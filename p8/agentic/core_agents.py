@@ -249,8 +249,9 @@ To delegate: `ask_agent(agent_name="researcher", input_text="<user's request>")`
 # Dreaming agent — background reflective processing
 #
 # Lifecycle:
-#   1. pg_cron hourly → enqueue_dreaming_tasks() finds users with new messages
-#      since their last dreaming run and inserts a task into task_queue.
+#   1. pg_cron twice daily → enqueue_dreaming_tasks() finds users whose
+#      user_activity watermark is past their last dreaming run and inserts a
+#      task into task_queue.
 #   2. Worker claims the task → QueueService.check_task_quota() runs a
 #      pre-flight check on "dreaming_minutes" to enforce plan limits.
 #   3. DreamingHandler.handle() executes two phases:
@@ -7,13 +7,15 @@ Producer (``ask_agent``):
     Reads the event sink via ``get_child_event_sink()``. If a sink exists,
     runs the child agent with ``agent.iter()``, iterating nodes and pushing
     ``child_content``, ``child_tool_start``, and ``child_tool_result`` dicts
-    to the queue in real-time as tokens arrive.
+    to the channel in real-time as tokens arrive.
 
 Consumer (``chat.py`` router):
-    Creates an ``asyncio.Queue``, stores it via ``set_child_event_sink()``,
-    then runs the parent agent with ``AGUIAdapter.run_stream()``. A
-    multiplexer wraps the AG-UI event stream and races each parent event
-    against the child queue using ``asyncio.wait(FIRST_COMPLETED)``.
+    Only when the agent declares a delegate tool, creates an
+    ``EventChannel``, stores it via ``set_child_event_sink()``, then runs the
+    parent agent with ``AGUIAdapter.run_stream()``. ``EventChannel.merge()``
+    pumps the parent's AG-UI events into the same bounded queue the children
+    write to, so the consumer just awaits one ``get()`` — no timers, no
+    polling, and a slow client applies backpressure to both producers.
     Child events are emitted as AG-UI ``CustomEvent`` objects.
 
 This decouples the child's streaming output from the parent's tool
@@ -24,30 +26,105 @@ agent content to the client.
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Callable
 from contextvars import ContextVar
-from typing import Any
+from typing import Any, TypeVar
 
 from p8.agentic.streaming import format_child_event
 
+T = TypeVar("T")
+
+
+# ---------------------------------------------------------------------------
+# Fan-in channel
+# ---------------------------------------------------------------------------
+
+_PARENT_DONE = object()
+
+
+class EventChannel:
+    """Bounded fan-in of one parent event stream and any number of child producers.
+
+    Children call ``await channel.put(event)`` (same interface as the
+    ``asyncio.Queue`` sink this replaces). ``merge()`` forwards the parent's
+    events through the same queue from a pump task, so arrival order is
+    preserved and the consumer blocks on a single ``get()``.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self._queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue(maxsize)
+        self._error: BaseException | None = None
+
+    async def put(self, event: dict) -> None:
+        """Push a child event; waits while the channel is full."""
+        await self._queue.put((True, event))
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def merge(
+        self,
+        parent: AsyncIterable[T],
+        on_child: Callable[[dict], T],
+    ) -> AsyncIterator[T]:
+        """Yield parent events and ``on_child(event)`` for child events, in arrival order.
+
+        Ends when the parent stream ends, after draining child events that
+        were already queued. A parent exception is re-raised here.
+        """
+        pump = asyncio.create_task(self._pump(parent))
+        try:
+            while True:
+                is_child, item = await self._queue.get()
+                if is_child:
+                    yield on_child(item)
+                elif item is _PARENT_DONE:
+                    break
+                else:
+                    yield item
+            if self._error is not None:
+                raise self._error
+            while not self._queue.empty():
+                is_child, item = self._queue.get_nowait()
+                if is_child:
+                    yield on_child(item)
+        finally:
+            if not pump.done():
+                pump.cancel()
+                try:
+                    await pump
+                except asyncio.CancelledError:
+                    pass
+
+    async def _pump(self, parent: AsyncIterable[Any]) -> None:
+        try:
+            async for event in parent:
+                await self._queue.put((False, event))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._error = e
+        await self._queue.put((False, _PARENT_DONE))
+
 
 # ---------------------------------------------------------------------------
 # Child event sink (context variable)
 # ---------------------------------------------------------------------------
 
-_child_event_sink: ContextVar[asyncio.Queue[dict] | None] = ContextVar(
+_child_event_sink: ContextVar[EventChannel | None] = ContextVar(
     "child_event_sink", default=None
 )
 
 
-def get_child_event_sink() -> asyncio.Queue[dict] | None:
-    """Get the current child event sink queue, if set by a parent."""
+def get_child_event_sink() -> EventChannel | None:
+    """Get the current child event sink, if set by a parent."""
     return _child_event_sink.get()
 
 
-def set_child_event_sink(queue: asyncio.Queue[dict] | None) -> asyncio.Queue[dict] | None:
+def set_child_event_sink(channel: EventChannel | None) -> EventChannel | None:
     """Set (or clear) the child event sink. Returns previous value for restoration."""
     previous = _child_event_sink.get()
-    _child_event_sink.set(queue)
+    _child_event_sink.set(channel)
     return previous
 
 
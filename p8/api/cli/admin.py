@@ -40,7 +40,7 @@ _TASK_TYPES = {
     "dreaming": "qms-dreaming-enqueue (hourly)",
     "news": "qms-news-enqueue (daily 06:00 UTC) → ReadingSummaryHandler",
     "file_processing": "on-demand (file upload)",
-    "scheduled": "on-demand (kv_rebuild, embedding_backfill)",
+    "scheduled": "on-demand (kv_rebuild, embedding_backfill); qms-vector-indexes-enqueue (weekly)",
 }
 
 # Module-level flag set by the callback or per-command --local
@@ -877,6 +877,49 @@ def enqueue(
     _run(_enqueue_task(UUID(user_id), task_type, delay, None))
 
 
+# ── Vector Indexes ───────────────────────────────────────────────────────────
+
+
+async def _vector_indexes(apply: bool, min_rows: int | None):
+    async with _admin_services() as (db, _enc, settings, *_rest):
+        from p8.services.vector_indexes import VectorIndexManager
+
+        manager = VectorIndexManager(db, min_rows=min_rows or settings.vector_index_min_tenant_rows)
+        await manager.refresh_stats()
+        actions = await manager.plan()
+        if not actions:
+            _con.print("[green]Partial HNSW indexes match tenant sizes[/green]")
+            return
+
+        table = Table(title=f"Vector index plan (min rows {manager.min_rows:,})")
+        table.add_column("Action")
+        table.add_column("Table")
+        table.add_column("Tenant")
+        table.add_column("Rows", justify="right")
+        table.add_column("Index")
+        for a in actions:
+            style = "green" if a.action == "create" else "yellow"
+            table.add_row(Text(a.action, style=style), a.table, a.tenant_id, f"{a.row_count:,}", a.index_name)
+        _con.print(table)
+
+        if not apply:
+            _con.print("[dim]Dry run — pass --apply to build/drop[/dim]")
+            return
+        done = await manager.apply(actions)
+        _con.print(f"[green]{len(done)}/{len(actions)} applied[/green]")
+
+
+@admin_app.command("vector-indexes")
+def vector_indexes(
+    apply: bool = typer.Option(False, "--apply", help="Build/drop indexes (default: show plan only)"),
+    min_rows: Optional[int] = typer.Option(None, "--min-rows", help="Override P8_VECTOR_INDEX_MIN_TENANT_ROWS"),
+    local: bool = typer.Option(False, "--local", "-L", help="Target local docker-compose DB instead of remote"),
+):
+    """Plan (or --apply) per-tenant partial HNSW indexes for large tenants."""
+    _set_local(local)
+    _run(_vector_indexes(apply, min_rows))
+
+
 # ── Heal Jobs ────────────────────────────────────────────────────────────────
 
 
@@ -33,10 +33,13 @@ _IGNORE_TABLES = {
 }
 _IGNORE_FUNCTIONS = {
     "seed_table_schemas",    # contains hardcoded schema list per instance
+    "rem_table_has_category",  # table list baked in at install time
 }
 _IGNORE_INDEX_PREFIXES = (
     "pg_",                   # system catalog indexes
 )
+# Per-tenant partial HNSW indexes (VectorIndexManager) depend on tenant sizes
+_TENANT_INDEX_RE = re.compile(r"^idx_embeddings_.+_t_[0-9a-f]{12}$")
 _MIGRATIONS_DIR = Path(__file__).resolve().parent.parent.parent.parent / "sql" / "migrations"
 
 
@@ -187,6 +190,8 @@ async def _snapshot(dsn: str, label: str = "database") -> dict:
         for r in await conn.fetch(_INDEXES_QUERY):
             if any(r["indexname"].startswith(p) for p in _IGNORE_INDEX_PREFIXES):
                 continue
+            if _TENANT_INDEX_RE.match(r["indexname"]):
+                continue
             indexes[r["indexname"]] = dict(r)
 
         functions: dict[str, dict] = {}
@@ -97,6 +97,9 @@ async def lifespan(app: FastAPI):
             worker_task = asyncio.create_task(worker.run())
             app.state.worker = worker
 
+        # Spawn warm extraction workers so the first upload skips kreuzberg import
+        await content_service.prewarm_extraction()
+
         auth = AuthService(db, encryption, settings)
         init_tools(db, encryption)
 
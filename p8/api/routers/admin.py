@@ -7,6 +7,8 @@ from fastapi import APIRouter, Depends, Request
 from p8.api.deps import get_db, get_encryption
 from p8.services.database import Database
 from p8.services.encryption import EncryptionService
+from p8.services.memory import default_context_cache
+from p8.services.repository import statement_cache
 
 router = APIRouter()
 
@@ -134,6 +136,16 @@ async def task_queue_stats(db: Database = Depends(get_db)):
     return {f"{r['tier']}/{r['status']}": r["count"] for r in rows}
 
 
+@router.get("/cache/stats")
+async def cache_stats(db: Database = Depends(get_db)):
+    """In-process cache counters for this API pod."""
+    return {
+        "query_embeddings": db.query_engine.embedding_cache.stats(),
+        "repository_statements": statement_cache.stats(),
+        "session_context": cache.stats() if (cache := default_context_cache()) else None,
+    }
+
+
 @router.post("/report")
 async def send_report(
     request: Request,
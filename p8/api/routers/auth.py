@@ -712,7 +712,9 @@ async def mobile_google_drive_select_folder(request: Request, body: SelectFolder
 
     rows = await auth.db.fetch(
         "UPDATE storage_grants"
-        " SET provider_folder_id = $1, folder_name = $2, auto_sync = true"
+        " SET provider_folder_id = $1, folder_name = $2, auto_sync = true,"
+        # A new folder starts with a full listing, not the old changes cursor
+        "     sync_cursor = CASE WHEN provider_folder_id IS DISTINCT FROM $1 THEN NULL ELSE sync_cursor END"
         " WHERE user_id_ref = $3 AND provider = 'google-drive' AND status = 'active'"
         " RETURNING id",
         body.folder_id, body.folder_name, current.user_id,
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import time
@@ -22,7 +21,7 @@ from ag_ui.core.events import (
 )
 
 from p8.agentic.adapter import DEFAULT_AGENT_NAME
-from p8.agentic.delegate import set_child_event_sink
+from p8.agentic.delegate import EventChannel, set_child_event_sink
 from p8.api.controllers.chat import ChatController
 from p8.api.deps import get_db, get_encryption, get_optional_user
 from p8.api.tools import set_tool_context
@@ -70,20 +69,6 @@ def _extract_user_prompt(body: dict) -> str:
     return ""
 
 
-async def _get_child_event_with_timeout(
-    queue: asyncio.Queue,
-    timeout: float = 0.05,
-) -> dict | None:
-    """Read from the child event queue with a short timeout.
-
-    Returns None on timeout (no child event available).
-    """
-    try:
-        return await asyncio.wait_for(queue.get(), timeout=timeout)
-    except asyncio.TimeoutError:
-        return None
-
-
 def _child_event_to_agui(event: dict) -> CustomEvent:
     """Convert a child event dict to an AG-UI CustomEvent."""
     return CustomEvent(
@@ -92,82 +77,18 @@ def _child_event_to_agui(event: dict) -> CustomEvent:
     )
 
 
-async def _merged_event_stream(
+def _merged_event_stream(
     agui_stream: AsyncIterator,
-    child_sink: asyncio.Queue,
+    child_sink: EventChannel,
 ) -> AsyncIterator:
     """Multiplex the parent's AG-UI event stream with child events.
 
-    Uses ``asyncio.wait(FIRST_COMPLETED)`` to race the next parent AG-UI
-    event against the next child event from the queue. Whichever arrives
-    first is yielded immediately, enabling real-time interleaving of
-    child agent content tokens during tool execution.
-
-    When the parent stream ends (StopAsyncIteration), drains any remaining
-    child events from the queue before returning.
+    Both sides feed ``child_sink`` (parent via a pump task, children via
+    ``ask_agent``), so events are yielded in arrival order as soon as they
+    are produced, enabling real-time interleaving of child agent content
+    tokens during tool execution. Child events become AG-UI CustomEvents.
     """
-    parent_iter = agui_stream.__aiter__()
-    parent_done = False
-
-    # Start initial tasks
-    pending_parent = asyncio.ensure_future(_anext_or_sentinel(parent_iter))
-    pending_child = asyncio.ensure_future(
-        _get_child_event_with_timeout(child_sink, timeout=0.05)
-    )
-
-    while not parent_done:
-        # Race parent event vs child event
-        done, _ = await asyncio.wait(
-            {pending_parent, pending_child},
-            return_when=asyncio.FIRST_COMPLETED,
-        )
-
-        for task in done:
-            if task is pending_parent:
-                result = task.result()
-                if result is _SENTINEL:
-                    parent_done = True
-                else:
-                    yield result
-                    # Schedule next parent event
-                    pending_parent = asyncio.ensure_future(
-                        _anext_or_sentinel(parent_iter)
-                    )
-
-            elif task is pending_child:
-                child_event = task.result()
-                if child_event is not None:
-                    yield _child_event_to_agui(child_event)
-                # Schedule next child event (always, even on timeout)
-                pending_child = asyncio.ensure_future(
-                    _get_child_event_with_timeout(child_sink, timeout=0.05)
-                )
-
-    # Cancel pending child task
-    pending_child.cancel()
-    try:
-        await pending_child
-    except (asyncio.CancelledError, Exception):
-        pass
-
-    # Drain remaining child events
-    while True:
-        try:
-            event = child_sink.get_nowait()
-            yield _child_event_to_agui(event)
-        except asyncio.QueueEmpty:
-            break
-
-
-_SENTINEL = object()
-
-
-async def _anext_or_sentinel(aiter):
-    """Get next item from async iterator, returning _SENTINEL on StopAsyncIteration."""
-    try:
-        return await aiter.__anext__()
-    except StopAsyncIteration:
-        return _SENTINEL
+    return child_sink.merge(agui_stream, _child_event_to_agui)
 
 
 @router.post("/{chat_id}")
@@ -266,9 +187,9 @@ async def chat(
     request._body = json.dumps(body).encode()
     user_prompt = _extract_user_prompt(body)
 
-    # Create child event sink for delegation streaming
-    child_sink: asyncio.Queue = asyncio.Queue()
-    previous_sink = set_child_event_sink(child_sink)
+    # Child event sink only when the agent can delegate (ask_agent)
+    child_sink = EventChannel() if ctx.adapter.has_delegate_tools else None
+    previous_sink = set_child_event_sink(child_sink) if child_sink else None
 
     stream_start = time.monotonic()
 
@@ -311,7 +232,8 @@ async def chat(
             logger.exception("Failed to persist turn or track usage")
         finally:
             # Restore previous event sink
-            set_child_event_sink(previous_sink)
+            if child_sink is not None:
+                set_child_event_sink(previous_sink)
 
     try:
         # Option 2: build adapter, run_stream, wrap with multiplexer
@@ -333,10 +255,12 @@ async def chat(
         )
 
         # Wrap with multiplexer to interleave child events
-        merged_stream = _merged_event_stream(agui_stream, child_sink)
+        if child_sink is not None:
+            agui_stream = _merged_event_stream(agui_stream, child_sink)
 
-        return adapter.streaming_response(merged_stream)
+        return adapter.streaming_response(agui_stream)
     except Exception:
         # Clean up event sink on error
-        set_child_event_sink(previous_sink)
+        if child_sink is not None:
+            set_child_event_sink(previous_sink)
         raise
@@ -1,23 +1,29 @@
 """Content upload endpoint — file → extract → chunk → persist.
 
 Small files (below ``file_processing_threshold_bytes``) are processed inline
-during the request.  Larger files are uploaded to S3 and enqueued for a
-background worker via QueueService.
+during the request.  Larger files are streamed to S3 from the upload's spool
+file and enqueued for a background worker via QueueService.  Downloads are
+streamed with Range / conditional request support, so API memory does not
+grow with file size.
 """
 
 from __future__ import annotations
 
 import logging
+import os
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
 from pathlib import Path
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, Form
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 
 from p8.api.deps import CurrentUser, get_db, get_encryption, get_optional_user
 from p8.ontology.types import File as FileEntity
 from p8.services.database import Database
 from p8.services.encryption import EncryptionService
+from p8.services.files import FileService, FileStat
 from p8.services.repository import Repository
 from p8.services.usage import check_quota, get_user_plan
 
@@ -49,12 +55,11 @@ async def upload_content(
     """
     settings = request.app.state.settings
     content_service = request.app.state.content_service
-    data = await file.read()
+    size = _upload_size(file)
     tag_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
 
     # Fix MIME type: clients often send application/octet-stream; fall back to
     # filename-based detection so Kreuzberg gets a usable type.
-    from p8.services.files import FileService
     mime = file.content_type
     if not mime or mime == "application/octet-stream":
         mime = FileService.mime_type_from_path(file.filename or "upload")
@@ -64,24 +69,25 @@ async def upload_content(
     if user:
         plan_id = await get_user_plan(db, user.user_id, user.tenant_id)
         status = await check_quota(db, user.user_id, "storage_bytes", plan_id)
-        if status.used + len(data) > status.limit:
+        if status.used + size > status.limit:
             raise HTTPException(
                 429,
                 detail={
                     "error": "storage_quota_exceeded",
                     "used": status.used,
                     "limit": status.limit,
-                    "file_size": len(data),
+                    "file_size": size,
                     "message": "Storage limit reached. Upgrade your plan for more storage.",
                 },
             )
 
     threshold = settings.file_processing_threshold_bytes
 
-    if len(data) <= threshold:
+    if size <= threshold:
         # ── Inline processing ──────────────────────────────────────────
         from p8.services.content import ContentProcessingError
 
+        data = await file.read()
         try:
             result = await content_service.ingest(
                 data,
@@ -121,17 +127,16 @@ async def upload_content(
     filename = file.filename or "upload"
     mime_type = mime
     key = s3_key or filename
-    uri = await file_service.write_to_bucket(key, data)
+    # Multipart upload straight from the spooled temp file — never in memory
+    await file.seek(0)
+    uri = await file_service.write_fileobj_to_bucket(key, file.file)
 
     # Persist a File entity so enqueue_file_task can look it up
-    from p8.ontology.types import File as FileEntity
-    from p8.services.repository import Repository
-
     file_entity = FileEntity(
         name=Path(filename).stem,
         uri=uri,
         mime_type=mime_type,
-        size_bytes=len(data),
+        size_bytes=size,
         tenant_id=user.tenant_id if user else None,
         user_id=user.user_id if user else None,
         tags=tag_list,
@@ -147,7 +152,7 @@ async def upload_content(
     )
     log.info(
         "Queued file %s (%d bytes) as task %s",
-        filename, len(data), task_id,
+        filename, size, task_id,
     )
 
     return {
@@ -170,6 +175,10 @@ async def download_file(
 
     Pass ``?thumbnail=true`` to get the generated thumbnail instead of the
     original file.  Falls back to the original if no thumbnail exists.
+
+    The body is streamed in chunks (ranged S3 GETs), with ``Range``,
+    ``ETag`` / ``If-None-Match``, ``If-Modified-Since`` and ``If-Range``
+    support so clients can seek in video and resume downloads.
     """
     repo = Repository(FileEntity, db, encryption)
     file_entity = await repo.get(file_id)
@@ -182,9 +191,10 @@ async def download_file(
 
     # Serve thumbnail if requested and available
     if thumbnail and file_entity.thumbnail_uri:
-        data = await file_service.read(file_entity.thumbnail_uri)
-        return Response(
-            content=data,
+        return await _stream_file(
+            request,
+            file_service,
+            file_entity.thumbnail_uri,
             media_type="image/jpeg",
             headers={
                 "Content-Disposition": f'inline; filename="{file_entity.name}-thumb.jpg"',
@@ -192,14 +202,140 @@ async def download_file(
             },
         )
 
-    data = await file_service.read(file_entity.uri)
-    return Response(
-        content=data,
+    return await _stream_file(
+        request,
+        file_service,
+        file_entity.uri,
         media_type=file_entity.mime_type or "application/octet-stream",
         headers={"Content-Disposition": f'inline; filename="{file_entity.name}"'},
     )
 
 
+def _upload_size(file: UploadFile) -> int:
+    """Upload size without reading it — counted by the multipart parser as it spooled."""
+    if file.size is not None:
+        return file.size
+    f = file.file
+    pos = f.tell()
+    size = f.seek(0, os.SEEK_END)
+    f.seek(pos)
+    return size
+
+
+async def _stream_file(
+    request: Request,
+    file_service: FileService,
+    uri: str,
+    *,
+    media_type: str,
+    headers: dict[str, str],
+) -> Response:
+    """Conditional, ranged StreamingResponse for ``uri``."""
+    try:
+        stat = await file_service.stat(uri)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found in storage")
+
+    headers = {
+        **headers,
+        "Accept-Ranges": "bytes",
+        "ETag": stat.etag,
+        "Last-Modified": format_datetime(stat.last_modified, usegmt=True),
+    }
+    if _not_modified(request, stat):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if _if_range_matches(request.headers.get("if-range"), stat):
+        byte_range = _parse_range(request.headers.get("range"), stat.size)
+
+    if byte_range is None:
+        return StreamingResponse(
+            file_service.iter_bytes(uri, etag=stat.etag),
+            media_type=media_type,
+            headers={**headers, "Content-Length": str(stat.size)},
+        )
+
+    start, end = byte_range
+    return StreamingResponse(
+        file_service.iter_bytes(uri, start, end, etag=stat.etag),
+        status_code=206,
+        media_type=media_type,
+        headers={
+            **headers,
+            "Content-Length": str(end - start + 1),
+            "Content-Range": f"bytes {start}-{end}/{stat.size}",
+        },
+    )
+
+
+def _etag_matches(header: str, etag: str, *, weak: bool) -> bool:
+    if header.strip() == "*":
+        return True
+
+    def norm(tag: str) -> str:
+        tag = tag.strip()
+        return tag.removeprefix("W/") if weak else tag
+
+    return any(norm(t) == norm(etag) for t in header.split(","))
+
+
+def _http_date(value: str) -> datetime | None:
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return date if date.tzinfo else date.replace(tzinfo=UTC)
+
+
+def _not_modified(request: Request, stat: FileStat) -> bool:
+    """If-None-Match (weak comparison) wins over If-Modified-Since (RFC 9110 §13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, stat.etag, weak=True)
+    since = _http_date(request.headers.get("if-modified-since", ""))
+    return since is not None and stat.last_modified.replace(microsecond=0) <= since
+
+
+def _if_range_matches(if_range: str | None, stat: FileStat) -> bool:
+    """A stale If-Range validator means "send the whole file" instead of a range."""
+    if if_range is None:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return not if_range.startswith("W/") and _etag_matches(if_range, stat.etag, weak=False)
+    date = _http_date(if_range)
+    return date is not None and stat.last_modified.replace(microsecond=0) == date
+
+
+def _parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into inclusive (start, end).
+
+    Returns None (serve the full body) for absent, malformed or multi-range
+    headers; raises 416 when the range lies outside the file.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[6:].strip().partition("-")
+    if not sep or not (first + last).isdigit():
+        return None
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+    else:
+        suffix = int(last)
+        # "-0" selects nothing and is unsatisfiable
+        start, end = (max(size - suffix, 0) if suffix else size), size - 1
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
+
+
 @router.post("/analyse")
 async def analyse_content_endpoint(
     request: Request,
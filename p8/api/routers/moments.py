@@ -52,10 +52,7 @@ async def _decrypt_feed_rows(
     )
     await repo._ensure_deks(full_rows)
 
-    decrypted: dict = {}
-    for frow in full_rows:
-        entity = repo._decrypt_row(frow)
-        decrypted[entity.id] = entity.summary
+    decrypted = {entity.id: entity.summary for entity in repo._decrypt_rows(full_rows)}
 
     # Replace summaries in feed rows with decrypted text
     result = []
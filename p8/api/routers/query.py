@@ -14,7 +14,7 @@ router = APIRouter()
 
 
 class QueryRequest(BaseModel):
-    mode: str  # LOOKUP | SEARCH | FUZZY | TRAVERSE | SQL
+    mode: str  # LOOKUP | SEARCH | FUZZY | HYBRID | TRAVERSE | SQL
     key: str | None = None
     query: str | None = None
     table: str | None = None
@@ -24,6 +24,8 @@ class QueryRequest(BaseModel):
     user_id: UUID | None = None
     max_depth: int = 1
     rel_type: str | None = None
+    max_fanout: int | None = None
+    weighted: bool = False
     limit: int = 10
     threshold: float = 0.3
 
@@ -59,12 +61,21 @@ async def execute_query(q: QueryRequest, db: Database = Depends(get_db)):
                 q.query, tenant_id=q.tenant_id, user_id=q.user_id,
                 threshold=q.threshold, limit=q.limit,
             )
+        case "HYBRID":
+            if not q.embedding or not q.table or not q.query:
+                raise HTTPException(400, "HYBRID requires embedding, query and table")
+            return await db.rem_hybrid(
+                q.embedding, q.query, q.table, field=q.field,
+                tenant_id=q.tenant_id, user_id=q.user_id,
+                threshold=q.threshold, limit=q.limit,
+            )
         case "TRAVERSE":
             if not q.key:
                 raise HTTPException(400, "TRAVERSE requires key")
             return await db.rem_traverse(
                 q.key, tenant_id=q.tenant_id, user_id=q.user_id,
                 max_depth=q.max_depth, rel_type=q.rel_type,
+                max_fanout=q.max_fanout, weighted=q.weighted,
             )
         case "SQL":
             if not q.query:
@@ -1,18 +1,18 @@
 """ask_agent tool — invoke another agent by name for multi-agent orchestration.
 
 When a parent agent calls ask_agent, the child agent streams its response
-in real-time via a ContextVar event sink (``asyncio.Queue``). The parent's
-streaming loop picks up these events via ``asyncio.wait(FIRST_COMPLETED)``
-and forwards them to the client's SSE stream as they arrive.
+in real-time via a ContextVar event sink (``EventChannel``). The parent's
+streaming loop reads parent and child events from that one channel and
+forwards them to the client's SSE stream as they arrive.
 
 Event flow::
 
     Parent streaming loop
-        ├── child_event_sink = asyncio.Queue()
+        ├── child_event_sink = EventChannel()  # only if ask_agent is declared
         ├── set_child_event_sink(child_event_sink)  # ContextVar
         └── agent.iter(prompt) for parent
               └── CallToolsNode → pydantic-ai calls ask_agent()
-                    ├── get_child_event_sink()  # reads the same Queue
+                    ├── get_child_event_sink()  # reads the same channel
                     └── agent.iter(prompt) for child
                           ├── ModelRequestNode.stream() → PartDeltaEvent
                           │     → push {"type": "child_content", ...} to queue
@@ -20,8 +20,8 @@ Event flow::
                                 → push {"type": "child_tool_start/result", ...}
 
     Meanwhile the parent's multiplexer:
-        asyncio.wait({pending_tool, pending_child}, FIRST_COMPLETED)
-        → yields child events to SSE as soon as they arrive
+        EventChannel.merge(parent_stream) — parent pump + children share one
+        bounded queue → yields events to SSE in arrival order
 
 When no event sink is available (CLI mode), falls back to ``agent.run()``
 for a non-streaming call.
@@ -153,9 +153,9 @@ async def ask_agent(
     system prompt.
 
     When called from the streaming chat endpoint, a child event sink
-    (``asyncio.Queue``) is available via ContextVar. The child agent
+    (``EventChannel``) is available via ContextVar. The child agent
     streams its content tokens, tool calls, and tool results to this
-    queue in real-time using ``agent.iter()``. The parent's multiplexer
+    channel in real-time using ``agent.iter()``. The parent's multiplexer
     picks these up and forwards them to the client immediately.
 
     When no event sink is available (e.g. CLI mode), falls back to
@@ -21,8 +21,8 @@ def _decrypt_results(results: list[dict]) -> list[dict]:
     REM functions return raw row_to_json(t.*) which may contain encrypted
     content fields.  This post-processes results so agents see plaintext.
     """
-    encryption = get_encryption()
-
+    # Group decryptable rows by (entity type, tenant) for one batch pass each
+    groups: dict[tuple[str, str | None], list[dict]] = {}
     out = []
     for result in results:
         data = result.get("data")
@@ -32,29 +32,32 @@ def _decrypt_results(results: list[dict]) -> list[dict]:
 
         entity_type = result.get("entity_type") or data.get("type")
         level = data.get("encryption_level")
+        model_class = TABLE_MAP.get(entity_type) if entity_type else None
+        tenant_id = data.get("tenant_id")
 
-        if level != "platform" or not entity_type:
+        if (
+            level != "platform" or not tenant_id or not entity_type or not model_class
+            or not getattr(model_class, "__encrypted_fields__", None)
+        ):
             out.append(result)
             continue
 
-        model_class = TABLE_MAP.get(entity_type)
-        if not model_class or not getattr(model_class, "__encrypted_fields__", None):
-            out.append(result)
-            continue
+        data = dict(data)
+        groups.setdefault((entity_type, tenant_id), []).append(data)
+        out.append({**result, "data": data})
+
+    _decrypt_groups(groups)
+    return out
 
-        tenant_id = data.get("tenant_id")
-        if not tenant_id:
-            out.append(result)
-            continue
 
+def _decrypt_groups(groups: dict[tuple[str, str | None], list[dict]]) -> None:
+    """Decrypt each (table, tenant) group in place; failures leave ciphertext."""
+    encryption = get_encryption()
+    for (table, tenant_id), rows in groups.items():
         try:
-            decrypted = encryption.decrypt_fields(model_class, data, tenant_id)
-            out.append({**result, "data": decrypted})
+            encryption.decrypt_rows(TABLE_MAP[table], rows, tenant_id)
         except Exception:
-            logger.debug("search: decrypt failed for %s/%s", entity_type, data.get("id"))
-            out.append(result)
-
-    return out
+            logger.debug("search: decrypt failed for %d %s rows", len(rows), table)
 
 
 def _decrypt_sql_results(results: list[dict], sql: str) -> list[dict]:
@@ -74,17 +77,17 @@ def _decrypt_sql_results(results: list[dict], sql: str) -> list[dict]:
     if not model_class or not getattr(model_class, "__encrypted_fields__", None):
         return results
 
-    encryption = get_encryption()
+    groups: dict[tuple[str, str | None], list[dict]] = {}
     out = []
     for row in results:
         if row.get("encryption_level") != "platform" or not row.get("tenant_id"):
             out.append(row)
             continue
-        try:
-            out.append(encryption.decrypt_fields(model_class, dict(row), row["tenant_id"]))
-        except Exception:
-            logger.debug("search: SQL decrypt failed for %s/%s", table, row.get("id"))
-            out.append(row)
+        row = dict(row)
+        groups.setdefault((table, row["tenant_id"]), []).append(row)
+        out.append(row)
+
+    _decrypt_groups(groups)
     return out
 
 
@@ -174,6 +177,7 @@ async def search(
     - LOOKUP <key>: O(1) exact entity lookup by key
     - SEARCH <text> FROM <table>: Semantic vector search
     - FUZZY <text>: Fuzzy text matching across all entities
+    - HYBRID <text> FROM <table>: Semantic + fuzzy in one ranked list (best recall)
     - TRAVERSE <key> DEPTH <n>: Graph traversal from entity
     - SQL <query>: Direct SQL query against core tables
 
@@ -192,6 +196,7 @@ async def search(
     - SEARCH "machine learning pipelines" FROM moments LIMIT 5
     - SEARCH "API gateway architecture" FROM resources LIMIT 3
     - FUZZY project alpha
+    - HYBRID "project alpha roadmap" FROM resources LIMIT 5
     - TRAVERSE my-project-plan DEPTH 2
     - SQL SELECT name, moment_type, summary, created_at FROM moments WHERE deleted_at IS NULL ORDER BY created_at DESC LIMIT 10
     - SQL SELECT name, moment_type, summary, metadata FROM moments WHERE moment_type = 'content_upload' AND deleted_at IS NULL ORDER BY created_at DESC LIMIT 5
@@ -201,7 +206,7 @@ async def search(
     Do NOT send raw questions — use SEARCH with keywords or SQL for date-based queries.
 
     Args:
-        query: REM dialect query string (must start with LOOKUP, SEARCH, FUZZY, TRAVERSE, or SQL)
+        query: REM dialect query string (must start with LOOKUP, SEARCH, FUZZY, HYBRID, TRAVERSE, or SQL)
         limit: Maximum results (default 20)
 
     Returns:
@@ -209,12 +214,12 @@ async def search(
     """
     # Validate query starts with a known REM command
     q = query.strip()
-    _VALID_PREFIXES = ("LOOKUP", "SEARCH", "FUZZY", "TRAVERSE", "SQL")
+    _VALID_PREFIXES = ("LOOKUP", "SEARCH", "FUZZY", "HYBRID", "TRAVERSE", "SQL")
     if not any(q.upper().startswith(p) for p in _VALID_PREFIXES):
         return {
             "status": "error",
             "error": (
-                "Invalid query — must start with LOOKUP, SEARCH, FUZZY, TRAVERSE, or SQL. "
+                "Invalid query — must start with LOOKUP, SEARCH, FUZZY, HYBRID, TRAVERSE, or SQL. "
                 'Example: SEARCH "your keywords" FROM moments LIMIT 5'
             ),
             "query": query,
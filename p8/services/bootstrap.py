@@ -69,7 +69,8 @@ async def bootstrap_services(*, include_embeddings: bool = False):
 
     kms = create_kms(settings, db)
     encryption = EncryptionService(
-        kms, system_tenant_id=settings.system_tenant_id, cache_ttl=settings.dek_cache_ttl
+        kms, system_tenant_id=settings.system_tenant_id, cache_ttl=settings.dek_cache_ttl,
+        cache_size=settings.dek_cache_size,
     )
     await _ensure_system_key(encryption, db, settings)
 
@@ -86,10 +87,17 @@ async def bootstrap_services(*, include_embeddings: bool = False):
 
         provider = create_provider(settings)
         embedding_service = EmbeddingService(
-            db, provider, encryption, batch_size=settings.embedding_batch_size
+            db, provider, encryption,
+            batch_size=settings.embedding_batch_size,
+            sub_batch_size=settings.embedding_sub_batch_size,
+            max_concurrency=settings.embedding_concurrency,
         )
 
     try:
         yield db, encryption, settings, file_service, content_service, embedding_service, queue_service
     finally:
+        if embedding_service is not None:
+            await embedding_service.provider.aclose()
+        await content_service.aclose()
+        await kms.aclose()
         await db.close()
@@ -8,7 +8,9 @@ from __future__ import annotations
 
 import json
 import logging
-from dataclasses import dataclass
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from io import BytesIO
 from pathlib import Path
@@ -18,6 +20,7 @@ from p8.ontology.base import CoreModel
 from p8.ontology.types import File, Ontology, Resource
 from p8.services.database import Database
 from p8.services.encryption import EncryptionService
+from p8.services.extraction import ExtractionPool
 from p8.services.files import FileService
 from p8.services.memory import MemoryService
 from p8.services.repository import Repository
@@ -58,6 +61,28 @@ _LINK_SKIP_PREFIXES = ("http://", "https://", "mailto:", "#", "data:")
 # Whisper API limit is 25 MB; we stay at 24 MB for safety.
 _WHISPER_MAX_BYTES = 24 * 1024 * 1024
 
+# Streaming extraction (ingest_stream): one NDJSON line per chunk on stdout.
+_STREAM_EXTRACT_TIMEOUT = 1800.0
+_NDJSON_LINE_LIMIT = 16 * 1024 * 1024  # max bytes per chunk line
+_STREAM_EXTRACT_SCRIPT = """
+import json, sys
+from pathlib import Path
+from kreuzberg import ChunkingConfig, ExtractionConfig, extract_file_sync
+
+path, mime_type, max_chars, overlap = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+config = ExtractionConfig(chunking=ChunkingConfig(max_chars=max_chars, max_overlap=overlap))
+result = extract_file_sync(Path(path), mime_type=mime_type, config=config)
+
+if result.chunks:
+    chunks = (c.content for c in result.chunks)
+else:
+    text = result.content or ""
+    chunks = (text[i:i + max_chars] for i in range(0, len(text), max_chars))
+for chunk in chunks:
+    sys.stdout.write(json.dumps({"content": chunk}) + "\\n")
+sys.stdout.flush()
+"""
+
 
 def chunk_audio_for_whisper(
     audio: "AudioSegment",  # type: ignore[name-defined]  # noqa: F821
@@ -141,6 +166,15 @@ def chunk_audio_for_whisper(
     return buffers
 
 
+def _in_daemon_process() -> bool:
+    """True under Hypercorn/Uvicorn workers, where Kreuzberg can't fork."""
+    import multiprocessing
+    try:
+        return multiprocessing.current_process().daemon
+    except Exception:
+        return False
+
+
 def _links_to_edges(links: list[tuple[int, str, str]]) -> list[dict]:
     """Convert extracted markdown links to graph_edges dicts.
 
@@ -168,6 +202,7 @@ class ContentService:
     encryption: EncryptionService
     file_service: FileService
     settings: Settings
+    _extraction_pool: ExtractionPool | None = field(default=None, init=False, repr=False)
 
     @staticmethod
     def s3_key_for(filename: str, *, user_id: UUID | None = None) -> str:
@@ -208,7 +243,7 @@ class ContentService:
 
         stem = Path(filename).stem
         file_entity = await self._persist_file(
-            stem, uri, mime_type, data, full_text,
+            stem, uri, mime_type, len(data), full_text,
             tenant_id=tenant_id, user_id=user_id, tags=tag_list,
         )
 
@@ -230,49 +265,13 @@ class ContentService:
         )
 
         result_session_id: UUID | None = None
-
         if create_moment:
-            # Build moment + companion session via unified create_moment_session
-            resource_keys = [r.name for r in resource_entities]
-            file_id_str = str(file_entity.id)
-            is_image = mime_type and mime_type.startswith("image/")
-
-            # Build summary — user-facing content only, no metadata
-            char_count = len(full_text) if full_text else 0
-            if full_text:
-                summary = (full_text[:300] + "…") if len(full_text) > 300 else full_text
-            else:
-                summary = f"Uploaded {filename}"
-
-            # Build image_uri for thumbnails
-            image_uri = None
-            if is_image and thumb_data:
-                import base64
-                b64 = base64.b64encode(thumb_data).decode()
-                image_uri = f"data:image/jpeg;base64,{b64}"
-
-            moment_metadata = {
-                "file_id": file_id_str,
-                "file_name": filename,
-                "resource_keys": resource_keys,
-                "source": "upload",
-                "chunk_count": len(resource_entities),
-                "char_count": char_count,
-                **({"image_url": f"/content/files/{file_id_str}?thumbnail=true"} if is_image else {}),
-            }
-
-            memory = MemoryService(self.db, self.encryption)
-            moment, session = await memory.create_moment_session(
-                name=f"upload-{stem}",
-                moment_type="content_upload",
-                summary=summary,
-                metadata=moment_metadata,
-                image_uri=image_uri,
-                session_id=UUID(session_id) if session_id else None,
-                tenant_id=tenant_id,
-                user_id=user_id,
+            result_session_id = await self._create_upload_moment(
+                file_entity, filename, stem, mime_type, full_text,
+                resource_keys=[r.name for r in resource_entities],
+                chunk_count=len(resource_entities), char_count=len(full_text) if full_text else 0,
+                thumb_data=thumb_data, session_id=session_id, tenant_id=tenant_id, user_id=user_id,
             )
-            result_session_id = session.id
 
         return IngestResult(
             file=file_entity,
@@ -282,6 +281,113 @@ class ContentService:
             session_id=result_session_id,
         )
 
+    @staticmethod
+    def is_streamable(mime_type: str | None) -> bool:
+        """Whether ``ingest_stream`` can handle this type (documents, not audio/images)."""
+        return not (mime_type or "").startswith(("audio/", "image/"))
+
+    async def ingest_stream(
+        self,
+        path: str | Path,
+        filename: str,
+        *,
+        mime_type: str | None = None,
+        uri: str | None = None,
+        file_id: UUID | None = None,
+        tenant_id: str | None = None,
+        user_id: UUID | None = None,
+        session_id: str | None = None,
+        category: str | None = None,
+        tags: list[str] | None = None,
+        max_chars: int | None = None,
+        overlap: int | None = None,
+        create_moment: bool = True,
+    ) -> IngestResult:
+        """Ingest a document from disk with memory bounded by the chunk batch size.
+
+        Extraction runs in a subprocess that emits chunks as NDJSON; chunks are
+        persisted every ``content_stream_batch_size`` as they arrive. Nothing is
+        uploaded — pass the object's existing ``uri``, and ``file_id`` to update
+        that File row in place. ``parsed_content`` keeps only the first
+        ``content_stream_preview_chars`` and ``IngestResult.resources`` only the
+        first batch; ``chunk_count``/``total_chars`` cover the whole document.
+        """
+        mime_type = mime_type or FileService.mime_type_from_path(filename)
+        tag_list = list(tags or [])
+        stem = Path(filename).stem
+        chunk_max = max_chars or self.settings.content_chunk_max_chars
+        chunk_overlap = overlap or self.settings.content_chunk_overlap
+        batch_size = max(1, self.settings.content_stream_batch_size)
+        preview_max = self.settings.content_stream_preview_chars
+
+        # Persist the File first so chunks can reference its id. An existing
+        # row keeps its tags, created_at and processing_status.
+        size_bytes = Path(path).stat().st_size
+        if file_id:
+            file_entity = await self._update_file(file_id, tenant_id=tenant_id, size_bytes=size_bytes)
+        else:
+            file_entity = await self._persist_file(
+                stem, uri, mime_type, size_bytes, None,
+                tenant_id=tenant_id, user_id=user_id, tags=tag_list,
+            )
+
+        first_batch: list[Resource] = []
+        batch: list[str] = []
+        preview: list[str] = []
+        preview_len = total_chars = chunk_count = 0
+
+        async def _flush() -> None:
+            nonlocal chunk_count
+            saved = await self._persist_chunks(
+                stem, uri, batch, file_entity.id, filename,
+                category=category, tenant_id=tenant_id, user_id=user_id, tags=tag_list,
+                start=chunk_count,
+            )
+            if not first_batch:
+                first_batch.extend(saved)
+            chunk_count += len(batch)
+            batch.clear()
+
+        # aclosing: a failed flush must not leave the extractor running until GC
+        chunks = self._stream_document_chunks(path, mime_type, chunk_max, chunk_overlap)
+        async with aclosing(chunks):
+            async for text in chunks:
+                total_chars += len(text)
+                if preview_len < preview_max:
+                    preview.append(text[:preview_max - preview_len])
+                    preview_len += len(preview[-1])
+                batch.append(text)
+                if len(batch) >= batch_size:
+                    await _flush()
+        if batch:
+            await _flush()
+
+        # Chunks overlap, so the preview is their concatenation (not exact source text)
+        full_text = "".join(preview)
+        file_entity = await self._update_file(file_entity.id, tenant_id=tenant_id, parsed_content=full_text)
+
+        logger.info(
+            "Streamed %s: %d chunks, %d chars in batches of %d",
+            filename, chunk_count, total_chars, batch_size,
+        )
+
+        result_session_id: UUID | None = None
+        if create_moment:
+            result_session_id = await self._create_upload_moment(
+                file_entity, filename, stem, mime_type, full_text,
+                resource_keys=[r.name for r in first_batch],
+                chunk_count=chunk_count, char_count=total_chars,
+                thumb_data=None, session_id=session_id, tenant_id=tenant_id, user_id=user_id,
+            )
+
+        return IngestResult(
+            file=file_entity,
+            resources=first_batch,
+            chunk_count=chunk_count,
+            total_chars=total_chars,
+            session_id=result_session_id,
+        )
+
     # ── Ingest sub-steps ─────────────────────────────────────────────────
 
     async def _upload_to_s3(
@@ -312,18 +418,11 @@ class ContentService:
     ) -> tuple[str, list[str]]:
         """Extract and chunk text from documents via Kreuzberg.
 
-        Uses subprocess workaround when running in a daemon process (e.g. under
-        Hypercorn/Uvicorn) because Kreuzberg's ProcessPoolExecutor cannot fork
-        from daemon processes.
+        Uses the warm extraction pool when running in a daemon process (e.g.
+        under Hypercorn/Uvicorn) because Kreuzberg's ProcessPoolExecutor cannot
+        fork from daemon processes.
         """
-        import multiprocessing
-        is_daemon = False
-        try:
-            is_daemon = multiprocessing.current_process().daemon
-        except Exception:
-            pass
-
-        if is_daemon:
+        if _in_daemon_process():
             return await self._process_document_subprocess(
                 data, mime_type, chunk_max, chunk_overlap,
             )
@@ -343,52 +442,79 @@ class ContentService:
     async def _process_document_subprocess(
         self, data: bytes, mime_type: str, chunk_max: int, chunk_overlap: int,
     ) -> tuple[str, list[str]]:
-        """Run Kreuzberg in a separate subprocess to bypass daemon restrictions."""
-        import asyncio
-        import subprocess
-        import sys
+        """Run Kreuzberg on a warm pool worker to bypass daemon restrictions."""
         import tempfile
 
-        # Write data to temp file for the subprocess
+        # Write data to temp file for the worker
         suffix = self._extension_for_mime(mime_type)
         with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
             tmp.write(data)
             tmp_path = tmp.name
+        try:
+            return await self.extraction_pool().extract(tmp_path, mime_type, chunk_max, chunk_overlap)
+        except RuntimeError as e:
+            logger.error("Kreuzberg extraction failed: %s", e)
+            raise
+        finally:
+            Path(tmp_path).unlink(missing_ok=True)
 
-        script = f"""
-import json, sys
-from pathlib import Path
-from kreuzberg import ChunkingConfig, ExtractionConfig, extract_file_sync
+    def extraction_pool(self) -> ExtractionPool:
+        """Warm extractor pool for daemon processes (created on first use)."""
+        if self._extraction_pool is None:
+            self._extraction_pool = ExtractionPool(
+                self.settings.extraction_pool_size,
+                max_jobs=self.settings.extraction_pool_max_jobs,
+                max_rss_mb=self.settings.extraction_pool_max_rss_mb,
+                timeout=self.settings.extraction_job_timeout,
+            )
+        return self._extraction_pool
 
-chunking = ChunkingConfig(max_chars={chunk_max}, max_overlap={chunk_overlap})
-config = ExtractionConfig(chunking=chunking)
-result = extract_file_sync(Path(sys.argv[1]), mime_type="{mime_type}", config=config)
+    async def prewarm_extraction(self) -> None:
+        """Start pool workers now if documents will be parsed out of process."""
+        if _in_daemon_process():
+            await self.extraction_pool().start()
 
-chunks = [c.content for c in result.chunks] if result.chunks else []
-if not chunks and result.content:
-    chunks = [result.content]
+    async def aclose(self) -> None:
+        if self._extraction_pool is not None:
+            await self._extraction_pool.close()
 
-output = {{"content": result.content, "chunks": chunks}}
-print(json.dumps(output))
-"""
-        try:
-            loop = asyncio.get_event_loop()
-            proc_result = await loop.run_in_executor(
-                None,
-                lambda: subprocess.run(
-                    [sys.executable, "-c", script, tmp_path],
-                    capture_output=True, text=True, timeout=300,
-                ),
-            )
-            if proc_result.returncode != 0:
-                logger.error("Kreuzberg subprocess failed: %s", proc_result.stderr)
-                raise RuntimeError(f"Document extraction failed: {proc_result.stderr[-500:]}")
+    async def _stream_document_chunks(
+        self, path: str | Path, mime_type: str, chunk_max: int, chunk_overlap: int,
+    ) -> AsyncGenerator[str, None]:
+        """Yield chunk texts from a Kreuzberg subprocess as it writes them (NDJSON).
 
-            import json as _json
-            parsed = _json.loads(proc_result.stdout)
-            return parsed["content"], parsed["chunks"]
-        finally:
-            Path(tmp_path).unlink(missing_ok=True)
+        Kreuzberg has no streaming API, so the child still holds its own
+        extraction result; the worker process only ever holds one line.
+        stderr goes to a temp file so a chatty extractor can't fill the pipe.
+        """
+        import asyncio
+        import sys
+        import tempfile
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _STREAM_EXTRACT_TIMEOUT
+        with tempfile.TemporaryFile() as stderr:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-c", _STREAM_EXTRACT_SCRIPT,
+                str(path), mime_type, str(chunk_max), str(chunk_overlap),
+                stdout=asyncio.subprocess.PIPE, stderr=stderr, limit=_NDJSON_LINE_LIMIT,
+            )
+            assert proc.stdout is not None
+            try:
+                while line := await asyncio.wait_for(
+                    proc.stdout.readline(), timeout=max(deadline - loop.time(), 0),
+                ):
+                    yield json.loads(line)["content"]
+                await asyncio.wait_for(proc.wait(), timeout=max(deadline - loop.time(), 0))
+            finally:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+            if proc.returncode != 0:
+                stderr.seek(0)
+                err = stderr.read().decode(errors="replace")
+                logger.error("Kreuzberg stream subprocess failed: %s", err)
+                raise RuntimeError(f"Document extraction failed: {err[-500:]}")
 
     @staticmethod
     def _extension_for_mime(mime_type: str) -> str:
@@ -408,26 +534,39 @@ print(json.dumps(output))
         return _map.get(mime_type) or mimetypes.guess_extension(mime_type) or ".bin"
 
     async def _persist_file(
-        self, stem: str, uri: str | None, mime_type: str, data: bytes, full_text: str,
+        self, stem: str, uri: str | None, mime_type: str, size_bytes: int, full_text: str | None,
         *, tenant_id: str | None, user_id: UUID | None, tags: list[str],
     ) -> File:
         """Create the File entity."""
         repo = Repository(File, self.db, self.encryption)
         entity = File(
             name=stem, uri=uri, mime_type=mime_type,
-            size_bytes=len(data), parsed_content=full_text,
+            size_bytes=size_bytes, parsed_content=full_text,
             tenant_id=tenant_id, user_id=user_id, tags=tags,
         )
         [entity] = await repo.upsert(entity)
         return entity
 
+    async def _update_file(self, file_id: UUID, *, tenant_id: str | None, **changes: object) -> File:
+        """Re-read the stored File and write back only ``changes``.
+
+        Everything else (tags, created_at, processing_status, …) is kept as stored.
+        """
+        repo = Repository(File, self.db, self.encryption)
+        entity = await repo.get(file_id, tenant_id=tenant_id)
+        if entity is None:
+            raise ContentProcessingError(f"File {file_id} not found", code="file_not_found")
+        [entity] = await repo.upsert(entity.model_copy(update=changes))
+        return entity
+
     async def _persist_chunks(
         self,
         stem: str, uri: str | None, chunk_texts: list[str],
         file_id: UUID, filename: str,
         *, category: str | None, tenant_id: str | None, user_id: UUID | None, tags: list[str],
+        start: int = 0,
     ) -> list[Resource]:
-        """Create one Resource entity per text chunk."""
+        """Create one Resource entity per text chunk, numbered from ``start``."""
         if not chunk_texts:
             return []
         resources = [
@@ -438,11 +577,59 @@ print(json.dumps(output))
                 graph_edges=[{"target": stem, "relation": "chunk_of"}],
                 metadata={"file_id": str(file_id), "source_filename": filename, "source_uri": uri},
             )
-            for i, text in enumerate(chunk_texts)
+            for i, text in enumerate(chunk_texts, start)
         ]
         repo = Repository(Resource, self.db, self.encryption)
         return await repo.upsert(resources)
 
+    async def _create_upload_moment(
+        self,
+        file_entity: File, filename: str, stem: str, mime_type: str, full_text: str,
+        *,
+        resource_keys: list[str], chunk_count: int, char_count: int,
+        thumb_data: bytes | None, session_id: str | None,
+        tenant_id: str | None, user_id: UUID | None,
+    ) -> UUID:
+        """Build the content_upload moment + companion session. Returns the session id."""
+        file_id_str = str(file_entity.id)
+        is_image = mime_type and mime_type.startswith("image/")
+
+        # Build summary — user-facing content only, no metadata
+        if full_text:
+            summary = (full_text[:300] + "…") if len(full_text) > 300 else full_text
+        else:
+            summary = f"Uploaded {filename}"
+
+        # Build image_uri for thumbnails
+        image_uri = None
+        if is_image and thumb_data:
+            import base64
+            b64 = base64.b64encode(thumb_data).decode()
+            image_uri = f"data:image/jpeg;base64,{b64}"
+
+        moment_metadata = {
+            "file_id": file_id_str,
+            "file_name": filename,
+            "resource_keys": resource_keys,
+            "source": "upload",
+            "chunk_count": chunk_count,
+            "char_count": char_count,
+            **({"image_url": f"/content/files/{file_id_str}?thumbnail=true"} if is_image else {}),
+        }
+
+        memory = MemoryService(self.db, self.encryption)
+        moment, session = await memory.create_moment_session(
+            name=f"upload-{stem}",
+            moment_type="content_upload",
+            summary=summary,
+            metadata=moment_metadata,
+            image_uri=image_uri,
+            session_id=UUID(session_id) if session_id else None,
+            tenant_id=tenant_id,
+            user_id=user_id,
+        )
+        return session.id
+
     # ── Audio / Image processors ──────────────────────────────────────────
 
     async def _process_audio(
@@ -26,6 +26,11 @@ class Database(PoolMixin, RemMixin):
         super().__init__(settings)
         self._query_engine: RemQueryEngine | None = None
 
+    async def close(self):
+        if self._query_engine is not None:
+            await self._query_engine.close()
+        await super().close()
+
     @property
     def query_engine(self) -> RemQueryEngine:
         if self._query_engine is None:
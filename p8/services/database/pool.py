@@ -31,6 +31,7 @@ class PoolMixin:
             self.settings.database_url,
             min_size=self.settings.db_pool_min,
             max_size=self.settings.db_pool_max,
+            statement_cache_size=self.settings.db_statement_cache_size,
             init=_init_connection,
         )
 
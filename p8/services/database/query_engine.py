@@ -30,7 +30,7 @@ _BARE_DELETE = re.compile(
 class RemQuery:
     """Parsed REM dialect query."""
 
-    mode: str  # LOOKUP | SEARCH | FUZZY | TRAVERSE | SQL
+    mode: str  # LOOKUP | SEARCH | FUZZY | HYBRID | TRAVERSE | SQL
     params: dict = field(default_factory=dict)
 
 
@@ -42,7 +42,9 @@ class RemQueryParser:
         LOOKUP <key>[, <key2>, ...]
         FUZZY  <query_text> [THRESHOLD <f>] [LIMIT <n>]
         SEARCH <query_text> [FROM <table>] [FIELD <name>] [LIMIT <n>] [MIN_SIMILARITY <f>]
-        TRAVERSE <start_key> [DEPTH <n>] [TYPE <rel>]
+        HYBRID <query_text> [FROM <table>] [FIELD <name>] [LIMIT <n>] [MIN_SIMILARITY <f>]
+               [THRESHOLD <f>] [VECTOR_WEIGHT <f>] [TEXT_WEIGHT <f>]
+        TRAVERSE <start_key> [DEPTH <n>] [TYPE <rel>] [FANOUT <n>] [LOAD] [WEIGHTED]
         SQL <raw_sql>
 
     Quoted strings are handled via ``shlex.split``.
@@ -50,7 +52,7 @@ class RemQueryParser:
     Anything that doesn't start with a known keyword is treated as raw SQL.
     """
 
-    _MODES = {"LOOKUP", "SEARCH", "FUZZY", "TRAVERSE", "SQL"}
+    _MODES = {"LOOKUP", "SEARCH", "FUZZY", "HYBRID", "TRAVERSE", "SQL"}
 
     # Clause keywords per mode → param name
     _CLAUSES: dict[str, dict[str, str]] = {
@@ -62,17 +64,27 @@ class RemQueryParser:
             "MIN_SIMILARITY": "min_similarity",
             "CATEGORY": "category",
         },
-        "TRAVERSE": {"DEPTH": "max_depth", "TYPE": "rel_type"},
+        "HYBRID": {
+            "FROM": "table",
+            "FIELD": "field",
+            "LIMIT": "limit",
+            "MIN_SIMILARITY": "min_similarity",
+            "THRESHOLD": "threshold",
+            "CATEGORY": "category",
+            "VECTOR_WEIGHT": "vector_weight",
+            "TEXT_WEIGHT": "text_weight",
+        },
+        "TRAVERSE": {"DEPTH": "max_depth", "TYPE": "rel_type", "FANOUT": "max_fanout"},
     }
 
     # Boolean flags (no value) per mode → param name
     _FLAGS: dict[str, dict[str, str]] = {
-        "TRAVERSE": {"LOAD": "load"},
+        "TRAVERSE": {"LOAD": "load", "WEIGHTED": "weighted"},
     }
 
     # Which params are numeric (float or int)
-    _FLOAT_PARAMS = {"threshold", "min_similarity"}
-    _INT_PARAMS = {"limit", "max_depth"}
+    _FLOAT_PARAMS = {"threshold", "min_similarity", "vector_weight", "text_weight"}
+    _INT_PARAMS = {"limit", "max_depth", "max_fanout"}
 
     # Alias map for =style kwargs → canonical param name
     _KWARG_ALIASES: dict[str, str] = {
@@ -85,6 +97,10 @@ class RemQueryParser:
         "max_depth": "max_depth",
         "type": "rel_type",
         "rel_type": "rel_type",
+        "vector_weight": "vector_weight",
+        "text_weight": "text_weight",
+        "fanout": "max_fanout",
+        "max_fanout": "max_fanout",
     }
 
     def parse(self, query_string: str) -> RemQuery:
@@ -113,7 +129,7 @@ class RemQueryParser:
         if first == "LOOKUP":
             return self._parse_lookup(tokens[1:])
 
-        # SEARCH, FUZZY, TRAVERSE — positional arg + optional clauses
+        # SEARCH, FUZZY, HYBRID, TRAVERSE — positional arg + optional clauses
         return self._parse_claused(first, tokens[1:])
 
     # ------------------------------------------------------------------
@@ -170,7 +186,7 @@ class RemQueryParser:
         if not positional:
             raise ValueError(f"{mode} requires a positional argument")
 
-        if mode == "SEARCH":
+        if mode in ("SEARCH", "HYBRID"):
             params["query_text"] = positional
         elif mode == "FUZZY":
             params["query_text"] = positional
@@ -191,7 +207,9 @@ class RemQueryEngine:
     """Execute parsed REM queries against a Database instance.
 
     Composes a parser + dispatcher. For SEARCH queries, auto-embeds the query
-    text using a provider constructed from settings.
+    text using a provider constructed from settings. Query vectors go through
+    a ``QueryEmbeddingCache`` (``embedding_cache``) so repeated SEARCH strings
+    skip the provider round-trip.
 
     Usage::
 
@@ -203,8 +221,22 @@ class RemQueryEngine:
         self.db = db
         self.settings = settings
         self._embedding_provider = _embedding_provider
+        self._embedding_cache = None
         self.parser = RemQueryParser()
 
+    @property
+    def embedding_cache(self):
+        """Lazily-built query embedding cache (sized/shared via settings)."""
+        if self._embedding_cache is None:
+            from p8.services.embeddings import QueryEmbeddingCache
+
+            self._embedding_cache = QueryEmbeddingCache(
+                max_entries=self.settings.query_embedding_cache_size,
+                ttl=self.settings.query_embedding_cache_ttl,
+                db=self.db if self.settings.query_embedding_cache_shared else None,
+            )
+        return self._embedding_cache
+
     async def execute(
         self,
         query_string: str,
@@ -227,13 +259,15 @@ class RemQueryEngine:
         p = query.params
 
         if mode == "LOOKUP":
-            keys = p.get("keys") or [p["key"]]
-            results = []
-            for key in keys:
-                results.extend(
-                    await self.db.rem_lookup(key, tenant_id=tenant_id, user_id=user_id)
+            if "key" in p:
+                return await self.db.rem_lookup(  # type: ignore[no-any-return]
+                    p["key"], tenant_id=tenant_id, user_id=user_id
                 )
-            return results
+            # Multi-key: one set-based round-trip; results keep input order and
+            # unresolved keys come back with entity_type/data = None
+            return await self.db.rem_lookup_many(  # type: ignore[no-any-return]
+                p["keys"], tenant_id=tenant_id, user_id=user_id
+            )
 
         if mode == "FUZZY":
             return await self.db.rem_fuzzy(  # type: ignore[no-any-return]
@@ -246,12 +280,7 @@ class RemQueryEngine:
 
         if mode == "SEARCH":
             table = p.get("table", "schemas")
-            # Resolve default field from model's __embedding_field__ if not explicitly provided
-            search_field = p.get("field")
-            if not search_field:
-                from p8.ontology.types import TABLE_MAP
-                model = TABLE_MAP.get(table)
-                search_field = getattr(model, "__embedding_field__", "content") if model else "content"
+            search_field = p.get("field") or self._default_field(table)
             embedding = await self._get_embedding(p["query_text"])
             return await self.db.rem_search(  # type: ignore[no-any-return]
                 embedding,
@@ -265,6 +294,27 @@ class RemQueryEngine:
                 category=p.get("category"),
             )
 
+        if mode == "HYBRID":
+            table = p.get("table", "schemas")
+            embedding = await self._get_embedding(p["query_text"])
+            return await self.db.rem_hybrid(  # type: ignore[no-any-return]
+                embedding,
+                p["query_text"],
+                table,
+                field=p.get("field") or self._default_field(table),
+                tenant_id=tenant_id,
+                user_id=user_id,
+                provider=self._get_provider().provider_name,
+                min_similarity=p.get("min_similarity", self.settings.embedding_min_similarity),
+                threshold=p.get("threshold", 0.3),
+                limit=p.get("limit", 10),
+                category=p.get("category"),
+                vector_weight=p.get("vector_weight", self.settings.hybrid_vector_weight),
+                text_weight=p.get("text_weight", self.settings.hybrid_text_weight),
+                rrf_k=self.settings.hybrid_rrf_k,
+                candidates=self.settings.hybrid_candidates,
+            )
+
         if mode == "TRAVERSE":
             return await self.db.rem_traverse(  # type: ignore[no-any-return]
                 p["start_key"],
@@ -273,6 +323,8 @@ class RemQueryEngine:
                 max_depth=p.get("max_depth", 1),
                 rel_type=p.get("rel_type"),
                 load=p.get("load", False),
+                max_fanout=p.get("max_fanout"),
+                weighted=p.get("weighted", False),
             )
 
         if mode == "SQL":
@@ -283,10 +335,25 @@ class RemQueryEngine:
 
         raise ValueError(f"Unknown query mode: {mode}")
 
+    @staticmethod
+    def _default_field(table: str) -> str:
+        """Model's ``__embedding_field__`` for *table*, else ``content``."""
+        from p8.ontology.types import TABLE_MAP
+
+        model = TABLE_MAP.get(table)
+        return getattr(model, "__embedding_field__", "content") if model else "content"
+
     async def _get_embedding(self, text: str) -> list[float]:
         provider = self._get_provider()
-        vectors = await provider.embed([text])
-        return vectors[0]  # type: ignore[no-any-return]
+        if self.settings.query_embedding_cache_size <= 0:
+            vectors = await provider.embed([text])
+            return vectors[0]  # type: ignore[no-any-return]
+        return await self.embedding_cache.get_or_embed(provider, text)  # type: ignore[no-any-return]
+
+    async def close(self) -> None:
+        """Release the embedding provider's pooled HTTP client, if any."""
+        if self._embedding_provider is not None:
+            await self._embedding_provider.aclose()
 
     def _get_provider(self):
         if self._embedding_provider is None:
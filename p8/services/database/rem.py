@@ -27,6 +27,26 @@ class RemMixin:
         )
         return [{"entity_type": r["entity_type"], "data": r["data"]} for r in rows]
 
+    async def rem_lookup_many(
+        self, keys: list[str], *, tenant_id: str | None = None, user_id: UUID | None = None
+    ) -> list[dict]:
+        """Resolve many keys in one round-trip, in input order.
+
+        Each result is ``{"key", "entity_type", "data"}``; keys that don't
+        resolve have ``entity_type``/``data`` set to ``None``.
+        """
+        assert self.pool is not None
+        if not keys:
+            return []
+        rows = await self.pool.fetch(
+            "SELECT * FROM rem_lookup_many($1::varchar[], $2::varchar, $3::uuid)",
+            list(keys), tenant_id, user_id,
+        )
+        return [
+            {"key": r["entity_key"], "entity_type": r["entity_type"], "data": r["data"]}
+            for r in rows
+        ]
+
     async def rem_search(
         self,
         embedding: list[float],
@@ -73,6 +93,52 @@ class RemMixin:
         )
         return [dict(r) for r in rows]
 
+    async def rem_hybrid(
+        self,
+        embedding: list[float],
+        query: str,
+        table: str,
+        *,
+        field: str = "content",
+        tenant_id: str | None = None,
+        user_id: UUID | None = None,
+        provider: str = "openai",
+        min_similarity: float = 0.3,
+        threshold: float = 0.3,
+        limit: int = 10,
+        category: str | None = None,
+        vector_weight: float = 1.0,
+        text_weight: float = 1.0,
+        rrf_k: int = 60,
+        candidates: int = 50,
+    ) -> list[dict]:
+        """Vector + trigram search fused with reciprocal-rank fusion.
+        ``similarity_score`` is the fused score; ``vector_rank`` / ``text_rank``
+        show where each arm placed the entity (``None`` if it missed)."""
+        assert self.pool is not None
+        rows = await self.pool.fetch(
+            "SELECT * FROM rem_hybrid("
+            "$1::vector, $2::text, $3::varchar, $4::varchar, $5::varchar, $6::varchar, "
+            "$7::real, $8::real, $9::integer, $10::uuid, $11::varchar, "
+            "$12::real, $13::real, $14::integer, $15::integer)",
+            str(embedding),
+            query,
+            table,
+            field,
+            tenant_id,
+            provider,
+            min_similarity,
+            threshold,
+            limit,
+            user_id,
+            category,
+            vector_weight,
+            text_weight,
+            rrf_k,
+            max(candidates, limit),
+        )
+        return [dict(r) for r in rows]
+
     async def rem_traverse(
         self,
         key: str,
@@ -82,13 +148,19 @@ class RemMixin:
         max_depth: int = 1,
         rel_type: str | None = None,
         load: bool = False,
+        max_fanout: int | None = None,
+        weighted: bool = False,
     ) -> list[dict]:
-        """Recursive graph walk. Default lazy mode returns keys + summaries.
-        Set load=True to join source tables for full entity data (like LOOKUP)."""
+        """Graph walk; each node is returned once, via its cheapest path.
+        Default lazy mode returns keys + summaries. Set load=True to join
+        source tables for full entity data (like LOOKUP). *max_fanout* caps
+        the edges followed per node (highest weight first); *weighted* orders
+        by ``path_cost`` with hop cost ``1 / rel_weight``."""
         assert self.pool is not None
         rows = await self.pool.fetch(
             "SELECT * FROM rem_traverse("
-            "$1::varchar, $2::varchar, $3::uuid, $4::int, $5::varchar, $6::bool, $7::bool)",
+            "$1::varchar, $2::varchar, $3::uuid, $4::int, $5::varchar, $6::bool, $7::bool,"
+            " $8::int, $9::bool)",
             key,
             tenant_id,
             user_id,
@@ -96,6 +168,8 @@ class RemMixin:
             rel_type,
             False,  # p_keys_only — always false, we use p_load instead
             load,
+            max_fanout,
+            weighted,
         )
         return [dict(r) for r in rows]
 
@@ -181,18 +255,28 @@ class RemMixin:
         encryption_level: str | None = None,
         user_msg_id: UUID | None = None,
         asst_msg_id: UUID | None = None,
+        tool_messages: list[dict] | None = None,
     ) -> dict:
-        """Persist a user+assistant turn atomically. Returns IDs and optional moment name."""
+        """Persist a chat turn atomically. Returns IDs and optional moment name.
+
+        ``tool_messages`` — ordered tool_call/tool_response rows
+        (``{id, message_type, content, token_count, tool_calls}``) stored
+        between the user and assistant messages in the same statement.
+        """
         import json as _json
         tc_json = _json.dumps(tool_calls) if tool_calls else None
+        tm_json = [
+            {k: str(v) if isinstance(v, UUID) else v for k, v in m.items()}
+            for m in tool_messages
+        ] if tool_messages else None
         assert self.pool is not None
         row = await self.pool.fetchrow(
             "SELECT * FROM rem_persist_turn("
-            "$1, $2, $3, $4, $5, $6::jsonb, $7, $8, $9, $10, $11, $12, $13, $14, $15)",
+            "$1, $2, $3, $4, $5, $6::jsonb, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16::jsonb)",
             session_id, user_content, assistant_content,
             user_id, tenant_id, tc_json, moment_threshold,
             input_tokens, output_tokens, latency_ms, model, agent_name,
-            encryption_level, user_msg_id, asst_msg_id,
+            encryption_level, user_msg_id, asst_msg_id, tm_json,
         )
         return dict(row) if row else {}
 
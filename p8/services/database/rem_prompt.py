@@ -14,7 +14,7 @@ REM_GRAMMAR = r"""
 ### BNF Grammar
 
 ```
-<query>        ::= <lookup> | <search> | <fuzzy> | <traverse> | <sql>
+<query>        ::= <lookup> | <search> | <fuzzy> | <hybrid> | <traverse> | <sql>
 
 <lookup>       ::= "LOOKUP" <key_list>
 <key_list>     ::= <key> ("," <key>)*
@@ -30,9 +30,18 @@ REM_GRAMMAR = r"""
 <fuzzy_clause> ::= "THRESHOLD" <float>
                  | "LIMIT" <integer>
 
+<hybrid>       ::= "HYBRID" <query_text> <hybrid_clause>*
+<hybrid_clause>::= <search_clause>
+                 | "THRESHOLD" <float>
+                 | "VECTOR_WEIGHT" <float>
+                 | "TEXT_WEIGHT" <float>
+
 <traverse>     ::= "TRAVERSE" <start_key> <traverse_clause>*
 <traverse_clause> ::= "DEPTH" <integer>
                     | "TYPE" <rel_type>
+                    | "FANOUT" <integer>
+                    | "LOAD"
+                    | "WEIGHTED"
 
 <sql>          ::= "SQL" <raw_sql_string>
                  | <raw_sql_string>
@@ -51,6 +60,7 @@ REM_GRAMMAR = r"""
 | Find a specific named entity | LOOKUP | `LOOKUP "sarah-chen"` |
 | Find entities by meaning/topic | SEARCH | `SEARCH "machine learning" FROM ontologies LIMIT 5` |
 | Find entities by approximate name | FUZZY | `FUZZY "sara chen" LIMIT 5` |
+| Topic that may also match names/keys | HYBRID | `HYBRID "atlas roadmap" FROM resources LIMIT 5` |
 | Explore relationships/connections | TRAVERSE | `TRAVERSE "sarah-chen" DEPTH 2` |
 | Complex filtering or aggregation | SQL | `SQL SELECT name, kind FROM schemas WHERE kind = 'agent'` |
 
@@ -59,6 +69,7 @@ REM_GRAMMAR = r"""
 - **Exact name / identifier** → LOOKUP (fastest, O(1) via KV store)
 - **Conceptual / semantic question** → SEARCH (vector similarity, needs FROM table)
 - **Misspelled / partial name** → FUZZY (trigram matching)
+- **Unsure whether it's a name or a topic** → HYBRID (SEARCH + FUZZY fused in one ranked list)
 - **"What is connected to X"** → TRAVERSE (graph walk)
 - **Counting, grouping, filtering by column values** → SQL
 
@@ -77,6 +88,10 @@ SEARCH "authentication" FROM schemas FIELD content MIN_SIMILARITY 0.6
 FUZZY "sara chen" LIMIT 10
 FUZZY "projct atls" THRESHOLD 0.2
 
+# Hybrid — semantic and trigram results fused by rank
+HYBRID "atlas launch plan" FROM resources LIMIT 5
+HYBRID "sarah chen onboarding" FROM moments TEXT_WEIGHT 2.0
+
 # Graph traversal — explore connections
 TRAVERSE "sarah-chen" DEPTH 2
 TRAVERSE "project-atlas" DEPTH 1 TYPE "member"
@@ -90,7 +105,7 @@ SQL SELECT COUNT(*) FROM ontologies WHERE tenant_id = 'acme'
 
 1. Keys in LOOKUP/TRAVERSE are kebab-case normalized (e.g. "Sarah Chen" → "sarah-chen")
 2. SEARCH requires a FROM clause to specify which table to search — default is "schemas"
-3. FUZZY searches across the KV store (all entity types)
+3. FUZZY searches across the KV store (all entity types); HYBRID's trigram arm is limited to the FROM table
 4. SQL mode blocks destructive statements (DROP, TRUNCATE, ALTER, DELETE without WHERE)
 5. Quoted strings preserve spaces; unquoted tokens are joined
 """.strip()
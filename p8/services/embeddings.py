@@ -15,10 +15,20 @@ In production, replace pg_cron with a cloud scheduler or dedicated worker proces
 from __future__ import annotations
 
 import asyncio
+import base64
 import hashlib
+import json
 import logging
+import random
+import re
 import struct
+import time
+import unicodedata
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import httpx
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from p8.services.database import Database
 from p8.services.encryption import EncryptionService
@@ -51,6 +61,14 @@ class EmbeddingProvider(ABC):
     def dimensions(self) -> int:
         ...
 
+    @property
+    def model_name(self) -> str:
+        """Model identifier — part of cache keys so models never share vectors."""
+        return self.provider_name
+
+    async def aclose(self) -> None:
+        """Release pooled resources (HTTP clients). No-op by default."""
+
 
 # ---------------------------------------------------------------------------
 # Local provider — deterministic, zero dependencies
@@ -127,6 +145,10 @@ class FastEmbedProvider(EmbeddingProvider):
     def provider_name(self) -> str:
         return "fastembed"
 
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
     @property
     def dimensions(self) -> int:
         return self._dimensions
@@ -146,41 +168,303 @@ class FastEmbedProvider(EmbeddingProvider):
 
 
 class OpenAIRestProvider(EmbeddingProvider):
-    """OpenAI text-embedding via REST API. Uses httpx, no openai SDK needed."""
+    """OpenAI text-embedding via REST API. Uses httpx, no openai SDK needed.
+
+    Holds one pooled HTTP/2 ``httpx.AsyncClient`` for the provider's lifetime
+    (created lazily, closed via ``aclose()``), so TLS handshakes happen once
+    per connection rather than once per call.
+
+    ``embed()`` splits its inputs into sub-batches that respect the API's
+    per-request input count and token limits (counted with
+    ``p8.utils.tokens.estimate_tokens``), sends up to ``max_concurrency``
+    sub-batches at once, and retries 429/5xx/transport errors with jittered
+    exponential backoff, honouring ``retry-after`` / ``retry-after-ms``.
 
-    def __init__(self, api_key: str, model: str = "text-embedding-3-small", dimensions: int = 1536):
+    ``base_url`` and ``transport`` exist so tests can point the provider at a
+    local stub server.
+    """
+
+    # API limits: 2048 inputs and 300k tokens per request, 8191 tokens per input.
+    MAX_INPUTS_PER_REQUEST = 2048
+    MAX_TOKENS_PER_REQUEST = 300_000
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "text-embedding-3-small",
+        dimensions: int = 1536,
+        *,
+        base_url: str = "https://api.openai.com/v1",
+        max_batch_tokens: int = 250_000,
+        max_batch_inputs: int = MAX_INPUTS_PER_REQUEST,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 60.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         self._api_key = api_key
         self._model = model
         self._dimensions = dimensions
+        self._base_url = base_url.rstrip("/")
+        self._max_batch_tokens = min(max_batch_tokens, self.MAX_TOKENS_PER_REQUEST)
+        self._max_batch_inputs = min(max_batch_inputs, self.MAX_INPUTS_PER_REQUEST)
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._timeout = timeout
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
 
     @property
     def provider_name(self) -> str:
         return "openai"
 
+    @property
+    def model_name(self) -> str:
+        return self._model
+
     @property
     def dimensions(self) -> int:
         return self._dimensions
 
-    async def embed(self, texts: list[str]) -> list[list[float]]:
-        import httpx
-
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                "https://api.openai.com/v1/embeddings",
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                http2=self._transport is None,
+                transport=self._transport,
+                timeout=self._timeout,
                 headers={
                     "Authorization": f"Bearer {self._api_key}",
                     "Content-Type": "application/json",
                 },
-                json={
-                    "model": self._model,
-                    "input": texts,
-                    "dimensions": self._dimensions,
-                },
-                timeout=60.0,
+                limits=httpx.Limits(
+                    max_connections=self._max_concurrency * 2,
+                    max_keepalive_connections=self._max_concurrency,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        batches = await self._plan_batches(texts)
+        results: list[list[float]] = [[] for _ in texts]
+        sem = asyncio.Semaphore(self._max_concurrency)
+
+        async def _run(indices: list[int]) -> None:
+            async with sem:
+                vectors = await self._request([texts[i] for i in indices])
+            for i, vec in zip(indices, vectors):
+                results[i] = vec
+
+        await asyncio.gather(*(_run(b) for b in batches))
+        return results
+
+    async def _plan_batches(self, texts: list[str]) -> list[list[int]]:
+        """Greedy split of input indices under the per-request input/token limits."""
+        from p8.utils.tokens import aestimate_tokens_many
+
+        batches: list[list[int]] = []
+        current: list[int] = []
+        current_tokens = 0
+        counts = await aestimate_tokens_many(texts, model=self._model)
+        for i, n in enumerate(counts):
+            if current and (
+                len(current) >= self._max_batch_inputs
+                or current_tokens + n > self._max_batch_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += n
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _request(self, inputs: list[str]) -> list[list[float]]:
+        """POST one sub-batch, retrying rate limits and transient failures."""
+        client = self._get_client()
+        payload = {"model": self._model, "input": inputs, "dimensions": self._dimensions}
+        attempt = 0
+        while True:
+            try:
+                resp = await client.post("/embeddings", json=payload)
+            except httpx.TransportError as e:
+                if attempt >= self._max_retries:
+                    raise
+                delay = self._backoff(attempt, None)
+                log.warning("Embedding request error (%s), retrying in %.2fs", e, delay)
+            else:
+                if resp.status_code not in _RETRYABLE_STATUS or attempt >= self._max_retries:
+                    resp.raise_for_status()
+                    data = resp.json()["data"]
+                    return [item["embedding"] for item in sorted(data, key=lambda d: d["index"])]
+                delay = self._backoff(attempt, _retry_after(resp))
+                log.warning(
+                    "Embedding request got %d, retrying in %.2fs (attempt %d/%d)",
+                    resp.status_code, delay, attempt + 1, self._max_retries,
+                )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        """Full-jitter exponential backoff; ``retry-after`` acts as a floor."""
+        cap = min(self._backoff_max, self._backoff_base * (2 ** attempt))
+        jitter = random.uniform(0, cap)
+        if retry_after is not None:
+            return retry_after + jitter * 0.25
+        return jitter
+
+
+_RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def _retry_after(resp: httpx.Response) -> float | None:
+    """Parse ``retry-after-ms`` / ``retry-after`` (seconds) headers."""
+    ms = resp.headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000
+        except ValueError:
+            pass
+    seconds = resp.headers.get("retry-after")
+    if seconds:
+        try:
+            return float(seconds)
+        except ValueError:
+            pass  # HTTP-date form — fall back to computed backoff
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Query embedding cache — SEARCH query text → vector
+# ---------------------------------------------------------------------------
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU + TTL cache of query embeddings, with optional shared tier.
+
+    Agents issue the same SEARCH strings many times per session; a hit skips
+    the provider round-trip entirely. Keys are
+    ``content_hash(provider|model|dimensions|normalized text)``, so
+    whitespace/case variants of a query share one vector. Normalization only
+    shapes the key: a miss embeds the query as written, and that vector
+    serves the variants that follow.
+
+    When ``db`` is given, misses fall through to the UNLOGGED
+    ``query_embedding_cache`` table (see 02_install.sql) before calling the
+    provider, and fresh vectors are written back so all API pods benefit.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0, db: Database | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db = db
+        self._entries: OrderedDict[str, tuple[list[float], float]] = OrderedDict()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+    @staticmethod
+    def key(provider: EmbeddingProvider, normalized: str) -> str:
+        return content_hash(
+            f"{provider.provider_name}|{provider.model_name}|{provider.dimensions}|{normalized}"
+        )
+
+    async def get_or_embed(self, provider: EmbeddingProvider, text: str) -> list[float]:
+        """Return the cached vector for *text*, embedding it on a miss."""
+        key = self.key(provider, self.normalize(text))
+
+        vec = self._get_local(key)
+        if vec is not None:
+            self.hits += 1
+            return vec
+
+        if self.db is not None:
+            vec = await self._get_shared(key)
+            if vec is not None:
+                self.shared_hits += 1
+                self._put_local(key, vec)
+                return vec
+
+        self.misses += 1
+        [vec] = await provider.embed([text])
+        self._put_local(key, vec)
+        if self.db is not None:
+            await self._put_shared(key, provider.provider_name, vec)
+        return vec
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.shared_hits = self.misses = 0
+
+    def _get_local(self, key: str) -> list[float] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        vec, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return vec
+
+    def _put_local(self, key: str, vec: list[float]) -> None:
+        self._entries[key] = (vec, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_shared(self, key: str) -> list[float] | None:
+        assert self.db is not None
+        try:
+            raw = await self.db.fetchval(
+                "SELECT embedding::text FROM query_embedding_cache"
+                " WHERE content_hash = $1"
+                "   AND created_at > CURRENT_TIMESTAMP - make_interval(secs => $2)",
+                key, self.ttl,
             )
-            resp.raise_for_status()
-            data = resp.json()
-            return [item["embedding"] for item in data["data"]]
+        except Exception:
+            log.warning("Shared query-embedding cache read failed", exc_info=True)
+            return None
+        return json.loads(raw) if raw else None
+
+    async def _put_shared(self, key: str, provider_name: str, vec: list[float]) -> None:
+        assert self.db is not None
+        try:
+            await self.db.execute(
+                "INSERT INTO query_embedding_cache (content_hash, provider, embedding)"
+                " VALUES ($1, $2, $3::vector)"
+                " ON CONFLICT (content_hash) DO UPDATE"
+                " SET embedding = EXCLUDED.embedding, created_at = CURRENT_TIMESTAMP",
+                key, provider_name, str(vec),
+            )
+        except Exception:
+            log.warning("Shared query-embedding cache write failed", exc_info=True)
 
 
 # ---------------------------------------------------------------------------
@@ -194,6 +478,13 @@ class EmbeddingService:
     Called by:
       - POST /embeddings/process (triggered by pg_cron or cloud scheduler)
       - Background worker (optional fallback)
+
+    A claimed batch is resolved set-based: one query per (table, field) fetches
+    content, tenant and existing content_hash for every queued entity, and one
+    multi-row INSERT ... ON CONFLICT per table writes the vectors. Batches
+    larger than ``sub_batch_size`` are split into several provider calls that
+    run up to ``max_concurrency`` at a time, so later provider calls overlap
+    with the DB writes of earlier ones.
     """
 
     def __init__(
@@ -202,11 +493,15 @@ class EmbeddingService:
         provider: EmbeddingProvider,
         encryption: EncryptionService,
         batch_size: int = 20,
+        sub_batch_size: int = 0,
+        max_concurrency: int = 2,
     ):
         self.db = db
         self.provider = provider
         self.encryption = encryption
         self.batch_size = batch_size
+        self.sub_batch_size = sub_batch_size or batch_size
+        self.max_concurrency = max(1, max_concurrency)
 
     async def process_batch(self) -> dict:
         """Claim and process one batch from the embedding queue.
@@ -217,74 +512,21 @@ class EmbeddingService:
         if not batch:
             return {"processed": 0, "skipped": 0, "failed": 0}
 
-        # Extract content for each item
-        items_with_text: list[tuple[dict, str, str]] = []  # (item, text, text_hash)
-        skipped = 0
+        pending, skipped_items, failed = await self._load_pending(batch)
+        if skipped_items:
+            await self._remove_from_queue(skipped_items)
+        skipped = len(skipped_items)
 
-        for item in batch:
-            text = await self._extract_content(item)
-            if not text:
-                await self._remove_from_queue(item)
-                skipped += 1
-                continue
-            text = await self._maybe_decrypt(item["table_name"], item["entity_id"], text)
-            text_hash = content_hash(text)
-
-            # Check content-hash cache — skip if embedding already exists for this content
-            existing_hash = await self.db.fetchval(
-                f"SELECT content_hash FROM embeddings_{item['table_name']}"
-                " WHERE entity_id = $1 AND field_name = $2 AND provider = $3",
-                item["entity_id"],
-                item["field_name"],
-                self.provider.provider_name,
-            )
-            if existing_hash == text_hash:
-                await self._remove_from_queue(item)
-                skipped += 1
-                continue
-
-            items_with_text.append((item, text, text_hash))
+        if not pending:
+            return {"processed": 0, "skipped": skipped, "failed": failed}
 
-        if not items_with_text:
-            return {"processed": 0, "skipped": skipped, "failed": 0}
-
-        # Batch embed all texts at once
-        texts = [t for _, t, _ in items_with_text]
-        try:
-            embeddings = await self.provider.embed(texts)
-        except Exception as e:
-            log.error("Batch embedding failed: %s", e)
-            for item, _, _ in items_with_text:
-                await self._fail_item(item, str(e))
-            return {"processed": 0, "skipped": skipped, "failed": len(items_with_text)}
-
-        # Store each embedding
-        processed = 0
-        failed = 0
-        for (item, _, text_hash), embedding in zip(items_with_text, embeddings):
-            try:
-                await self.db.execute(
-                    "SELECT upsert_embedding($1, $2, $3, $4::vector, $5, $6)",
-                    item["table_name"],
-                    item["entity_id"],
-                    item["field_name"],
-                    str(embedding),
-                    self.provider.provider_name,
-                    text_hash,
-                )
-                processed += 1
-                log.info(
-                    "Embedded %s/%s/%s via %s",
-                    item["table_name"],
-                    item["entity_id"],
-                    item["field_name"],
-                    self.provider.provider_name,
-                )
-            except Exception as e:
-                log.warning("Failed to store embedding for %s/%s: %s", item["table_name"], item["entity_id"], e)
-                await self._fail_item(item, str(e))
-                failed += 1
+        size = self.sub_batch_size
+        chunks = [pending[i : i + size] for i in range(0, len(pending), size)]
+        sem = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._embed_and_store(c, sem) for c in chunks))
 
+        processed = sum(ok for ok, _ in results)
+        failed += sum(bad for _, bad in results)
         return {"processed": processed, "skipped": skipped, "failed": failed}
 
     async def embed_texts(self, texts: list[str]) -> list[list[float]]:
@@ -335,22 +577,121 @@ class EmbeddingService:
         )
         return [dict(r) for r in rows]
 
-    async def _extract_content(self, item: dict) -> str | None:
-        return await self.db.fetchval(  # type: ignore[no-any-return]
-            "SELECT content_for_embedding($1, $2, $3)",
-            item["table_name"],
-            item["entity_id"],
-            item["field_name"],
-        )
+    async def _load_pending(
+        self, batch: list[dict],
+    ) -> tuple[list[tuple[dict, str, str]], list[dict], int]:
+        """Resolve content for a claimed batch with one query per (table, field).
 
-    async def _remove_from_queue(self, item: dict):
-        await self.db.execute(
-            "DELETE FROM embedding_queue"
-            " WHERE table_name=$1 AND entity_id=$2 AND field_name=$3",
-            item["table_name"],
-            item["entity_id"],
-            item["field_name"],
-        )
+        Returns (pending, skipped, failed_count) where pending holds
+        (item, text, text_hash) for entities whose content changed since
+        their last embedding, and skipped holds items to drop from the queue
+        (deleted entity, empty field, or content-hash match).
+        """
+        groups: dict[tuple[str, str], list[dict]] = {}
+        for item in batch:
+            groups.setdefault((item["table_name"], item["field_name"]), []).append(item)
+
+        pending: list[tuple[dict, str, str]] = []
+        skipped: list[dict] = []
+        failed = 0
+
+        for (table, field), items in groups.items():
+            if not (_IDENT.match(table) and _IDENT.match(field)):
+                for item in items:
+                    await self._fail_item(item, f"invalid table/field {table}.{field}")
+                failed += len(items)
+                continue
+
+            rows = await self.db.fetch(
+                f'SELECT e.id, e.tenant_id, e."{field}"::text AS content, emb.content_hash'
+                f" FROM {table} e"
+                f" LEFT JOIN embeddings_{table} emb"
+                f"   ON emb.entity_id = e.id AND emb.field_name = $2 AND emb.provider = $3"
+                f" WHERE e.id = ANY($1::uuid[]) AND e.deleted_at IS NULL",
+                [item["entity_id"] for item in items],
+                field,
+                self.provider.provider_name,
+            )
+            by_id = {r["id"]: r for r in rows}
+            ciphers: dict[str, AESGCM | None] = {}
+
+            for item in items:
+                row = by_id.get(item["entity_id"])
+                if row is None or not row["content"]:
+                    skipped.append(item)
+                    continue
+                text = await self._maybe_decrypt(
+                    row["tenant_id"], item["entity_id"], row["content"], ciphers,
+                )
+                text_hash = content_hash(text)
+                # Content-hash cache — embedding already exists for this content
+                if row["content_hash"] == text_hash:
+                    skipped.append(item)
+                    continue
+                pending.append((item, text, text_hash))
+
+        return pending, skipped, failed
+
+    async def _embed_and_store(
+        self, chunk: list[tuple[dict, str, str]], sem: asyncio.Semaphore,
+    ) -> tuple[int, int]:
+        """Embed one sub-batch and bulk-write it. Returns (processed, failed).
+
+        The semaphore only bounds provider calls — it is released before the
+        write so the next sub-batch's provider call overlaps with this one's
+        INSERT.
+        """
+        items = [item for item, _, _ in chunk]
+        async with sem:
+            try:
+                embeddings = await self.provider.embed([t for _, t, _ in chunk])
+            except Exception as e:
+                log.error("Batch embedding failed: %s", e)
+                for item in items:
+                    await self._fail_item(item, str(e))
+                return 0, len(chunk)
+
+        try:
+            await self._store_embeddings(chunk, embeddings)
+        except Exception as e:
+            log.warning("Failed to store %d embeddings: %s", len(chunk), e)
+            for item in items:
+                await self._fail_item(item, str(e))
+            return 0, len(chunk)
+
+        log.info("Embedded %d item(s) via %s", len(chunk), self.provider.provider_name)
+        return len(chunk), 0
+
+    async def _store_embeddings(
+        self, chunk: list[tuple[dict, str, str]], embeddings: list[list[float]],
+    ) -> None:
+        """Multi-row upsert into embeddings_<table> and dequeue, in one transaction."""
+        by_table: dict[str, list[tuple[dict, str, list[float]]]] = {}
+        for (item, _, text_hash), embedding in zip(chunk, embeddings):
+            by_table.setdefault(item["table_name"], []).append((item, text_hash, embedding))
+
+        assert self.db.pool is not None, "Database not connected"
+        async with self.db.pool.acquire() as conn, conn.transaction():
+            for table, rows in by_table.items():
+                await conn.execute(
+                    f"INSERT INTO embeddings_{table}"
+                    f" (entity_id, field_name, embedding, provider, content_hash)"
+                    f" SELECT d.entity_id, d.field_name, d.embedding::vector, $4, d.content_hash"
+                    f" FROM unnest($1::uuid[], $2::varchar[], $3::text[], $5::varchar[])"
+                    f"   AS d(entity_id, field_name, embedding, content_hash)"
+                    f" ON CONFLICT (entity_id, field_name, provider)"
+                    f" DO UPDATE SET embedding = EXCLUDED.embedding,"
+                    f"   content_hash = EXCLUDED.content_hash, created_at = CURRENT_TIMESTAMP",
+                    [item["entity_id"] for item, _, _ in rows],
+                    [item["field_name"] for item, _, _ in rows],
+                    [str(embedding) for _, _, embedding in rows],
+                    self.provider.provider_name,
+                    [text_hash for _, text_hash, _ in rows],
+                )
+            await conn.execute(_DEQUEUE_SQL, *_queue_keys([item for item, _, _ in chunk]))
+
+    async def _remove_from_queue(self, items: list[dict]):
+        await self.db.execute(_DEQUEUE_SQL, *_queue_keys(items))
 
     async def _fail_item(self, item: dict, error: str):
         await self.db.execute(
@@ -361,33 +702,57 @@ class EmbeddingService:
             error,
         )
 
-    async def _maybe_decrypt(self, table: str, entity_id, text: str) -> str:
-        """Attempt to decrypt content if it belongs to an encrypted table."""
-        import base64
-
-        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-
-        row = await self.db.fetchrow(f"SELECT tenant_id FROM {table} WHERE id = $1", entity_id)
-        tenant_id = row["tenant_id"] if row else None
+    async def _maybe_decrypt(
+        self,
+        tenant_id: str | None,
+        entity_id,
+        text: str,
+        ciphers: dict[str, AESGCM | None],
+    ) -> str:
+        """Attempt to decrypt content if the entity belongs to an encrypted tenant.
+
+        ``ciphers`` memoizes one AESGCM context per tenant for the batch.
+        """
         if not tenant_id:
             return text
 
-        await self.encryption.get_dek(tenant_id)
-        cached = self.encryption._dek_cache.get(tenant_id)
-        if not cached:
+        if tenant_id not in ciphers:
+            await self.encryption.get_dek(tenant_id)
+            cached = self.encryption._dek_cache.get(tenant_id)
+            dek = cached[0] if cached else None
+            ciphers[tenant_id] = AESGCM(dek) if isinstance(dek, bytes) else None
+        cipher = ciphers[tenant_id]
+        if cipher is None:
             return text
 
         try:
             raw = base64.b64decode(text)
             nonce, ct = raw[:12], raw[12:]
             aad = f"{tenant_id}:{entity_id}".encode()
-            dek = cached[0]
-            assert isinstance(dek, bytes)
-            return AESGCM(dek).decrypt(nonce, ct, aad).decode()
+            return cipher.decrypt(nonce, ct, aad).decode()
         except Exception:
             return text  # not encrypted
 
 
+_IDENT = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+_DEQUEUE_SQL = (
+    "DELETE FROM embedding_queue q"
+    " USING unnest($1::varchar[], $2::uuid[], $3::varchar[]) AS d(table_name, entity_id, field_name)"
+    " WHERE q.table_name = d.table_name AND q.entity_id = d.entity_id"
+    "   AND q.field_name = d.field_name"
+)
+
+
+def _queue_keys(items: list[dict]) -> tuple[list[str], list, list[str]]:
+    """Column arrays for _DEQUEUE_SQL."""
+    return (
+        [i["table_name"] for i in items],
+        [i["entity_id"] for i in items],
+        [i["field_name"] for i in items],
+    )
+
+
 # ---------------------------------------------------------------------------
 # Background worker — optional fallback when pg_cron is not available
 # ---------------------------------------------------------------------------
@@ -451,6 +816,10 @@ def create_provider(settings: Settings) -> EmbeddingProvider:
             api_key=settings.openai_api_key,
             model=model_name or "text-embedding-3-small",
             dimensions=settings.embedding_dimensions,
+            base_url=settings.embedding_api_base_url,
+            max_batch_tokens=settings.embedding_max_request_tokens,
+            max_concurrency=settings.embedding_request_concurrency,
+            max_retries=settings.embedding_max_retries,
         )
     if provider == "fastembed":
         return FastEmbedProvider(
@@ -17,10 +17,16 @@ Fallback chain:
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
+import logging
 import os
 import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar, overload
 
 from cryptography.hazmat.primitives.asymmetric import padding as asym_padding, rsa
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
@@ -28,49 +34,174 @@ from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes, serialization
 
 from p8.ontology.base import CoreModel
-from p8.services.kms import KMSProvider
+from p8.services.kms import KeyRecord, KMSProvider
+
+logger = logging.getLogger(__name__)
 
 # Sentinels for DEK cache
 _DISABLED = b"__disabled__"
 _SEALED = b"__sealed__"
 
+# A hit inside the last REFRESH_AHEAD of the TTL still returns the cached DEK
+# but starts a background re-resolve, so hot tenants never see a cold miss.
+REFRESH_AHEAD = 0.2
+
+# encrypt_rows/decrypt_rows(parallel=True) split result sets at least this
+# large across a thread pool; smaller sets aren't worth the hand-off.
+PARALLEL_MIN_ROWS = 2000
+PARALLEL_WORKERS = 4
+
+_row_pool: ThreadPoolExecutor | None = None
+
+K = TypeVar("K")
+V = TypeVar("V")
+D = TypeVar("D")
+
+
+def _get_row_pool() -> ThreadPoolExecutor:
+    global _row_pool
+    if _row_pool is None:
+        _row_pool = ThreadPoolExecutor(max_workers=PARALLEL_WORKERS, thread_name_prefix="p8-crypto")
+    return _row_pool
+
+
+class _LRUCache(OrderedDict[K, V]):
+    """Dict bounded to ``maxsize`` entries; get()/set refresh recency, oldest evicted.
+
+    ``on_evict(key)`` runs whenever a key's value is dropped or replaced, so
+    derived per-key state can be released with it.
+    """
+
+    def __init__(self, maxsize: int, on_evict: Callable[[K], None] | None = None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+
+    @overload
+    def get(self, key: K, default: None = None, /) -> V | None: ...
+    @overload
+    def get(self, key: K, default: V, /) -> V: ...
+    @overload
+    def get(self, key: K, default: D, /) -> V | D: ...
+
+    def get(self, key, default=None, /):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        if self.on_evict and key in self:
+            self.on_evict(key)
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            oldest, _ = self.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(oldest)
+
+    def __delitem__(self, key: K) -> None:
+        super().__delitem__(key)
+        if self.on_evict:
+            self.on_evict(key)
+
+    @overload
+    def pop(self, key: K, /) -> V: ...
+    @overload
+    def pop(self, key: K, default: V, /) -> V: ...
+    @overload
+    def pop(self, key: K, default: D, /) -> V | D: ...
+
+    def pop(self, key, *default):
+        if self.on_evict and key in self:
+            self.on_evict(key)
+        return super().pop(key, *default)
+
 
 class EncryptionService:
-    def __init__(self, kms: KMSProvider, *, system_tenant_id: str = "__system__", cache_ttl: int = 300):
+    def __init__(
+        self, kms: KMSProvider, *, system_tenant_id: str = "__system__", cache_ttl: int = 300,
+        cache_size: int = 10_000,
+    ):
         self.kms = kms
         self.system_tenant_id = system_tenant_id
-        self._dek_cache: dict[str, tuple[bytes | None, float]] = {}
-        self._mode_cache: dict[str, tuple[str, float]] = {}
-        self._sealed_cache: dict[str, tuple] = {}  # tenant → (public_key_obj, expiry)
+        # tenant → (dek | sentinel, expiry) / (mode, expiry) / (public_key_obj, expiry)
+        self._dek_cache: _LRUCache[str, tuple[bytes, float]] = _LRUCache(
+            cache_size, on_evict=self._drop_cipher,
+        )
+        self._mode_cache: _LRUCache[str, tuple[str, float]] = _LRUCache(cache_size)
+        self._sealed_cache: _LRUCache[str, tuple[Any, float]] = _LRUCache(cache_size)
+        self._inflight: dict[str, asyncio.Task] = {}  # single-flight resolutions per tenant
+        # tenant → (dek, AESGCM) — lives exactly as long as the tenant's _dek_cache entry
+        self._ciphers: dict[str, tuple[bytes, AESGCM]] = {}
         self.cache_ttl = cache_ttl
 
+    def _cipher(self, tenant_id: str, dek: bytes) -> AESGCM:
+        """AESGCM context for the tenant's cached DEK (stateless, thread-safe)."""
+        entry = self._ciphers.get(tenant_id)
+        if entry is None or entry[0] is not dek:
+            entry = self._ciphers[tenant_id] = (dek, AESGCM(dek))
+        return entry[1]
+
+    def _drop_cipher(self, tenant_id: str) -> None:
+        self._ciphers.pop(tenant_id, None)
+
     async def ensure_system_key(self) -> None:
         """Create system DEK if it doesn't exist. Call once at startup."""
         await self.get_dek(self.system_tenant_id)
 
     async def get_dek(self, tenant_id: str) -> bytes | None:
-        """Resolve DEK with fallback: tenant key → system key → None (disabled/sealed)."""
+        """Resolve DEK with fallback: tenant key → system key → None (disabled/sealed).
+
+        Concurrent misses for a tenant share one in-flight KMS resolution, and
+        hits near expiry refresh in the background (see REFRESH_AHEAD).
+        """
         cached = self._dek_cache.get(tenant_id)
-        if cached and cached[1] > time.time():
+        now = time.time()
+        if cached and cached[1] > now:
+            if cached[1] - now < self.cache_ttl * REFRESH_AHEAD:
+                self._refresh_in_background(tenant_id)
             return None if cached[0] is _DISABLED or cached[0] is _SEALED else cached[0]
+        return await self._resolve_single_flight(tenant_id)
+
+    async def _resolve_single_flight(self, tenant_id: str) -> bytes | None:
+        task = self._inflight.get(tenant_id)
+        if task is None:
+            task = asyncio.ensure_future(self._resolve_dek(tenant_id))
+            self._inflight[tenant_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(tenant_id, None))
+        # Shield: one waiter being cancelled must not cancel the shared lookup
+        return await asyncio.shield(task)
+
+    def _refresh_in_background(self, tenant_id: str) -> None:
+        if tenant_id in self._inflight:
+            return
+        task = asyncio.ensure_future(self._resolve_single_flight(tenant_id))
+        task.add_done_callback(_log_refresh_failure)
+
+    async def _resolve_dek(self, tenant_id: str) -> bytes | None:
+        """One tenant_keys fetch → cache DEK (or sentinel) and mode together."""
+        record = await self.kms.get_key_record(tenant_id)
+        active = record if record is not None and record.status == "active" else None
+        expiry = time.time() + self.cache_ttl
+        # Mode only counts for an active key; no own key → platform (system DEK)
+        self._mode_cache[tenant_id] = ((active and active.mode) or "platform", expiry)
 
         # Check if tenant explicitly disabled encryption
-        disabled = await self.kms.is_disabled(tenant_id)
-        if disabled:
-            self._dek_cache[tenant_id] = (_DISABLED, time.time() + self.cache_ttl)
+        if record is not None and record.status == "disabled":
+            self._dek_cache[tenant_id] = (_DISABLED, expiry)
             return None
 
         # Check sealed mode (asymmetric — public key only, no symmetric DEK)
-        mode = await self.kms.get_mode(tenant_id)
-        if mode == "sealed":
-            await self._get_sealed_pubkey(tenant_id)
-            self._dek_cache[tenant_id] = (_SEALED, time.time() + self.cache_ttl)
+        if active and active.mode == "sealed":
+            self._cache_sealed_pubkey(tenant_id, active)
+            self._dek_cache[tenant_id] = (_SEALED, expiry)
             return None
 
         # Try tenant's own key
-        dek = await self.kms.unwrap_dek(tenant_id)
+        dek = await self.kms.unwrap_record(tenant_id, active) if active else None
         if dek is not None:
-            self._dek_cache[tenant_id] = (dek, time.time() + self.cache_ttl)
+            self._dek_cache[tenant_id] = (dek, expiry)
             return dek
 
         # System tenant always generates its own key (no further fallback)
@@ -95,12 +226,10 @@ class EncryptionService:
         if cached and cached[1] > time.time():
             return cached[0]
 
-        mode = await self.kms.get_mode(tenant_id)
-        if mode is None:
-            # No own key — fallback to system = platform mode
-            mode = "platform"
-        self._mode_cache[tenant_id] = (mode, time.time() + self.cache_ttl)
-        return mode
+        # Same single fetch as get_dek caches the mode (no own key → platform)
+        await self._resolve_single_flight(tenant_id)
+        cached = self._mode_cache.get(tenant_id)
+        return cached[0] if cached else "platform"
 
     async def should_decrypt_on_read(self, tenant_id: str | None) -> bool:
         """Platform mode: we decrypt. Client/sealed mode: return ciphertext."""
@@ -184,40 +313,72 @@ class EncryptionService:
         self._sealed_cache[tenant_id] = (pub_key, time.time() + self.cache_ttl)
         return pub_key
 
+    def _cache_sealed_pubkey(self, tenant_id: str, record: KeyRecord) -> None:
+        """Sealed rows store the tenant's public key PEM in wrapped_dek."""
+        cached = self._sealed_cache.get(tenant_id)
+        if cached and cached[1] > time.time():
+            return
+        pub_key = serialization.load_pem_public_key(record.wrapped_dek)
+        self._sealed_cache[tenant_id] = (pub_key, time.time() + self.cache_ttl)
+
     # --- Field encryption / decryption ---
 
     def encrypt_fields(
         self, model_class: type[CoreModel], data: dict, tenant_id: str | None
     ) -> dict:
+        return self.encrypt_rows(model_class, [data], tenant_id)[0]
+
+    def encrypt_rows(
+        self, model_class: type[CoreModel], rows: list[dict], tenant_id: str | None,
+        *, parallel: bool = False,
+    ) -> list[dict]:
+        """Encrypt all encrypted fields of ``rows`` (one tenant) in place.
+
+        Same output as ``encrypt_fields`` per row, but resolves the DEK and
+        cipher context once for the whole batch. ``parallel=True`` splits
+        batches of ``PARALLEL_MIN_ROWS`` or more across a thread pool.
+        """
         encrypted_fields = getattr(model_class, "__encrypted_fields__", {})
-        if not encrypted_fields or not tenant_id:
-            return data
+        if not encrypted_fields or not tenant_id or not rows:
+            return rows
 
         cached = self._dek_cache.get(tenant_id)
         if not cached or cached[0] is _DISABLED:
-            return data
+            return rows
 
         # Sealed mode: hybrid encryption with RSA public key
         if cached[0] is _SEALED:
-            return self._encrypt_fields_sealed(model_class, data, tenant_id)
+            for data in rows:
+                self._encrypt_fields_sealed(model_class, data, tenant_id)
+            return rows
 
         dek = cached[0]
-        assert isinstance(dek, bytes)
-        entity_id = str(data.get("id", ""))
-        aad = f"{tenant_id}:{entity_id}".encode()
-
-        for field, mode in encrypted_fields.items():
-            if field not in data or data[field] is None:
-                continue
-            plaintext = str(data[field]).encode("utf-8")
-            if mode == "deterministic":
-                nonce = hashlib.sha256(dek + plaintext + aad).digest()[:12]
-            else:
-                nonce = os.urandom(12)
-            ciphertext = AESGCM(dek).encrypt(nonce, plaintext, aad)
-            data[field] = base64.b64encode(nonce + ciphertext).decode("ascii")
+        aead = self._cipher(tenant_id, dek)
+        fields = tuple(encrypted_fields.items())
+        self._map_rows(
+            lambda batch: self._encrypt_batch(batch, fields, dek, aead, tenant_id), rows, parallel,
+        )
+        return rows
 
-        return data
+    @staticmethod
+    def _encrypt_batch(
+        rows: list[dict], fields: tuple[tuple[str, str], ...], dek: bytes, aead: AESGCM,
+        tenant_id: str,
+    ) -> None:
+        b64encode = base64.b64encode
+        for data in rows:
+            entity_id = str(data.get("id", ""))
+            aad = f"{tenant_id}:{entity_id}".encode()
+            for field, mode in fields:
+                if field not in data or data[field] is None:
+                    continue
+                plaintext = str(data[field]).encode("utf-8")
+                if mode == "deterministic":
+                    nonce = hashlib.sha256(dek + plaintext + aad).digest()[:12]
+                else:
+                    nonce = os.urandom(12)
+                ciphertext = aead.encrypt(nonce, plaintext, aad)
+                data[field] = b64encode(nonce + ciphertext).decode("ascii")
 
     def _encrypt_fields_sealed(
         self, model_class: type[CoreModel], data: dict, tenant_id: str
@@ -259,31 +420,57 @@ class EncryptionService:
     def decrypt_fields(
         self, model_class: type[CoreModel], data: dict, tenant_id: str | None
     ) -> dict:
+        return self.decrypt_rows(model_class, [data], tenant_id)[0]
+
+    def decrypt_rows(
+        self, model_class: type[CoreModel], rows: list[dict], tenant_id: str | None,
+        *, parallel: bool = False,
+    ) -> list[dict]:
+        """Decrypt all encrypted fields of ``rows`` (one tenant) in place.
+
+        Same semantics as ``decrypt_fields`` per row — undecryptable values are
+        left as-is — with one DEK lookup and cipher context for the batch.
+        ``parallel=True`` splits batches of ``PARALLEL_MIN_ROWS`` or more
+        across a thread pool.
+        """
         encrypted_fields = getattr(model_class, "__encrypted_fields__", {})
-        if not encrypted_fields or not tenant_id:
-            return data
+        if not encrypted_fields or not tenant_id or not rows:
+            return rows
 
         cached = self._dek_cache.get(tenant_id)
         if not cached or cached[0] is _DISABLED or cached[0] is _SEALED:
-            return data  # sealed: can't decrypt without private key
-        dek = cached[0]
-        assert isinstance(dek, bytes)
+            return rows  # sealed: can't decrypt without private key
+        aead = self._cipher(tenant_id, cached[0])
 
-        entity_id = str(data.get("id", ""))
-        aad = f"{tenant_id}:{entity_id}".encode()
+        fields = tuple(encrypted_fields)
+        self._map_rows(lambda batch: self._decrypt_batch(batch, fields, aead, tenant_id), rows, parallel)
+        return rows
 
-        for field in encrypted_fields:
-            if field not in data or data[field] is None:
-                continue
-            try:
-                raw = base64.b64decode(data[field])
-                nonce, ciphertext = raw[:12], raw[12:]
-                plaintext = AESGCM(dek).decrypt(nonce, ciphertext, aad)
-                data[field] = plaintext.decode("utf-8")
-            except Exception:
-                pass  # not encrypted or corrupted — return as-is
+    @staticmethod
+    def _decrypt_batch(rows: list[dict], fields: tuple[str, ...], aead: AESGCM, tenant_id: str) -> None:
+        b64decode = base64.b64decode
+        for data in rows:
+            entity_id = str(data.get("id", ""))
+            aad = f"{tenant_id}:{entity_id}".encode()
+            for field in fields:
+                if field not in data or data[field] is None:
+                    continue
+                try:
+                    raw = b64decode(data[field])
+                    data[field] = aead.decrypt(raw[:12], raw[12:], aad).decode("utf-8")
+                except Exception:
+                    pass  # not encrypted or corrupted — return as-is
 
-        return data
+    @staticmethod
+    def _map_rows(fn, rows: list[dict], parallel: bool) -> None:
+        """Run ``fn`` over ``rows`` — in one pass, or as slices on the row pool."""
+        if not parallel or len(rows) < PARALLEL_MIN_ROWS:
+            fn(rows)
+            return
+        size = -(-len(rows) // PARALLEL_WORKERS)
+        slices = [rows[i:i + size] for i in range(0, len(rows), size)]
+        # Slices hold the same dicts, so in-place updates land in ``rows``
+        list(_get_row_pool().map(fn, slices))
 
     @staticmethod
     def decrypt_sealed(
@@ -329,3 +516,8 @@ class EncryptionService:
     @staticmethod
     def content_hash(text: str) -> str:
         return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background DEK refresh failed", exc_info=task.exception())
@@ -0,0 +1,171 @@
+"""Warm Kreuzberg extraction pool — long-lived worker processes for document parsing.
+
+Under Hypercorn/Uvicorn the server process is a multiprocessing daemon, so
+Kreuzberg's ProcessPoolExecutor cannot fork there. Rather than starting a
+fresh ``python -c`` (interpreter + kreuzberg import) per document, the pool
+keeps N interpreters with kreuzberg already imported and sends them file
+paths over stdin, one JSON line per job.
+
+Workers are plain subprocesses, not multiprocessing children, so they are
+not daemonic and Kreuzberg can fork inside them. A worker is recycled after
+``max_jobs`` jobs or once its peak RSS passes ``max_rss_mb``, and is killed
+and replaced when a job exceeds ``timeout``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_LINE_LIMIT = 256 * 1024 * 1024  # one reply line holds the full text + chunks
+
+# Protocol: worker prints {"ready": true}, then answers each job line with
+# {"content", "chunks"} or {"error"}, plus its peak RSS. Library output on
+# stdout is redirected to stderr so it cannot corrupt the reply stream.
+_WORKER_SCRIPT = """
+import json, os, resource, sys
+from pathlib import Path
+
+out = os.fdopen(os.dup(1), "w")
+os.dup2(2, 1)
+from kreuzberg import ChunkingConfig, ExtractionConfig, extract_file_sync
+
+def reply(msg):
+    msg["rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out.write(json.dumps(msg) + "\\n")
+    out.flush()
+
+reply({"ready": True})
+for line in sys.stdin:
+    job = json.loads(line)
+    try:
+        chunking = ChunkingConfig(max_chars=job["max_chars"], max_overlap=job["overlap"])
+        result = extract_file_sync(
+            Path(job["path"]), mime_type=job["mime_type"], config=ExtractionConfig(chunking=chunking),
+        )
+        chunks = [c.content for c in result.chunks] if result.chunks else []
+        if not chunks and result.content:
+            chunks = [result.content]
+        reply({"content": result.content, "chunks": chunks})
+    except Exception as e:
+        reply({"error": f"{type(e).__name__}: {e}"})
+"""
+
+
+class _Worker:
+    """One warm extractor process and its job count."""
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.jobs = 0
+        self.rss_kb = 0
+        self.ready = False
+
+    @classmethod
+    async def spawn(cls) -> _Worker:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", _WORKER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, limit=_LINE_LIMIT,
+        )
+        return cls(proc)
+
+    async def _read(self) -> dict:
+        assert self.proc.stdout is not None
+        line = await self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Extraction worker exited (code {await self.proc.wait()})")
+        msg: dict = json.loads(line)
+        self.rss_kb = msg.get("rss_kb", self.rss_kb)
+        return msg
+
+    async def request(self, job: dict) -> dict:
+        assert self.proc.stdin is not None
+        if not self.ready:
+            await self._read()  # kreuzberg import finished
+            self.ready = True
+        self.proc.stdin.write((json.dumps(job) + "\n").encode())
+        await self.proc.stdin.drain()
+        reply = await self._read()
+        self.jobs += 1
+        return reply
+
+    async def stop(self, *, kill: bool = False) -> None:
+        if self.proc.returncode is not None:
+            return
+        if kill:
+            self.proc.kill()
+        else:
+            assert self.proc.stdin is not None
+            self.proc.stdin.close()  # EOF ends the worker's read loop
+        try:
+            await asyncio.wait_for(self.proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            self.proc.kill()
+            await self.proc.wait()
+
+
+class ExtractionPool:
+    """Bounded pool of warm extractor processes. Lazily spawned; ``start()`` pre-warms."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        max_jobs: int = 100,
+        max_rss_mb: int = 1024,
+        timeout: float = 300.0,
+    ):
+        self.size = max(1, size)
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(self.size)
+        self._idle: list[_Worker] = []
+
+    async def start(self) -> None:
+        """Spawn workers up to ``size`` without waiting for their imports to finish."""
+        while len(self._idle) < self.size:
+            self._idle.append(await _Worker.spawn())
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(w.stop() for w in idle))
+
+    async def extract(
+        self, path: str | Path, mime_type: str, max_chars: int, overlap: int,
+    ) -> tuple[str, list[str]]:
+        """Extract and chunk a document on a warm worker. Returns (full_text, chunks)."""
+        job = {"path": str(path), "mime_type": mime_type, "max_chars": max_chars, "overlap": overlap}
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else await _Worker.spawn()
+            try:
+                reply = await asyncio.wait_for(worker.request(job), timeout=self.timeout)
+            except BaseException as e:
+                # Timed out, died, or cancelled mid-job — its state is unknown
+                await worker.stop(kill=True)
+                if isinstance(e, asyncio.TimeoutError):
+                    raise RuntimeError(
+                        f"Document extraction timed out after {self.timeout:.0f}s",
+                    ) from None
+                raise
+
+            if self._should_recycle(worker):
+                logger.info(
+                    "Recycling extraction worker pid=%s (jobs=%d, rss=%dMB)",
+                    worker.proc.pid, worker.jobs, worker.rss_kb // 1024,
+                )
+                await worker.stop()
+            else:
+                self._idle.append(worker)
+
+        if "error" in reply:
+            raise RuntimeError(f"Document extraction failed: {reply['error'][-500:]}")
+        return reply["content"], reply["chunks"]
+
+    def _should_recycle(self, worker: _Worker) -> bool:
+        return worker.jobs >= self.max_jobs or worker.rss_kb > self.max_rss_mb * 1024
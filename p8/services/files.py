@@ -4,10 +4,26 @@ from __future__ import annotations
 
 import asyncio
 import mimetypes
+import shutil
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import IO
 
 from p8.settings import Settings
 
+STREAM_CHUNK_BYTES = 256 * 1024  # read size for streamed/ranged downloads
+
+
+@dataclass(frozen=True)
+class FileStat:
+    """Size and validators for conditional / ranged reads."""
+
+    size: int
+    etag: str  # quoted, as sent in the ETag header
+    last_modified: datetime
+
 
 class FileService:
     """Read and write files from local paths or S3 URIs."""
@@ -27,6 +43,74 @@ class FileService:
     async def read_text(self, path: str, encoding: str = "utf-8") -> str:
         return (await self.read(path)).decode(encoding)
 
+    async def download_to(self, path: str, fileobj: IO[bytes]) -> int:
+        """Stream file content into a file-like object. Returns bytes written."""
+        start = fileobj.tell()
+        if path.startswith("s3://"):
+            self._ensure_s3_client()
+            bucket, key = self._parse_s3_uri(path)
+            config = self._transfer_config()
+
+            def _download():
+                assert self._s3_client is not None
+                self._s3_client.download_fileobj(bucket, key, fileobj, Config=config)
+
+            await asyncio.to_thread(_download)
+        else:
+            p = Path(path)
+            if not p.exists():
+                raise FileNotFoundError(f"File not found: {path}")
+            with p.open("rb") as src:
+                await asyncio.to_thread(shutil.copyfileobj, src, fileobj)
+        return fileobj.tell() - start
+
+    async def stat(self, path: str) -> FileStat:
+        """Size, ETag and Last-Modified without reading content."""
+        if path.startswith("s3://"):
+            return await self._stat_s3(path)
+        p = Path(path)
+        if not p.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        st = p.stat()
+        return FileStat(
+            size=st.st_size,
+            etag=f'"{st.st_mtime_ns:x}-{st.st_size:x}"',
+            last_modified=datetime.fromtimestamp(st.st_mtime, UTC),
+        )
+
+    async def iter_bytes(
+        self,
+        path: str,
+        start: int = 0,
+        end: int | None = None,
+        *,
+        etag: str | None = None,
+        chunk_size: int = STREAM_CHUNK_BYTES,
+    ) -> AsyncIterator[bytes]:
+        """Yield bytes ``start..end`` (inclusive) in ``chunk_size`` pieces.
+
+        S3 objects are fetched with a ranged GET; pass the ``etag`` from
+        ``stat()`` to fail instead of mixing versions if the object changed.
+        """
+        if path.startswith("s3://"):
+            async for chunk in self._iter_s3(path, start, end, etag, chunk_size):
+                yield chunk
+            return
+        p = Path(path)
+        if not p.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        with p.open("rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                n = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await asyncio.to_thread(f.read, n)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
     def list_dir(self, path: str, pattern: str = "**/*.md") -> list[str]:
         """List files matching pattern. Local-only for now."""
         p = Path(path)
@@ -55,6 +139,27 @@ class FileService:
         await self._write_s3(uri, data)
         return uri
 
+    async def write_fileobj_to_bucket(
+        self, key: str, fileobj: IO[bytes], bucket: str | None = None
+    ) -> str:
+        """Stream a file-like object to S3 (multipart above one part). Returns s3:// URI.
+
+        Memory stays at ``s3_multipart_chunk_bytes * s3_transfer_concurrency``
+        whatever the object size.
+        """
+        bucket = bucket or self.settings.s3_bucket
+        if not bucket:
+            raise ValueError("No S3 bucket configured (set P8_S3_BUCKET)")
+        self._ensure_s3_client()
+        config = self._transfer_config()
+
+        def _upload():
+            assert self._s3_client is not None
+            self._s3_client.upload_fileobj(fileobj, bucket, key, Config=config)
+
+        await asyncio.to_thread(_upload)
+        return f"s3://{bucket}/{key}"
+
     # ── Helpers ────────────────────────────────────────────────────────────
 
     @staticmethod
@@ -93,6 +198,17 @@ class FileService:
                 kwargs["aws_secret_access_key"] = self.settings.s3_secret_access_key
             self._s3_client = boto3.client("s3", **kwargs)
 
+    def _transfer_config(self):
+        """Bounded multipart settings for upload_fileobj / download_fileobj."""
+        from boto3.s3.transfer import TransferConfig
+
+        chunk = self.settings.s3_multipart_chunk_bytes
+        return TransferConfig(
+            multipart_threshold=chunk,
+            multipart_chunksize=chunk,
+            max_concurrency=self.settings.s3_transfer_concurrency,
+        )
+
     @staticmethod
     def _parse_s3_uri(uri: str) -> tuple[str, str]:
         """Parse s3://bucket/key → (bucket, key)."""
@@ -122,3 +238,47 @@ class FileService:
             self._s3_client.put_object(Bucket=bucket, Key=key, Body=data)
 
         await asyncio.to_thread(_put)
+
+    async def _stat_s3(self, uri: str) -> FileStat:
+        from botocore.exceptions import ClientError
+
+        self._ensure_s3_client()
+        bucket, key = self._parse_s3_uri(uri)
+
+        def _head():
+            assert self._s3_client is not None
+            try:
+                return self._s3_client.head_object(Bucket=bucket, Key=key)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                    raise FileNotFoundError(f"File not found: {uri}") from e
+                raise
+
+        head = await asyncio.to_thread(_head)
+        return FileStat(
+            size=head["ContentLength"],
+            etag=head["ETag"],
+            last_modified=head["LastModified"],
+        )
+
+    async def _iter_s3(
+        self, uri: str, start: int, end: int | None, etag: str | None, chunk_size: int,
+    ) -> AsyncIterator[bytes]:
+        self._ensure_s3_client()
+        bucket, key = self._parse_s3_uri(uri)
+        kwargs: dict = {"Bucket": bucket, "Key": key}
+        if start or end is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        if etag:
+            kwargs["IfMatch"] = etag
+
+        def _get():
+            assert self._s3_client is not None
+            return self._s3_client.get_object(**kwargs)["Body"]
+
+        body = await asyncio.to_thread(_get)
+        try:
+            while chunk := await asyncio.to_thread(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
@@ -6,11 +6,26 @@ import base64
 import logging
 import os
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 logger = logging.getLogger(__name__)
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
+if TYPE_CHECKING:
+    import httpx
+
+
+@dataclass(frozen=True)
+class KeyRecord:
+    """One tenant_keys row — everything DEK resolution needs in a single fetch."""
+
+    status: str
+    mode: str | None
+    wrapped_dek: bytes
+    kms_key_id: str | None
+
 
 class KMSProvider(ABC):
     @abstractmethod
@@ -19,6 +34,12 @@ class KMSProvider(ABC):
     @abstractmethod
     async def unwrap_dek(self, tenant_id: str) -> bytes | None: ...
 
+    @abstractmethod
+    async def get_key_record(self, tenant_id: str) -> KeyRecord | None: ...
+
+    @abstractmethod
+    async def unwrap_record(self, tenant_id: str, record: KeyRecord) -> bytes | None: ...
+
     @abstractmethod
     async def is_disabled(self, tenant_id: str) -> bool: ...
 
@@ -40,6 +61,9 @@ class KMSProvider(ABC):
     @abstractmethod
     async def get_sealed_public_key(self, tenant_id: str) -> bytes | None: ...
 
+    async def aclose(self) -> None:
+        """Release pooled connections (no-op unless the backend holds any)."""
+
 
 # ---------------------------------------------------------------------------
 # SQL helpers shared by both providers (sealed key ops hit the same table)
@@ -56,6 +80,20 @@ _SEALED_SELECT = (
     " WHERE tenant_id = $1 AND mode = 'sealed' AND status = 'active'"
 )
 
+_KEY_RECORD_SELECT = (
+    "SELECT status, mode, wrapped_dek, kms_key_id FROM tenant_keys WHERE tenant_id = $1"
+)
+
+
+async def _fetch_key_record(db, tenant_id: str) -> KeyRecord | None:
+    row = await db.fetchrow(_KEY_RECORD_SELECT, tenant_id)
+    if not row:
+        return None
+    return KeyRecord(
+        status=row["status"], mode=row["mode"],
+        wrapped_dek=bytes(row["wrapped_dek"]), kms_key_id=row["kms_key_id"],
+    )
+
 
 class LocalFileKMS(KMSProvider):
     """Dev KMS — master key in a local file, DEKs in tenant_keys table."""
@@ -86,13 +124,16 @@ class LocalFileKMS(KMSProvider):
         )
 
     async def unwrap_dek(self, tenant_id: str) -> bytes | None:
-        row = await self.db.fetchrow(
-            "SELECT wrapped_dek FROM tenant_keys WHERE tenant_id = $1 AND status = 'active'",
-            tenant_id,
-        )
-        if not row:
+        record = await self.get_key_record(tenant_id)
+        if not record or record.status != "active":
             return None
-        raw = bytes(row["wrapped_dek"])
+        return await self.unwrap_record(tenant_id, record)
+
+    async def get_key_record(self, tenant_id: str) -> KeyRecord | None:
+        return await _fetch_key_record(self.db, tenant_id)
+
+    async def unwrap_record(self, tenant_id: str, record: KeyRecord) -> bytes | None:
+        raw = record.wrapped_dek
         nonce, ciphertext = raw[:12], raw[12:]
         return AESGCM(self.master_key).decrypt(nonce, ciphertext, tenant_id.encode())
 
@@ -151,34 +192,42 @@ class VaultTransitKMS(KMSProvider):
         self.url = url.rstrip("/")
         self.token = token
         self.key_name = key_name
+        self._client: httpx.AsyncClient | None = None  # lazy shared client (keep-alive to Vault)
 
-    async def _ensure_transit_key(self, name: str) -> None:
-        """Create a transit key if it doesn't exist."""
-        import httpx
+    def _http(self):
+        """Shared pooled client — one TLS/TCP setup per process, not per call."""
+        if self._client is None or self._client.is_closed:
+            import httpx
 
-        async with httpx.AsyncClient() as client:
-            await client.post(
-                f"{self.url}/v1/transit/keys/{name}",
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
                 headers={"X-Vault-Token": self.token},
-                json={"type": "aes256-gcm96"},
+                timeout=httpx.Timeout(10.0, connect=5.0),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
             )
+        return self._client
 
-    async def wrap_and_store_dek(self, tenant_id: str, dek: bytes, *, mode: str = "platform") -> None:
-        import httpx
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
+    async def _ensure_transit_key(self, name: str) -> None:
+        """Create a transit key if it doesn't exist."""
+        await self._http().post(f"/v1/transit/keys/{name}", json={"type": "aes256-gcm96"})
+
+    async def wrap_and_store_dek(self, tenant_id: str, dek: bytes, *, mode: str = "platform") -> None:
         key_name = f"{self.key_name}-{tenant_id}"
         await self._ensure_transit_key(key_name)
 
         plaintext_b64 = base64.b64encode(dek).decode()
         ctx = base64.b64encode(tenant_id.encode()).decode()
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.url}/v1/transit/encrypt/{key_name}",
-                headers={"X-Vault-Token": self.token},
-                json={"plaintext": plaintext_b64, "context": ctx},
-            )
-            resp.raise_for_status()
-            ciphertext = resp.json()["data"]["ciphertext"]
+        resp = await self._http().post(
+            f"/v1/transit/encrypt/{key_name}",
+            json={"plaintext": plaintext_b64, "context": ctx},
+        )
+        resp.raise_for_status()
+        ciphertext = resp.json()["data"]["ciphertext"]
         await self.db.execute(
             """INSERT INTO tenant_keys (tenant_id, wrapped_dek, kms_key_id, algorithm, status, mode)
                VALUES ($1, $2, $3, 'vault-transit', 'active', $4)
@@ -192,15 +241,16 @@ class VaultTransitKMS(KMSProvider):
         )
 
     async def unwrap_dek(self, tenant_id: str) -> bytes | None:
-        row = await self.db.fetchrow(
-            "SELECT wrapped_dek, kms_key_id FROM tenant_keys WHERE tenant_id = $1 AND status = 'active'",
-            tenant_id,
-        )
-        if not row:
+        record = await self.get_key_record(tenant_id)
+        if not record or record.status != "active":
             return None
-        import httpx
+        return await self.unwrap_record(tenant_id, record)
 
-        key_name = row["kms_key_id"]
+    async def get_key_record(self, tenant_id: str) -> KeyRecord | None:
+        return await _fetch_key_record(self.db, tenant_id)
+
+    async def unwrap_record(self, tenant_id: str, record: KeyRecord) -> bytes | None:
+        key_name = record.kms_key_id
 
         # DEKs written by LocalKMS can't be unwrapped by Vault transit
         if not key_name or not key_name.startswith(self.key_name):
@@ -212,7 +262,7 @@ class VaultTransitKMS(KMSProvider):
             )
             return None
 
-        raw = bytes(row["wrapped_dek"])
+        raw = record.wrapped_dek
         try:
             ciphertext = raw.decode()
         except UnicodeDecodeError:
@@ -222,14 +272,12 @@ class VaultTransitKMS(KMSProvider):
             )
             return None
         ctx = base64.b64encode(tenant_id.encode()).decode()
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.url}/v1/transit/decrypt/{key_name}",
-                headers={"X-Vault-Token": self.token},
-                json={"ciphertext": ciphertext, "context": ctx},
-            )
-            resp.raise_for_status()
-            plaintext_b64 = resp.json()["data"]["plaintext"]
+        resp = await self._http().post(
+            f"/v1/transit/decrypt/{key_name}",
+            json={"ciphertext": ciphertext, "context": ctx},
+        )
+        resp.raise_for_status()
+        plaintext_b64 = resp.json()["data"]["plaintext"]
         return base64.b64decode(plaintext_b64)
 
     async def is_disabled(self, tenant_id: str) -> bool:
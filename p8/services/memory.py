@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-from datetime import date
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
 from uuid import UUID
 
 from p8.ontology.types import Message, Moment, Session
 from p8.services.database import Database
 from p8.services.encryption import EncryptionService
 from p8.services.repository import Repository
-from p8.utils.tokens import estimate_tokens
+from p8.utils.tokens import aestimate_tokens
 
 
 def format_moment_context(md: dict) -> str:
@@ -39,12 +42,116 @@ def format_moment_context(md: dict) -> str:
     return "\n".join(parts)
 
 
+def _apply_budget(rows: list[dict], max_tokens: int | None, max_messages: int | None) -> list[dict]:
+    """Keep the newest rows within the budget — same rule as rem_load_messages()."""
+    total = 0
+    keep = 0
+    for i, row in enumerate(reversed(rows)):
+        if max_messages is not None and i >= max_messages:
+            break
+        total += row.get("token_count") or 0
+        if max_tokens is not None and total > max_tokens:
+            break
+        keep += 1
+    return rows[len(rows) - keep:]
+
+
+def _high_water(rows: list[dict]) -> datetime | None:
+    return max((r["created_at"] for r in rows if r.get("created_at")), default=None)
+
+
+@dataclass
+class _ContextEntry:
+    rows: list[dict]                # decrypted messages within budget, oldest first
+    moments: list[dict]             # decrypted moments, newest first
+    high_water: datetime | None     # created_at of the newest row seen
+    latest_moment: UUID | None      # id of the session's newest moment (even if not rendered)
+    last_used: float = 0.0
+
+
+class SessionContextCache:
+    """Decrypted chat history per session, extended incrementally each turn.
+
+    ``load_context`` otherwise re-runs the window query over the whole
+    session and decrypts every row on every turn. An entry keeps the rows
+    inside the budget plus a created_at high-water mark, so a turn only
+    fetches and decrypts messages newer than the mark. Entries are dropped
+    when the session's latest moment changes (rem_build_moment), after
+    ``idle_ttl`` seconds unused, or LRU beyond ``max_sessions``.
+
+    Each extension re-reads a short lookback window before the mark so rows
+    stamped by a slightly skewed app-server clock are not missed; messages
+    soft-deleted or back-dated further than that are not seen until the
+    entry is rebuilt.
+    """
+
+    LOOKBACK_SECONDS = 5
+
+    def __init__(self, max_sessions: int = 512, idle_ttl: float = 900.0):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        # session_id → {(tenant_id, max_tokens, max_messages, max_moments): entry}
+        self._sessions: OrderedDict[UUID, dict[tuple, _ContextEntry]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_id: UUID, variant: tuple) -> _ContextEntry | None:
+        entry = self._sessions.get(session_id, {}).get(variant)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.last_used > self.idle_ttl:
+            self.invalidate(session_id)
+            return None
+        entry.last_used = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return entry
+
+    def put(self, session_id: UUID, variant: tuple, entry: _ContextEntry) -> None:
+        entry.last_used = time.monotonic()
+        self._sessions.setdefault(session_id, {})[variant] = entry
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def invalidate(self, session_id: UUID) -> None:
+        self._sessions.pop(session_id, None)
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+    def stats(self) -> dict:
+        return {"sessions": len(self._sessions), "hits": self.hits, "misses": self.misses}
+
+
+_default_context_cache: SessionContextCache | None = None
+
+
+def default_context_cache() -> SessionContextCache | None:
+    """Process-wide cache used by chat adapters (None when disabled)."""
+    global _default_context_cache
+    if _default_context_cache is None:
+        from p8.settings import get_settings
+
+        s = get_settings()
+        if s.context_cache_sessions <= 0:
+            return None
+        _default_context_cache = SessionContextCache(s.context_cache_sessions, s.context_cache_idle_ttl)
+    return _default_context_cache
+
+
 class MemoryService:
-    def __init__(self, db: Database, encryption: EncryptionService):
+    def __init__(
+        self,
+        db: Database,
+        encryption: EncryptionService,
+        *,
+        context_cache: SessionContextCache | None = None,
+    ):
         self.db = db
         self.encryption = encryption
         self.message_repo = Repository(Message, db, encryption)
         self.moment_repo = Repository(Moment, db, encryption)
+        self.context_cache = context_cache
 
     async def load_context(
         self,
@@ -57,34 +164,50 @@ class MemoryService:
         max_moments: int = 3,
         tenant_id: str | None = None,
     ) -> list[dict]:
-        """Load messages within token/message budget, with compaction and moment injection."""
+        """Load messages within token/message budget, with compaction and moment injection.
+
+        With a ``context_cache`` (and no ``since``), only messages newer than
+        the cached high-water mark are fetched and decrypted.
+        """
         # Ensure DEK cached for decryption
         if tenant_id:
             await self.encryption.get_dek(tenant_id)
 
-        # 1. Database-side token-aware loading
-        raw = await self.db.rem_load_messages(
-            session_id, max_tokens=max_tokens, max_messages=max_messages, since=since
-        )
+        cache = self.context_cache if since is None else None
+        variant = (tenant_id, max_tokens, max_messages, max_moments)
+        entry = cache.get(session_id, variant) if cache else None
+        if cache and entry is not None and await self._latest_moment_id(session_id) == entry.latest_moment:
+            cache.hits += 1
+            await self._extend_entry(session_id, entry, tenant_id, max_tokens, max_messages)
+        else:
+            # 1-2. Database-side token-aware loading + decrypt
+            raw = await self.db.rem_load_messages(
+                session_id, max_tokens=max_tokens, max_messages=max_messages, since=since
+            )
+            rows = self.encryption.decrypt_rows(Message, [dict(row) for row in raw], tenant_id)
+            moment_rows = await self.db.fetch(
+                "SELECT * FROM moments"
+                " WHERE source_session_id = $1 AND deleted_at IS NULL"
+                " ORDER BY created_at DESC LIMIT $2",
+                session_id,
+                max_moments,
+            )
+            moments = self.encryption.decrypt_rows(Moment, [dict(m) for m in moment_rows], tenant_id)
+            latest_moment = moments[0]["id"] if moments else None
+            if cache and max_moments <= 0:
+                latest_moment = await self._latest_moment_id(session_id)
+            entry = _ContextEntry(
+                rows=rows, moments=moments, high_water=_high_water(rows), latest_moment=latest_moment,
+            )
+            if cache:
+                cache.misses += 1
+                cache.put(session_id, variant, entry)
 
-        # 2. Decrypt content fields
-        messages = []
-        for row in raw:
-            data = dict(row)
-            data = self.encryption.decrypt_fields(Message, data, tenant_id)
-            messages.append(data)
+        messages = list(entry.rows)
+        moment_rows = entry.moments
 
         # 3. Inject last N moment summaries for temporal grounding (oldest first)
-        moment_rows = await self.db.fetch(
-            "SELECT * FROM moments"
-            " WHERE source_session_id = $1 AND deleted_at IS NULL"
-            " ORDER BY created_at DESC LIMIT $2",
-            session_id,
-            max_moments,
-        )
-        for mrow in reversed(moment_rows):
-            md = dict(mrow)
-            md = self.encryption.decrypt_fields(Moment, md, tenant_id)
+        for md in reversed(moment_rows):
             messages.insert(0, {
                 "message_type": "system",
                 "content": format_moment_context(md),
@@ -111,6 +234,40 @@ class MemoryService:
 
         return messages
 
+    async def _latest_moment_id(self, session_id: UUID) -> UUID | None:
+        latest: UUID | None = await self.db.fetchval(
+            "SELECT id FROM moments"
+            " WHERE source_session_id = $1 AND deleted_at IS NULL"
+            " ORDER BY created_at DESC LIMIT 1",
+            session_id,
+        )
+        return latest
+
+    async def _extend_entry(
+        self,
+        session_id: UUID,
+        entry: _ContextEntry,
+        tenant_id: str | None,
+        max_tokens: int | None,
+        max_messages: int | None,
+    ) -> None:
+        """Append messages newer than the high-water mark, then re-apply the budget."""
+        rows = await self.db.fetch(
+            "SELECT id, message_type, content, token_count, tool_calls, created_at"
+            " FROM messages WHERE session_id = $1 AND deleted_at IS NULL"
+            " AND ($2::timestamptz IS NULL OR created_at >= $2::timestamptz - make_interval(secs => $3))"
+            " AND NOT (id = ANY($4::uuid[]))"
+            " ORDER BY created_at",
+            session_id, entry.high_water, SessionContextCache.LOOKBACK_SECONDS,
+            [r["id"] for r in entry.rows],
+        )
+        if not rows:
+            return
+        new_rows = self.encryption.decrypt_rows(Message, [dict(r) for r in rows], tenant_id)
+        merged = sorted(entry.rows + new_rows, key=lambda r: r["created_at"])
+        entry.rows = _apply_budget(merged, max_tokens, max_messages)
+        entry.high_water = _high_water(merged)
+
     # ------------------------------------------------------------------
     # Moment building — delegates to rem_build_moment() SQL function
     # ------------------------------------------------------------------
@@ -133,6 +290,8 @@ class MemoryService:
         )
         if not row:
             return None
+        if self.context_cache:
+            self.context_cache.invalidate(session_id)
         return self._moment_from_row(row)
 
     async def maybe_build_moment(
@@ -153,6 +312,8 @@ class MemoryService:
         )
         if not row:
             return None
+        if self.context_cache:
+            self.context_cache.invalidate(session_id)
         return self._moment_from_row(row)
 
     @staticmethod
@@ -229,7 +390,7 @@ class MemoryService:
         encryption_level: str | None = None,
     ) -> Message:
         if token_count is None:
-            token_count = estimate_tokens(content or "")
+            token_count = await aestimate_tokens(content or "")
 
         msg = Message(
             session_id=session_id,
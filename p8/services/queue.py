@@ -8,9 +8,12 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Callable
 from datetime import datetime
 from uuid import UUID
 
+import asyncpg
+
 from p8.services.database import Database
 
 log = logging.getLogger(__name__)
@@ -92,6 +95,29 @@ class QueueService:
             )
         return tasks
 
+    async def listen(
+        self,
+        tier: str,
+        callback: Callable[[str], None],
+    ) -> asyncpg.Connection:
+        """Open a dedicated LISTEN connection on the tier's wakeup channel.
+
+        ``callback`` receives the task_type payload of every NOTIFY sent by
+        the task_queue triggers in 03_qms.sql. The connection is outside the
+        pool (LISTEN is session-scoped) — the caller owns it and must close it.
+        """
+        conn = await asyncpg.connect(self.db.settings.database_url)
+        try:
+            await conn.add_listener(
+                tier_channel(tier),
+                lambda _conn, _pid, _channel, payload: callback(payload),
+            )
+        except Exception:
+            await conn.close()
+            raise
+        log.info("Listening on %s", tier_channel(tier))
+        return conn
+
     async def complete(self, task_id: UUID, *, result: dict | None = None) -> None:
         """Mark a task as completed with optional result payload."""
         await self.db.execute(
@@ -293,6 +319,11 @@ class QueueService:
         return {"system": system, "user_jobs": user_jobs, "task_schedules": task_schedules}
 
 
+def tier_channel(tier: str) -> str:
+    """NOTIFY channel name for a worker tier (see notify_task_enqueued)."""
+    return f"task_queue_{tier}"
+
+
 def _json_dumps(obj: dict | None) -> str | None:
     """Serialize dict to JSON string for PostgreSQL JSONB parameters."""
     if obj is None:
@@ -17,7 +17,7 @@ from p8.services.database import Database
 from p8.services.email import EmailService
 from p8.services.encryption import EncryptionService
 from p8.services.queue import QueueService
-from p8.services.usage import REPORT_COLUMNS, get_limits, get_tenant_plans, get_usage_by_tenant
+from p8.services.usage import BYTE_RESOURCES, REPORT_COLUMNS, get_limits, get_tenant_plans, get_usage_by_tenant
 from p8.settings import Settings
 
 logger = logging.getLogger(__name__)
@@ -241,8 +241,7 @@ def _render_usage_pivot(
         for res_type, _, period in REPORT_COLUMNS:
             used = usage.get(res_type, 0)
             limit = getattr(limits, res_type, 0)
-            is_bytes = res_type == "worker_bytes_processed"
-            fmt = _fmt_bytes if is_bytes else _fmt_num
+            fmt = _fmt_bytes if res_type in BYTE_RESOURCES else _fmt_num
             if limit:
                 css = "over" if used > limit else "ok"
                 html += f'<td class="right"><span class="{css}">{fmt(used)}</span> / {fmt(limit)}</td>'
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import json
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
 from datetime import datetime
 from typing import TYPE_CHECKING, Generic, TypeVar
 from uuid import UUID
@@ -43,6 +45,75 @@ def _jsonify(value):
     return value
 
 
+class StatementCache:
+    """Memoized SQL text keyed by (operation, table, column shape).
+
+    Upserts used to list only the columns the entity happened to carry (None
+    values are dropped), so every distinct field subset was a new statement
+    and asyncpg's per-connection prepared statement cache kept missing.
+    Upserts now always list the model's full declared column set, and find()
+    orders caller filters by declared field order, so the set of distinct
+    statements per table is small and stable and the text is built once per
+    process.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], str]) -> str:
+        sql = self._entries.get(key)
+        if sql is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return sql
+        self.misses += 1
+        sql = build()
+        self._entries[key] = sql
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return sql
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared by every Repository instance (they are created per request)
+statement_cache = StatementCache()
+
+_column_orders: dict[type[CoreModel], dict[str, int]] = {}
+
+
+def _declared_columns(model_class: type[CoreModel]) -> tuple[str, ...]:
+    """All columns the model declares, in declaration order (upsert column list)."""
+    return tuple(_column_order(model_class))
+
+
+def _column_order(model_class: type[CoreModel]) -> dict[str, int]:
+    order = _column_orders.get(model_class)
+    if order is None:
+        order = {name: i for i, name in enumerate(model_class.model_fields)}
+        _column_orders[model_class] = order
+    return order
+
+
+def _canonical_columns(model_class: type[CoreModel], columns: Iterable[str]) -> tuple[str, ...]:
+    """Order *columns* by the model's declared field order.
+
+    Unknown columns sort last (alphabetically) so Postgres still rejects them.
+    """
+    order = _column_order(model_class)
+    n = len(order)
+    return tuple(sorted(set(columns), key=lambda c: (order.get(c, n), c)))
+
+
 class Repository(Generic[T]):
     def __init__(self, model_class: type[T], db: Database, encryption: EncryptionService):
         self.model_class = model_class
@@ -84,23 +155,40 @@ class Repository(Generic[T]):
             data["encryption_level"] = tenant_modes.get(entity.tenant_id, "none") if entity.tenant_id else "none"
             rows_data.append({k: _jsonify(v) for k, v in data.items()})
 
-        # Column set = union across all entities (preserves insertion order)
-        columns = list(dict.fromkeys(col for row in rows_data for col in row))
+        # Always the full declared column list: keys missing from a row (None
+        # values) come through jsonb_populate_recordset as NULL, and the
+        # COALESCE in the update keeps the stored value, as if omitted. So the
+        # SQL text depends only on the preserve set, not on which fields
+        # the caller happened to set.
+        columns = _declared_columns(self.model_class)
+        preserve = frozenset(_unset_empty)
+        sql = statement_cache.get(
+            ("upsert", self.table, columns, preserve),
+            lambda: self._build_upsert(columns, preserve),
+        )
+
+        # asyncpg JSONB codec auto-serializes Python list → JSON array
+        result_rows = await self.db.fetch(sql, rows_data)
+
+        # Returned rows carry the entities' tenant_id and encryption_level
+        return self._decrypt_rows(result_rows)
+
+    def _build_upsert(self, columns: tuple[str, ...], preserve: frozenset[str]) -> str:
         col_list = ", ".join(columns)
 
         # COALESCE preserves existing non-NULL values for partial updates.
-        # For fields in _unset_empty, prefer the existing DB value over the
-        # empty default so metadata/tags/graph_edges aren't wiped on upsert.
+        # For fields in preserve (implicit empty defaults), prefer the existing
+        # DB value so metadata/tags/graph_edges aren't wiped on upsert.
         updates = []
         for c in columns:
             if c == "id":
                 continue
-            if c in _unset_empty:
+            if c in preserve:
                 updates.append(f"{c} = COALESCE({self.table}.{c}, EXCLUDED.{c})")
             else:
                 updates.append(f"{c} = COALESCE(EXCLUDED.{c}, {self.table}.{c})")
 
-        sql = (
+        return (
             f"INSERT INTO {self.table} ({col_list})"
             f" SELECT {col_list}"
             f" FROM jsonb_populate_recordset(NULL::{self.table}, $1::jsonb)"
@@ -108,16 +196,6 @@ class Repository(Generic[T]):
             f" RETURNING *"
         )
 
-        # asyncpg JSONB codec auto-serializes Python list → JSON array
-        result_rows = await self.db.fetch(sql, rows_data)
-
-        # Map returned rows back to tenant_ids for decryption
-        tenant_map = {str(e.id): e.tenant_id for e in entities}
-        return [
-            self._decrypt_row(row, tenant_map.get(str(row["id"])))
-            for row in result_rows
-        ]
-
     async def get(
         self,
         entity_id: UUID,
@@ -173,10 +251,6 @@ class Repository(Generic[T]):
         ``(user_id = $N OR user_id IS NULL)`` to include shared records.
         Explicit tenant_id / user_id params still take precedence.
         """
-        conditions = ["deleted_at IS NULL"]
-        params: list = []
-        idx = 1
-
         # Security-derived filters (only when not overridden by explicit params)
         eff_tenant = tenant_id
         eff_user = user_id
@@ -186,40 +260,52 @@ class Repository(Generic[T]):
             if not eff_user and security.effective_user_id:
                 eff_user = security.effective_user_id
 
+        filters = filters or {}
+        filter_cols = _canonical_columns(self.model_class, filters)
+        params: list = []
         if eff_tenant:
-            conditions.append(f"tenant_id = ${idx}")
             params.append(eff_tenant)
-            idx += 1
         if eff_user:
-            # Include user's own records + shared (user_id IS NULL)
-            conditions.append(f"(user_id = ${idx} OR user_id IS NULL)")
             params.append(eff_user)
-            idx += 1
-        elif user_id is not None:
-            # Explicit user_id=None was not passed, keep original behavior
-            pass
         if tags:
-            conditions.append(f"tags @> ${idx}")
             params.append(tags)
-            idx += 1
-        for col, val in (filters or {}).items():
-            conditions.append(f"{col} = ${idx}")
-            params.append(val)
-            idx += 1
-
-        where = " AND ".join(conditions)
+        params.extend(filters[c] for c in filter_cols)
         params.extend([limit, offset])
 
-        rows = await self.db.fetch(
-            f"SELECT * FROM {self.table} WHERE {where}"
-            f" ORDER BY created_at DESC LIMIT ${idx} OFFSET ${idx + 1}",
-            *params,
+        sql = statement_cache.get(
+            ("find", self.table, bool(eff_tenant), bool(eff_user), bool(tags), filter_cols),
+            lambda: self._build_find(bool(eff_tenant), bool(eff_user), bool(tags), filter_cols),
         )
+        rows = await self.db.fetch(sql, *params)
         if decrypt:
             await self._ensure_deks(rows, eff_tenant or tenant_id)
         effective_tenant = (eff_tenant or tenant_id) if decrypt else None
         force = decrypt and not _mode_aware
-        return [self._decrypt_row(r, effective_tenant, force=force) for r in rows]
+        return self._decrypt_rows(rows, effective_tenant, force=force)
+
+    def _build_find(
+        self, by_tenant: bool, by_user: bool, by_tags: bool, filter_cols: tuple[str, ...]
+    ) -> str:
+        conditions = ["deleted_at IS NULL"]
+        idx = 1
+        if by_tenant:
+            conditions.append(f"tenant_id = ${idx}")
+            idx += 1
+        if by_user:
+            # Include user's own records + shared (user_id IS NULL)
+            conditions.append(f"(user_id = ${idx} OR user_id IS NULL)")
+            idx += 1
+        if by_tags:
+            conditions.append(f"tags @> ${idx}")
+            idx += 1
+        for col in filter_cols:
+            conditions.append(f"{col} = ${idx}")
+            idx += 1
+
+        return (
+            f"SELECT * FROM {self.table} WHERE {' AND '.join(conditions)}"
+            f" ORDER BY created_at DESC LIMIT ${idx} OFFSET ${idx + 1}"
+        )
 
     async def find_for_tenant(self, *, tenant_id: str | None = None, **kwargs) -> list[T]:
         """Mode-aware find — returns ciphertext for client-mode tenants."""
@@ -337,20 +423,31 @@ class Repository(Generic[T]):
             await self.encryption.get_dek(tid)
 
     def _decrypt_row(self, row, tenant_id: str | None = None, *, force: bool = False) -> T:
-        data = dict(row)
-        # asyncpg may return JSONB as str when defaults come from DB
-        for key in _JSONB_COLUMNS:
-            if key in data and isinstance(data[key], str):
-                data[key] = json.loads(data[key])
-
-        # Auto-decrypt: use row's encryption_level to decide
-        effective_tenant = tenant_id or data.get("tenant_id")
-        level = data.get("encryption_level")
-        if effective_tenant and (
-            force                                         # caller explicitly wants decryption
-            or level == "platform"                        # stamped at write time
-            or (level is None and tenant_id)              # legacy: caller passed tenant_id
-        ):
-            data = self.encryption.decrypt_fields(self.model_class, data, effective_tenant)
-
-        return self.model_class.model_validate(data)
+        return self._decrypt_rows([row], tenant_id, force=force)[0]
+
+    def _decrypt_rows(self, rows, tenant_id: str | None = None, *, force: bool = False) -> list[T]:
+        """Decrypt + validate a result set, one ``decrypt_rows`` pass per tenant."""
+        datas = []
+        by_tenant: dict[str, list[dict]] = {}
+        for row in rows:
+            data = dict(row)
+            # asyncpg may return JSONB as str when defaults come from DB
+            for key in _JSONB_COLUMNS:
+                if key in data and isinstance(data[key], str):
+                    data[key] = json.loads(data[key])
+            datas.append(data)
+
+            # Auto-decrypt: use row's encryption_level to decide
+            effective_tenant = tenant_id or data.get("tenant_id")
+            level = data.get("encryption_level")
+            if effective_tenant and (
+                force                                         # caller explicitly wants decryption
+                or level == "platform"                        # stamped at write time
+                or (level is None and tenant_id)              # legacy: caller passed tenant_id
+            ):
+                by_tenant.setdefault(effective_tenant, []).append(data)
+
+        for tid, group in by_tenant.items():
+            self.encryption.decrypt_rows(self.model_class, group, tid, parallel=True)
+
+        return [self.model_class.model_validate(data) for data in datas]
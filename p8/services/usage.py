@@ -7,12 +7,15 @@ and web searches.
 
 Storage
 -------
-- **Where stored:** The ``files`` table (``size_bytes`` column). There is no
-  separate counter — storage usage is computed on-the-fly as
-  ``SUM(size_bytes)`` over non-deleted rows for the user.
-- **Checked:** Before every file upload in ``POST /content/`` (pre-flight).
-  If ``current_used + file_size > limit``, the request is rejected with 429.
-- **Updated:** Implicitly when files are inserted or soft-deleted.
+- **Where stored:** The ``user_storage`` counter table (``bytes_used``,
+  ``file_count`` per user), equal to ``SUM(size_bytes)`` / ``COUNT(*)``
+  over the user's non-deleted ``files`` rows.
+- **Checked:** Before every file upload in ``POST /content/`` (pre-flight)
+  and before each ``file_processing`` task. If
+  ``current_used + file_size > limit``, the upload is rejected with 429.
+- **Updated:** Transactionally by a row trigger on ``files`` (insert,
+  delete, soft-delete/restore, size or owner change). The nightly
+  ``reconcile_user_storage()`` pg_cron job corrects any drift.
 
 Periodic resources (chat_tokens, dreaming_minutes, worker_bytes_processed, …)
 ------------------------------------------------------------------------------
@@ -129,15 +132,14 @@ async def check_quota(
 ) -> QuotaStatus:
     """Check current usage against plan limits without incrementing.
 
-    For storage_bytes, computes on-the-fly from files table.
+    For storage_bytes, reads the trigger-maintained user_storage counter.
     For periodic resources, reads usage_tracking.
     """
     limits = get_limits(plan_id)
 
     if resource_type == "storage_bytes":
         used = int(await db.fetchval(
-            "SELECT COALESCE(SUM(size_bytes), 0) FROM files "
-            "WHERE user_id = $1 AND deleted_at IS NULL",
+            "SELECT COALESCE((SELECT bytes_used FROM user_storage WHERE user_id = $1), 0)",
             user_id,
         ))
         limit = limits.storage_bytes
@@ -199,7 +201,7 @@ async def get_all_usage(
     # Dreaming minutes
     dreaming = await check_quota(db, user_id, "dreaming_minutes", plan_id)
 
-    # Storage (computed from files table)
+    # Storage (user_storage counter)
     storage = await check_quota(db, user_id, "storage_bytes", plan_id)
 
     # Web searches (daily)
@@ -227,8 +229,12 @@ REPORT_COLUMNS: list[tuple[str, str, str]] = [
     ("news_searches_daily", "News", "day"),
     ("worker_bytes_processed", "Files", "wk"),
     ("dreaming_minutes", "Dream Min", "wk"),
+    ("storage_bytes", "Storage", "total"),
 ]
 
+# Report columns whose values are byte counts.
+BYTE_RESOURCES = {"worker_bytes_processed", "storage_bytes"}
+
 
 async def get_tenant_plans(db: Database) -> dict[str, str]:
     """Return {tenant_id: plan_id} for all active subscriptions."""
@@ -253,7 +259,8 @@ async def get_usage_by_tenant(db: Database) -> dict[str, dict[str, int]]:
 
     Includes ALL active tenants (even those with zero usage).
     Uses the latest period_start per (user, resource) within the current month
-    to handle the monthly→weekly transition gracefully.
+    to handle the monthly→weekly transition gracefully. ``storage_bytes`` is
+    the current total from the user_storage counters.
     """
     # Get all active tenants so everyone appears in the report
     all_tenants = await get_all_tenant_ids(db)
@@ -274,4 +281,14 @@ async def get_usage_by_tenant(db: Database) -> dict[str, dict[str, int]]:
     for r in rows:
         tid = r["tenant_id"] or ""
         result[tid][r["resource_type"]] += r["used"]
+
+    storage_rows = await db.fetch(
+        "SELECT u.tenant_id, SUM(us.bytes_used) AS used "
+        "  FROM user_storage us "
+        "  LEFT JOIN users u ON us.user_id = u.id "
+        " WHERE us.bytes_used > 0 "
+        " GROUP BY u.tenant_id"
+    )
+    for r in storage_rows:
+        result[r["tenant_id"] or ""]["storage_bytes"] += int(r["used"])
     return dict(result)
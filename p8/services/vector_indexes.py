@@ -0,0 +1,128 @@
+"""Per-tenant partial HNSW indexes on embeddings_<table>.
+
+``rem_search`` filters on the denormalized ``embeddings_<table>.tenant_id``
+before ranking. Small tenants get an exact scan; large tenants in a shared
+table need their own ANN graph, otherwise the global HNSW scan mostly visits
+other tenants' vectors. This module reconciles ``embedding_tenant_indexes``
+(row counts refreshed hourly by pg_cron) with the partial indexes that
+actually exist:
+
+- tenants with ``row_count >= min_rows`` get
+  ``CREATE INDEX CONCURRENTLY ... USING hnsw ... WHERE tenant_id = '<t>'``
+- tenants that shrink below ``drop_below`` (default ``min_rows / 2``) lose it
+
+Index builds run outside a transaction (CONCURRENTLY), so this lives in
+Python rather than in a pg_cron job.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass
+
+from p8.services.database import Database
+
+log = logging.getLogger(__name__)
+
+_PLAN_SQL = """
+SELECT s.table_name, s.tenant_id, s.row_count, s.index_name,
+       (i.indexname IS NOT NULL) AS index_exists
+FROM embedding_tenant_indexes s
+LEFT JOIN pg_indexes i
+  ON i.schemaname = 'public' AND i.indexname = s.index_name
+ORDER BY s.row_count DESC
+"""
+
+_CREATE_SQL = (
+    "SELECT format('CREATE INDEX CONCURRENTLY IF NOT EXISTS %I ON %I"
+    " USING hnsw (embedding vector_cosine_ops) WHERE tenant_id = %L',"
+    " $1::text, $2::text, $3::text)"
+)
+
+
+def tenant_index_name(table: str, tenant_id: str) -> str:
+    """Deterministic partial-index name, always within Postgres' 63-char limit."""
+    digest = hashlib.sha1(f"{table}:{tenant_id}".encode()).hexdigest()[:12]
+    return f"idx_embeddings_{table[:30]}_t_{digest}"
+
+
+@dataclass
+class IndexAction:
+    """One planned create/drop of a tenant's partial HNSW index."""
+
+    action: str  # create | drop
+    table: str
+    tenant_id: str
+    index_name: str
+    row_count: int
+
+
+class VectorIndexManager:
+    """Create and retire per-tenant partial HNSW indexes."""
+
+    def __init__(self, db: Database, *, min_rows: int = 50_000, drop_below: int | None = None):
+        self.db = db
+        self.min_rows = min_rows
+        self.drop_below = drop_below if drop_below is not None else min_rows // 2
+
+    async def refresh_stats(self) -> int:
+        """Recount embeddings per tenant (same as the hourly pg_cron job)."""
+        return await self.db.fetchval("SELECT refresh_embedding_tenant_stats()")  # type: ignore[no-any-return]
+
+    async def plan(self) -> list[IndexAction]:
+        """Diff the registry against existing indexes."""
+        actions: list[IndexAction] = []
+        for r in await self.db.fetch(_PLAN_SQL):
+            name = r["index_name"] or tenant_index_name(r["table_name"], r["tenant_id"])
+            if r["row_count"] >= self.min_rows and not r["index_exists"]:
+                actions.append(IndexAction("create", r["table_name"], r["tenant_id"], name, r["row_count"]))
+            elif r["index_name"] and r["row_count"] < self.drop_below:
+                actions.append(IndexAction("drop", r["table_name"], r["tenant_id"], name, r["row_count"]))
+        return actions
+
+    async def apply(self, actions: list[IndexAction]) -> list[IndexAction]:
+        """Run *actions* one at a time. Returns the ones that succeeded."""
+        done: list[IndexAction] = []
+        for a in actions:
+            try:
+                if a.action == "create":
+                    await self._create(a)
+                else:
+                    await self._drop(a)
+            except Exception:
+                log.exception("Vector index %s failed for %s/%s", a.action, a.table, a.tenant_id)
+                continue
+            log.info(
+                "Vector index %s: %s (%s, tenant=%s, rows=%d)",
+                a.action, a.index_name, a.table, a.tenant_id, a.row_count,
+            )
+            done.append(a)
+        return done
+
+    async def reconcile(self) -> list[IndexAction]:
+        """Refresh counts, then create/drop whatever the plan calls for."""
+        await self.refresh_stats()
+        return await self.apply(await self.plan())
+
+    async def _create(self, a: IndexAction) -> None:
+        stmt = await self.db.fetchval(_CREATE_SQL, a.index_name, f"embeddings_{a.table}", a.tenant_id)
+        try:
+            await self.db.execute(stmt)
+        except Exception:
+            # A failed CONCURRENTLY build leaves an INVALID index behind
+            await self.db.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{a.index_name}"')
+            raise
+        await self.db.execute(
+            "UPDATE embedding_tenant_indexes SET index_name = $3, updated_at = CURRENT_TIMESTAMP"
+            " WHERE table_name = $1 AND tenant_id = $2",
+            a.table, a.tenant_id, a.index_name,
+        )
+
+    async def _drop(self, a: IndexAction) -> None:
+        await self.db.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{a.index_name}"')
+        await self.db.execute(
+            "UPDATE embedding_tenant_indexes SET index_name = NULL, updated_at = CURRENT_TIMESTAMP"
+            " WHERE table_name = $1 AND tenant_id = $2",
+            a.table, a.tenant_id,
+        )
@@ -3,6 +3,20 @@
 Replaces the ``len(text) // 4`` heuristic used across the codebase with
 accurate BPE token counts. The encoder is cached per model for performance.
 
+Three paths, pick by how exact the caller needs to be:
+
+- ``estimate_tokens`` / ``estimate_tokens_many`` — exact BPE counts. Results
+  are kept in a content-hash-keyed LRU so repeated texts are free, and the
+  batch form encodes misses with tiktoken's multi-threaded
+  ``encode_ordinary_batch``.
+- ``aestimate_tokens`` / ``aestimate_tokens_many`` — same counts, but large
+  inputs are encoded in a worker thread so the event loop keeps serving.
+- ``estimate_tokens(text, approximate=True)`` — for budget checks. Texts
+  longer than ``APPROX_EXACT_CHARS`` are counted from evenly spaced samples
+  and extrapolated; sampling error is typically a few percent on prose and
+  the result never exceeds the UTF-8 byte length (a hard upper bound on BPE
+  tokens). Shorter texts are counted exactly.
+
 Examples::
 
     from p8.utils.tokens import estimate_tokens
@@ -10,24 +24,99 @@ Examples::
     estimate_tokens("Hello, world!")          # accurate count
     estimate_tokens(None)                     # 0
     estimate_tokens("long text", model="gpt-4o")
+    estimate_tokens(big_doc, approximate=True)
+    await aestimate_tokens_many(chunks)
 """
 
 from __future__ import annotations
 
+import asyncio
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+
 import tiktoken
 
+from p8.utils.ids import content_hash
+
 _encoder_cache: dict[str, tiktoken.Encoding] = {}
 
+# Exact-count LRU, keyed by content_hash(model|text)
+_COUNT_CACHE_SIZE = 4096
+_count_cache: OrderedDict[str, int] = OrderedDict()
+_count_stats = {"hits": 0, "misses": 0}
+_count_lock = threading.Lock()  # the async helpers touch the LRU from worker threads
+
+# Below this, texts are never hashed/cached (encoding is cheaper than the lookup)
+_CACHE_MIN_CHARS = 256
+# Above this, the async helpers encode in a worker thread
+_OFFLOAD_MIN_CHARS = 64_000
+# Approximate mode: exact below this length, otherwise N samples of M chars
+APPROX_EXACT_CHARS = 32_000
+_APPROX_SAMPLES = 16
+_APPROX_SAMPLE_CHARS = 1_024
+
+
+def _get_encoder(model: str) -> tiktoken.Encoding:
+    if model not in _encoder_cache:
+        try:
+            _encoder_cache[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encoder_cache[model] = tiktoken.get_encoding("cl100k_base")
+    return _encoder_cache[model]
+
+
+def _cache_get(key: str) -> int | None:
+    with _count_lock:
+        n = _count_cache.get(key)
+        if n is not None:
+            _count_cache.move_to_end(key)
+            _count_stats["hits"] += 1
+        return n
+
+
+def _cache_put(key: str, n: int) -> None:
+    with _count_lock:
+        _count_stats["misses"] += 1
+        _count_cache[key] = n
+        while len(_count_cache) > _COUNT_CACHE_SIZE:
+            _count_cache.popitem(last=False)
+
+
+def _approximate(text: str, encoder: tiktoken.Encoding) -> int:
+    """Extrapolate tokens/char from evenly spaced samples of *text*."""
+    n = len(text)
+    step = n // _APPROX_SAMPLES
+    sampled_chars = 0
+    sampled_tokens = 0
+    for i in range(_APPROX_SAMPLES):
+        start = i * step
+        # Snap to whitespace so samples don't split words (which over-counts)
+        ws = text.find(" ", start, start + 64)
+        start = ws + 1 if ws != -1 else start
+        sample = text[start:start + _APPROX_SAMPLE_CHARS]
+        ws = sample.rfind(" ")
+        if ws > _APPROX_SAMPLE_CHARS // 2:
+            sample = sample[:ws]
+        sampled_chars += len(sample)
+        sampled_tokens += len(encoder.encode_ordinary(sample))
+    if not sampled_chars:
+        return len(encoder.encode_ordinary(text))
+    estimate = round(sampled_tokens * n / sampled_chars)
+    return min(max(estimate, 1), len(text.encode("utf-8")))
 
-def estimate_tokens(text: str | None, model: str = "gpt-4o") -> int:
+
+def estimate_tokens(text: str | None, model: str = "gpt-4o", *, approximate: bool = False) -> int:
     """Count tokens using tiktoken. Returns 0 for empty/None text.
 
     Caches the encoder per model for performance. Falls back to
     ``cl100k_base`` if the model name isn't recognised by tiktoken.
+    Special-token strings in *text* are counted as ordinary text.
 
     Args:
         text: The string to tokenise. ``None`` or empty → 0.
         model: OpenAI model name used to select the right BPE encoding.
+        approximate: Sample long texts instead of encoding them fully.
 
     Returns:
         Token count (int).
@@ -35,10 +124,67 @@ def estimate_tokens(text: str | None, model: str = "gpt-4o") -> int:
     if not text:
         return 0
 
-    if model not in _encoder_cache:
-        try:
-            _encoder_cache[model] = tiktoken.encoding_for_model(model)
-        except KeyError:
-            _encoder_cache[model] = tiktoken.get_encoding("cl100k_base")
+    encoder = _get_encoder(model)
+    if approximate and len(text) > APPROX_EXACT_CHARS:
+        return _approximate(text, encoder)
+    if len(text) < _CACHE_MIN_CHARS:
+        return len(encoder.encode_ordinary(text))
+
+    key = content_hash(f"{model}|{text}")
+    n = _cache_get(key)
+    if n is None:
+        n = len(encoder.encode_ordinary(text))
+        _cache_put(key, n)
+    return n
+
+
+def estimate_tokens_many(
+    texts: Sequence[str | None], model: str = "gpt-4o", *, num_threads: int = 8,
+) -> list[int]:
+    """Exact token counts for *texts*, in order.
+
+    Cache hits are served from the LRU; misses are encoded together with
+    ``encode_ordinary_batch`` (tiktoken releases the GIL across
+    ``num_threads`` threads).
+    """
+    counts = [0] * len(texts)
+    misses: list[int] = []
+    keys: dict[int, str] = {}
+    for i, text in enumerate(texts):
+        if not text:
+            continue
+        if len(text) >= _CACHE_MIN_CHARS:
+            keys[i] = content_hash(f"{model}|{text}")
+            n = _cache_get(keys[i])
+            if n is not None:
+                counts[i] = n
+                continue
+        misses.append(i)
+
+    if misses:
+        encoded = _get_encoder(model).encode_ordinary_batch(
+            [texts[i] or "" for i in misses], num_threads=num_threads,
+        )
+        for i, tokens in zip(misses, encoded):
+            counts[i] = len(tokens)
+            if i in keys:
+                _cache_put(keys[i], counts[i])
+    return counts
+
+
+async def aestimate_tokens(text: str | None, model: str = "gpt-4o") -> int:
+    """``estimate_tokens`` that encodes large texts off the event loop."""
+    if not text or len(text) < _OFFLOAD_MIN_CHARS:
+        return estimate_tokens(text, model)
+    return await asyncio.to_thread(estimate_tokens, text, model)
+
+
+async def aestimate_tokens_many(texts: Sequence[str | None], model: str = "gpt-4o") -> list[int]:
+    """``estimate_tokens_many`` that runs in a worker thread for large batches."""
+    if sum(len(t) for t in texts if t) < _OFFLOAD_MIN_CHARS:
+        return estimate_tokens_many(texts, model)
+    return await asyncio.to_thread(estimate_tokens_many, texts, model)
+
 
-    return len(_encoder_cache[model].encode(text))
+def token_cache_stats() -> dict:
+    return {"entries": len(_count_cache), **_count_stats}
@@ -3,6 +3,12 @@
 Loads recent messages, moments, and resources as context, then runs the
 dreaming agent which produces structured DreamMoment insights.
 
+Both phases fan out: phase 1 consolidates up to ``MAX_SESSIONS_PHASE1``
+sessions with ``PHASE1_CONCURRENCY`` in flight, and phase 2 loads the
+dreaming context once and runs every tenant-configured dreamer against it
+concurrently (``DREAMER_CONCURRENCY``). The task is heartbeated as each
+stage finishes so slow LLM runs aren't reclaimed by recover_stale_tasks.
+
 Persistence is handled by the chained_tool mechanism: the dreaming agent
 schema declares `chained_tool: save_moments`, so the adapter automatically
 pipes structured output into the save_moments tool after the agent run.
@@ -10,6 +16,7 @@ pipes structured output into the save_moments tool after the agent run.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from datetime import datetime, timedelta, timezone
@@ -39,6 +46,10 @@ LOOKBACK_DAYS = 1
 MAX_SESSIONS_PHASE1 = 10
 PHASE1_THRESHOLD = 6000
 MAX_RESOURCE_SUMMARY_CHARS = 500
+PHASE1_CONCURRENCY = 4
+
+# Phase 2 constants
+DREAMER_CONCURRENCY = 4
 
 
 class DreamingHandler:
@@ -62,9 +73,12 @@ class DreamingHandler:
             "Phase 1 complete for user %s: %d moments built from %d sessions",
             user_id, phase1["moments_built"], phase1["sessions_checked"],
         )
+        await self._heartbeat(task, ctx)
 
         # Phase 2 — run dreaming agent(s) from tenant config
-        result = await self._run_dreaming_agent(user_id, lookback_days, ctx, tenant_id=tenant_id)
+        result = await self._run_dreaming_agent(
+            user_id, lookback_days, ctx, tenant_id=tenant_id, task=task,
+        )
 
         io_tokens = result.get("io_tokens", 0)
         log.info(
@@ -88,6 +102,18 @@ class DreamingHandler:
             "phase2": result,
         }
 
+    @staticmethod
+    async def _heartbeat(task: dict, ctx) -> None:
+        """Refresh the task's claim, when running under a worker queue."""
+        task_id = task.get("id")
+        queue = getattr(ctx, "queue", None)
+        if not task_id or not queue:
+            return
+        try:
+            await queue.heartbeat(task_id)
+        except Exception:
+            log.warning("Dreaming heartbeat failed for task %s", task_id, exc_info=True)
+
     # ------------------------------------------------------------------
     # Phase 1 — session consolidation + resource enrichment
     # ------------------------------------------------------------------
@@ -112,24 +138,28 @@ class DreamingHandler:
         )
 
         memory = MemoryService(db, encryption)
-        sessions_checked = 0
-        moments_built = 0
+        sem = asyncio.Semaphore(PHASE1_CONCURRENCY)
 
-        for row in rows:
-            session_id = row["id"]
-            sessions_checked += 1
-            try:
-                moment = await memory.maybe_build_moment(
-                    session_id,
-                    tenant_id=tenant_id,
-                    user_id=user_id,
-                    threshold=PHASE1_THRESHOLD,
-                )
-                if moment:
-                    moments_built += 1
+        async def _consolidate(session_id: UUID) -> bool:
+            async with sem:
+                try:
+                    moment = await memory.maybe_build_moment(
+                        session_id,
+                        tenant_id=tenant_id,
+                        user_id=user_id,
+                        threshold=PHASE1_THRESHOLD,
+                    )
+                    if not moment:
+                        return False
                     await self._enrich_moment_with_resources(db, moment, session_id)
-            except Exception:
-                log.exception("Phase 1: failed to build moment for session %s", session_id)
+                    return True
+                except Exception:
+                    log.exception("Phase 1: failed to build moment for session %s", session_id)
+                    return False
+
+        built = await asyncio.gather(*(_consolidate(row["id"]) for row in rows))
+        sessions_checked = len(rows)
+        moments_built = sum(built)
 
         return {"sessions_checked": sessions_checked, "moments_built": moments_built}
 
@@ -233,9 +263,14 @@ class DreamingHandler:
         return ["dreaming-agent"]
 
     async def _run_dreaming_agent(
-        self, user_id: UUID, lookback_days: int, ctx, *, tenant_id: str | None = None,
+        self, user_id: UUID, lookback_days: int, ctx, *,
+        tenant_id: str | None = None, task: dict | None = None,
     ) -> dict:
         try:
+            explore = bool((task or {}).get("allow_empty_activity_dreaming"))
+            if not explore and not await self._has_recent_activity(ctx.db, user_id, lookback_days):
+                return {"status": "skipped_no_data", "io_tokens": 0}
+
             context_text, stats = await self._load_dreaming_context(
                 user_id, lookback_days, ctx.db, ctx.encryption,
             )
@@ -244,30 +279,39 @@ class DreamingHandler:
 
             agent_names = await self._resolve_dreamer_agents(ctx.db, user_id, tenant_id)
 
-            total_io_tokens = 0
-            total_moments_saved = 0
-            session_ids = []
+            # Every dreamer shares the context loaded above; each runs in its
+            # own asyncio task so tool context (user/session) stays separate.
+            sem = asyncio.Semaphore(DREAMER_CONCURRENCY)
+
+            async def _dream(agent_name: str) -> dict:
+                async with sem:
+                    try:
+                        result = await self._run_single_dreamer(
+                            agent_name, user_id, lookback_days, context_text, stats, ctx,
+                        )
+                    except Exception as e:
+                        log.exception("Dreamer %s failed for user %s", agent_name, user_id)
+                        result = {"status": "error", "error": str(e), "io_tokens": 0}
+                await self._heartbeat(task or {}, ctx)
+                log.info(
+                    "Dreamer %s for user %s: status=%s tokens=%d moments=%d",
+                    agent_name, user_id, result.get("status"),
+                    result.get("io_tokens", 0), result.get("moments_saved", 0),
+                )
+                return {"agent_name": agent_name, **result}
 
-            for agent_name in agent_names:
-                try:
-                    result = await self._run_single_dreamer(
-                        agent_name, user_id, lookback_days, context_text, stats, ctx,
-                    )
-                    total_io_tokens += result.get("io_tokens", 0)
-                    total_moments_saved += result.get("moments_saved", 0)
-                    if result.get("session_id"):
-                        session_ids.append(result["session_id"])
-                except Exception:
-                    log.exception("Dreamer %s failed for user %s", agent_name, user_id)
+            dreamers = await asyncio.gather(*(_dream(name) for name in agent_names))
+            session_ids = [d["session_id"] for d in dreamers if d.get("session_id")]
 
             return {
                 "status": "ok",
-                "io_tokens": total_io_tokens,
+                "io_tokens": sum(d.get("io_tokens", 0) for d in dreamers),
                 "session_id": session_ids[0] if session_ids else "",
                 "session_ids": session_ids,
-                "moments_saved": total_moments_saved,
+                "moments_saved": sum(d.get("moments_saved", 0) for d in dreamers),
                 "context_stats": stats,
                 "agents_run": agent_names,
+                "dreamers": dreamers,
             }
 
         except Exception as e:
@@ -356,6 +400,22 @@ class DreamingHandler:
     # Context loading
     # ------------------------------------------------------------------
 
+    @staticmethod
+    async def _has_recent_activity(db: Database, user_id: UUID, lookback_days: int) -> bool:
+        """Check the user_activity watermark before loading any context.
+
+        Users without a watermark yet are treated as active.
+        """
+        row = await db.fetchrow(
+            "SELECT GREATEST(last_message_at, last_file_at, last_moment_at) AS last_active"
+            " FROM user_activity WHERE user_id = $1",
+            user_id,
+        )
+        last_active: datetime | None = row["last_active"] if row else None
+        if last_active is None:
+            return True
+        return last_active >= datetime.now(timezone.utc) - timedelta(days=lookback_days)
+
     async def _load_dreaming_context(
         self,
         user_id: UUID,
@@ -400,7 +460,7 @@ class DreamingHandler:
                 stats["moments"] += 1
 
             section = "\n".join(lines)
-            section_tokens = estimate_tokens(section)
+            section_tokens = estimate_tokens(section, approximate=True)
             if token_estimate + section_tokens <= DATA_TOKEN_BUDGET:
                 sections.append(section)
                 token_estimate += section_tokens
@@ -440,7 +500,7 @@ class DreamingHandler:
                     lines.append("")
 
             section = "\n".join(lines)
-            section_tokens = estimate_tokens(section)
+            section_tokens = estimate_tokens(section, approximate=True)
             if token_estimate + section_tokens <= DATA_TOKEN_BUDGET:
                 sections.append(section)
                 token_estimate += section_tokens
@@ -468,7 +528,7 @@ class DreamingHandler:
                 stats["resources"] += 1
 
             section = "\n".join(lines)
-            section_tokens = estimate_tokens(section)
+            section_tokens = estimate_tokens(section, approximate=True)
             if token_estimate + section_tokens <= DATA_TOKEN_BUDGET:
                 sections.append(section)
                 token_estimate += section_tokens
@@ -1,10 +1,19 @@
-"""File processing handler — download from S3 -> ContentService.ingest() -> track bytes."""
+"""File processing handler — download from S3 -> ContentService.ingest() -> track bytes.
+
+The object is streamed to a temp file rather than read into memory. Documents
+above ``content_stream_threshold_bytes`` go through ``ingest_stream`` (chunks
+persisted in batches straight from the extractor); smaller files are read back
+and take the regular ``ingest`` path.
+"""
 
 from __future__ import annotations
 
 import logging
+import tempfile
 from uuid import UUID
 
+from p8.services.content import ContentService
+from p8.services.files import FileService
 from p8.utils.parsing import extract_payload
 
 log = logging.getLogger(__name__)
@@ -36,36 +45,62 @@ class FileProcessingHandler:
                 await self._update_file_status(ctx.db, file_id, "failed")
                 return {"bytes_processed": 0, "chunks": 0, "status": "skipped_no_uri"}
 
-            data = await ctx.file_service.read(uri)
-
-            # Ingest via ContentService (extract, chunk, persist)
-            result = await ctx.content_service.ingest(
-                data,
-                name,
-                mime_type=payload.get("mime_type"),
-                s3_key=None,  # already uploaded
-                tenant_id=task.get("tenant_id"),
-                user_id=task.get("user_id"),
-            )
+            fid = UUID(file_id) if isinstance(file_id, str) else file_id
+            mime_type = payload.get("mime_type") or FileService.mime_type_from_path(name)
+            suffix = ContentService._extension_for_mime(mime_type)
+
+            with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+                size = await ctx.file_service.download_to(uri, tmp)
+                tmp.flush()
+                streamed = (
+                    size > ctx.settings.content_stream_threshold_bytes
+                    and ContentService.is_streamable(mime_type)
+                )
+
+                if streamed:
+                    # Chunks attach to the original File row; no re-upload
+                    result = await ctx.content_service.ingest_stream(
+                        tmp.name,
+                        name,
+                        mime_type=mime_type,
+                        uri=uri,
+                        file_id=fid,
+                        tenant_id=task.get("tenant_id"),
+                        user_id=task.get("user_id"),
+                    )
+                else:
+                    tmp.seek(0)
+                    # Ingest via ContentService (extract, chunk, persist)
+                    result = await ctx.content_service.ingest(
+                        tmp.read(),
+                        name,
+                        mime_type=mime_type,
+                        s3_key=None,  # already uploaded
+                        tenant_id=task.get("tenant_id"),
+                        user_id=task.get("user_id"),
+                    )
 
             # Update original file with parsed content and mark completed
-            fid = UUID(file_id) if isinstance(file_id, str) else file_id
-            await ctx.db.execute(
-                "UPDATE files SET processing_status = 'completed',"
-                " parsed_content = $2, updated_at = CURRENT_TIMESTAMP"
-                " WHERE id = $1",
-                fid,
-                result.file.parsed_content,
-            )
+            # (the streaming path already wrote parsed_content to this row)
+            if streamed:
+                await self._update_file_status(ctx.db, file_id, "completed")
+            else:
+                await ctx.db.execute(
+                    "UPDATE files SET processing_status = 'completed',"
+                    " parsed_content = $2, updated_at = CURRENT_TIMESTAMP"
+                    " WHERE id = $1",
+                    fid,
+                    result.file.parsed_content,
+                )
 
             log.info(
-                "File %s processed: %d chunks, %d chars",
-                file_id, result.chunk_count, result.total_chars,
+                "File %s processed: %d chunks, %d chars (streamed=%s)",
+                file_id, result.chunk_count, result.total_chars, streamed,
             )
 
             return {
                 "status": "ok",
-                "bytes_processed": size_bytes,
+                "bytes_processed": size_bytes or size,
                 "chunks": result.chunk_count,
                 "total_chars": result.total_chars,
                 "file_id": str(result.file.id),
@@ -4,20 +4,26 @@ Handles both 'news' and 'reading_summary' task types (single pipeline).
 The pg_cron job enqueues 'news' tasks; the worker dispatches them here.
 
 1. Load user metadata (feeds, interests, categories)
-2. Run platoon (resolve_for_user + FeedProvider)
-3. Upsert resources
+2. Run platoon (resolve_for_user + FeedProvider) in a worker thread
+3. Upsert resources (one bulk statement)
 4. Build reading moment (one per day, date-based name)
-5. Generate mosaic thumbnail
-6. LLM summarize
+5. Generate mosaic thumbnail } concurrently
+6. LLM summarize             }
 7. Create companion session
 8. Track usage
+
+FeedProvider.run is synchronous network I/O, so it runs on a small
+dedicated thread pool with a timeout; the event loop (other tasks,
+heartbeats) keeps running while feeds are fetched.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from uuid import UUID
 
@@ -28,6 +34,20 @@ from p8.utils.parsing import ensure_parsed
 
 log = logging.getLogger(__name__)
 
+# Feed fetch runs off the event loop; a timed-out fetch keeps its thread until
+# platoon returns, so the pool bounds how many can pile up per worker.
+FEED_FETCH_TIMEOUT = 600.0  # well inside the 15-min stale-task recovery window
+FEED_FETCH_WORKERS = 4
+
+_feed_pool: ThreadPoolExecutor | None = None
+
+
+def _get_feed_pool() -> ThreadPoolExecutor:
+    global _feed_pool
+    if _feed_pool is None:
+        _feed_pool = ThreadPoolExecutor(max_workers=FEED_FETCH_WORKERS, thread_name_prefix="platoon")
+    return _feed_pool
+
 
 def _build_user_sources(user_metadata: UserMetadata) -> dict | None:
     """Build custom platoon sources config from user metadata feeds/categories.
@@ -131,7 +151,14 @@ class ReadingSummaryHandler:
         user_sources = _build_user_sources(user_metadata)
         pipeline_config = resolve_for_user(user_metadata, config=user_sources)
         provider = FeedProvider(tavily_key=tavily_key or None)
-        result = provider.run(pipeline_config, user_id=user_id)
+        loop = asyncio.get_running_loop()
+        result = await asyncio.wait_for(
+            loop.run_in_executor(
+                _get_feed_pool(),
+                functools.partial(provider.run, pipeline_config, user_id=user_id),
+            ),
+            timeout=FEED_FETCH_TIMEOUT,
+        )
 
         log.info(
             "Platoon returned %d resources for user %s (custom_sources=%s)",
@@ -149,9 +176,9 @@ class ReadingSummaryHandler:
         # ── 3. Upsert resources ───────────────────────────────────
         resource_repo = Repository(Resource, ctx.db, ctx.encryption)
 
-        resources_saved = 0
-        for p8r in result.resources:
-            entity = Resource(
+        # Last occurrence wins — one statement can't update the same row twice
+        entities = list({
+            p8r.id: Resource(
                 id=p8r.id,
                 name=p8r.name,
                 uri=p8r.uri,
@@ -163,11 +190,20 @@ class ReadingSummaryHandler:
                 tags=p8r.tags,
                 metadata=p8r.metadata,
             )
-            try:
-                await resource_repo.upsert(entity)
-                resources_saved += 1
-            except Exception:
-                log.exception("Failed to upsert resource %s", p8r.name[:60])
+            for p8r in result.resources
+        }.values())
+        try:
+            resources_saved = len(await resource_repo.upsert(entities))
+        except Exception:
+            # Isolate the bad row(s) rather than dropping the whole digest
+            log.exception("Bulk resource upsert failed for user %s, retrying per row", user_id)
+            resources_saved = 0
+            for entity in entities:
+                try:
+                    await resource_repo.upsert(entity)
+                    resources_saved += 1
+                except Exception:
+                    log.exception("Failed to upsert resource %s", entity.name[:60])
 
         # Heartbeat after resource upserts
         if task_id and hasattr(ctx, "queue") and ctx.queue:
@@ -207,18 +243,11 @@ class ReadingSummaryHandler:
             "links": links,
         }
 
-        # ── 5. Generate mosaic thumbnail ──────────────────────────
-        image_uri = None
-        try:
-            from p8.services.content import generate_mosaic_thumbnail
-
-            image_uris = [str(i.get("image_uri") or "") for i in items]
-            image_uri = await generate_mosaic_thumbnail(image_uris)
-        except Exception:
-            log.warning("Reading mosaic generation failed", exc_info=True)
-
-        # ── 6. LLM summarize ─────────────────────────────────────
-        summary = await self._llm_summarize(items)
+        # ── 5/6. Mosaic thumbnail + LLM summary (independent) ────
+        image_uri, summary = await asyncio.gather(
+            self._mosaic(items),
+            self._llm_summarize(items),
+        )
         if not summary:
             titles = [str(i["title"]) for i in items[:8]]
             summary = f"You have articles about: {', '.join(titles)}."
@@ -260,6 +289,18 @@ class ReadingSummaryHandler:
             "io_tokens": io_tokens,
         }
 
+    @staticmethod
+    async def _mosaic(items: list[dict]) -> str | None:
+        """Mosaic thumbnail from item images. Returns None on failure."""
+        try:
+            from p8.services.content import generate_mosaic_thumbnail
+
+            image_uris = [str(i.get("image_uri") or "") for i in items]
+            return await generate_mosaic_thumbnail(image_uris)
+        except Exception:
+            log.warning("Reading mosaic generation failed", exc_info=True)
+            return None
+
     async def _llm_summarize(self, items: list[dict]) -> str | None:
         """Call a cheap model for summarization. Returns None on failure."""
         try:
@@ -1,4 +1,4 @@
-"""Scheduled task handler — KV rebuild, embedding backfill, maintenance.
+"""Scheduled task handler — KV rebuild, embedding backfill, vector indexes, maintenance.
 
 Dispatches by payload.action to the appropriate maintenance routine.
 """
@@ -27,6 +27,8 @@ class ScheduledHandler:
             return await self._kv_rebuild_incremental(ctx)
         if action == "embedding_backfill":
             return await self._embedding_backfill(payload, ctx)
+        if action == "vector_indexes":
+            return await self._vector_indexes(ctx)
 
         log.warning("Unknown scheduled action: %s", action)
         return {"status": "unknown_action", "action": action}
@@ -56,7 +58,20 @@ class ScheduledHandler:
         service = EmbeddingService(
             ctx.db, provider, ctx.encryption,
             batch_size=ctx.settings.embedding_batch_size,
+            sub_batch_size=ctx.settings.embedding_sub_batch_size,
+            max_concurrency=ctx.settings.embedding_concurrency,
         )
         queued = await service.backfill(table)
         log.info("Embedding backfill queued %d items for %s", queued, table)
         return {"status": "ok", "action": "embedding_backfill", "table": table, "queued": queued}
+
+    async def _vector_indexes(self, ctx) -> dict:
+        """Create/drop per-tenant partial HNSW indexes to match tenant sizes."""
+        from p8.services.vector_indexes import VectorIndexManager
+
+        manager = VectorIndexManager(ctx.db, min_rows=ctx.settings.vector_index_min_tenant_rows)
+        done = await manager.reconcile()
+        created = [a.index_name for a in done if a.action == "create"]
+        dropped = [a.index_name for a in done if a.action == "drop"]
+        log.info("Vector indexes: %d created, %d dropped", len(created), len(dropped))
+        return {"status": "ok", "action": "vector_indexes", "created": created, "dropped": dropped}
@@ -1,7 +1,8 @@
 """Drive sync handler — syncs files from a user's Google Drive folder.
 
 Reads the user's StorageGrant to find the selected folder, then delegates
-to GoogleDriveService.sync_folder() which downloads and ingests files.
+to GoogleDriveService.sync_folder() which downloads and ingests files
+(large files are handed off to file_processing tasks).
 After syncing, creates a summary moment (type=drive_sync) that groups
 the individual file uploads. This moment is NOT shown in the main feed
 by default — it serves as a drilldown container for file upload moments.
@@ -73,8 +74,8 @@ class DriveSyncHandler:
             return {"status": "ok", "paused_grant": str(row["id"]), "reason": str(exc)}
 
         log.info(
-            "Drive sync complete for user %s: synced=%d updated=%d skipped=%d errors=%d",
-            user_id, result.synced, result.updated, result.skipped, result.errors,
+            "Drive sync complete for user %s: synced=%d updated=%d skipped=%d errors=%d queued=%d",
+            user_id, result.synced, result.updated, result.skipped, result.errors, result.queued,
         )
 
         # Create a summary moment when files were synced or updated
@@ -89,6 +90,7 @@ class DriveSyncHandler:
             "updated": result.updated,
             "skipped": result.skipped,
             "errors": result.errors,
+            "queued": result.queued,
             "files": result.files,
         }
 
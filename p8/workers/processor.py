@@ -5,16 +5,31 @@ Usage:
     python -m p8.workers.processor --tier micro --poll-interval 5 --batch-size 1
 
 Same Docker image for all workers — command override selects the tier.
+
+Idle workers block on a LISTEN connection for the tier's NOTIFY channel
+(published by the task_queue triggers in 03_qms.sql) and claim the moment
+work arrives. A long backstop poll covers missed notifications and
+future-scheduled retries; if the LISTEN connection is unavailable the worker
+falls back to polling every ``poll_interval`` seconds.
+
+With ``--concurrency N`` (N > 1) claimed tasks run as parallel asyncio tasks,
+at most N in flight, optionally capped per task_type with
+``--type-concurrency dreaming=2``. Every in-flight task is heartbeated so
+long-running work isn't reclaimed by recover_stale_tasks, and SIGTERM drains
+in-flight work (up to ``--drain-timeout``) before exiting.
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import contextlib
 import logging
 import signal
 from dataclasses import dataclass, field
 
+import asyncpg
+
 from p8.services.bootstrap import bootstrap_services
 from p8.utils.ids import short_id
 from p8.services.database import Database
@@ -92,13 +107,23 @@ def _register_default_handlers() -> None:
 
 @dataclass
 class TieredWorker:
-    """Background worker that polls task_queue for a specific tier."""
+    """Background worker that claims from task_queue for a specific tier."""
 
     tier: str
     poll_interval: float = 5.0
     batch_size: int = 1
+    listen: bool = True
+    backstop_interval: float = 60.0
+    concurrency: int = 1
+    type_concurrency: dict[str, int] = field(default_factory=dict)
+    heartbeat_interval: float = 60.0
+    drain_timeout: float = 300.0
     worker_id: str = field(default_factory=lambda: short_id("worker-"))
     _running: bool = field(default=False, repr=False)
+    _wakeup: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _listener: asyncpg.Connection | None = field(default=None, repr=False)
+    _inflight: dict[asyncio.Task, dict] = field(default_factory=dict, repr=False)
+    _type_semaphores: dict[str, asyncio.Semaphore] = field(default_factory=dict, repr=False)
 
     async def run(self) -> None:
         """Bootstrap services and enter the poll loop."""
@@ -121,19 +146,41 @@ class TieredWorker:
 
             self._running = True
             log.info(
-                "Worker %s started (tier=%s, poll=%.1fs, batch=%d)",
-                self.worker_id, self.tier, self.poll_interval, self.batch_size,
+                "Worker %s started (tier=%s, poll=%.1fs, backstop=%.1fs, listen=%s, "
+                "batch=%d, concurrency=%d)",
+                self.worker_id, self.tier, self.poll_interval, self.backstop_interval,
+                self.listen, self.batch_size, self.concurrency,
             )
 
             while self._running:
                 try:
-                    tasks = await queue.claim(self.tier, self.worker_id, self.batch_size)
+                    if self.listen and self._listener is None:
+                        await self._start_listener(queue)
+
+                    # Clear before claiming so a NOTIFY (or a freed slot) that
+                    # lands mid-claim still wakes the next wait.
+                    self._wakeup.clear()
+
+                    if self.concurrency > 1:
+                        free = self.concurrency - len(self._inflight)
+                        if free <= 0:
+                            await self._wakeup.wait()
+                            continue
+                        limit = min(self.batch_size, free)
+                    else:
+                        limit = self.batch_size
+
+                    tasks = await queue.claim(self.tier, self.worker_id, limit)
                     if not tasks:
-                        await asyncio.sleep(self.poll_interval)
+                        await self._wait_for_work()
                         continue
 
-                    for task in tasks:
-                        await self._process_task(task, ctx, queue)
+                    if self.concurrency > 1:
+                        for task in tasks:
+                            self._spawn(task, ctx, queue)
+                    else:
+                        for task in tasks:
+                            await self._run_task(task, ctx, queue)
 
                 except asyncio.CancelledError:
                     break
@@ -141,8 +188,112 @@ class TieredWorker:
                     log.exception("Worker %s poll error", self.worker_id)
                     await asyncio.sleep(self.poll_interval * 2)
 
+            await self._drain(queue)
+            await self._stop_listener()
             log.info("Worker %s stopped", self.worker_id)
 
+    def _spawn(self, task: dict, ctx: WorkerContext, queue: QueueService) -> None:
+        """Start a claimed task as a background asyncio task."""
+        sem = self._type_semaphore(task["task_type"])
+
+        async def _guarded() -> None:
+            try:
+                await self._run_task(task, ctx, queue, limit=sem)
+            except Exception:
+                log.exception("Worker %s task %s crashed", self.worker_id, task["id"])
+
+        t = asyncio.create_task(_guarded(), name=f"task-{task['id']}")
+        self._inflight[t] = task
+        t.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, t: asyncio.Task) -> None:
+        self._inflight.pop(t, None)
+        self._wakeup.set()  # a slot is free — re-check the queue
+
+    def _type_semaphore(self, task_type: str) -> asyncio.Semaphore:
+        sem = self._type_semaphores.get(task_type)
+        if sem is None:
+            limit = self.type_concurrency.get(task_type, self.concurrency)
+            sem = self._type_semaphores[task_type] = asyncio.Semaphore(max(1, limit))
+        return sem
+
+    async def _run_task(
+        self, task: dict, ctx: WorkerContext, queue: QueueService,
+        limit: asyncio.Semaphore | None = None,
+    ) -> None:
+        """Process a task while heartbeating it so it isn't recovered as stale.
+
+        The heartbeat starts before waiting on ``limit`` (the per-type cap):
+        a claimed task queued behind it is still owned by this worker.
+        """
+        heartbeat = asyncio.create_task(self._heartbeat(task["id"], queue))
+        try:
+            async with limit or contextlib.nullcontext():
+                await self._process_task(task, ctx, queue)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, task_id, queue: QueueService) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await queue.heartbeat(task_id)
+            except Exception:
+                log.warning("Heartbeat failed for task %s", task_id, exc_info=True)
+
+    async def _drain(self, queue: QueueService) -> None:
+        """Wait for in-flight tasks on shutdown; cancel and requeue stragglers."""
+        if not self._inflight:
+            return
+        log.info(
+            "Worker %s draining %d in-flight task(s) (timeout=%.0fs)",
+            self.worker_id, len(self._inflight), self.drain_timeout,
+        )
+        inflight = dict(self._inflight)
+        _done, pending = await asyncio.wait(inflight, timeout=self.drain_timeout)
+        for t in pending:
+            t.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for t in pending:
+            # fail_task puts it back to pending (with backoff) for another worker
+            await queue.fail(inflight[t]["id"], "worker shutdown before task finished")
+
+    async def _start_listener(self, queue: QueueService) -> None:
+        """Open the LISTEN connection; on failure stay in polling mode until next loop."""
+        try:
+            conn = await queue.listen(self.tier, self._on_notify)
+        except Exception:
+            log.warning(
+                "Worker %s could not LISTEN, polling every %.1fs",
+                self.worker_id, self.poll_interval, exc_info=True,
+            )
+            return
+        conn.add_termination_listener(self._on_listener_closed)
+        self._listener = conn
+
+    async def _stop_listener(self) -> None:
+        conn, self._listener = self._listener, None
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+
+    def _on_notify(self, task_type: str) -> None:
+        log.debug("Worker %s woken by %s task", self.worker_id, task_type)
+        self._wakeup.set()
+
+    def _on_listener_closed(self, _conn: asyncpg.Connection) -> None:
+        if self._running:
+            log.warning("Worker %s LISTEN connection lost, reconnecting", self.worker_id)
+        self._listener = None
+
+    async def _wait_for_work(self) -> None:
+        """Sleep until a NOTIFY arrives or the backstop/poll interval elapses."""
+        timeout = self.backstop_interval if self._listener is not None else self.poll_interval
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except TimeoutError:
+            pass
+
     async def _process_task(self, task: dict, ctx: WorkerContext, queue: QueueService) -> None:
         """Dispatch a single task to its handler."""
         task_id = task["id"]
@@ -187,6 +338,7 @@ class TieredWorker:
     def stop(self) -> None:
         """Signal the worker to stop after current iteration."""
         self._running = False
+        self._wakeup.set()
 
 
 # ---------------------------------------------------------------------------
@@ -194,11 +346,33 @@ class TieredWorker:
 # ---------------------------------------------------------------------------
 
 
+def _parse_type_limits(values: list[str]) -> dict[str, int]:
+    """Parse repeated ``TYPE=N`` CLI values into {task_type: limit}."""
+    limits: dict[str, int] = {}
+    for item in values:
+        task_type, sep, n = item.partition("=")
+        if not sep or not n.strip().isdigit():
+            raise SystemExit(f"--type-concurrency expects TYPE=N, got {item!r}")
+        limits[task_type.strip()] = int(n)
+    return limits
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="QMS tiered worker")
     parser.add_argument("--tier", required=True, choices=["micro", "small", "medium", "large"])
     parser.add_argument("--poll-interval", type=float, default=5.0)
     parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--backstop-interval", type=float, default=60.0,
+                        help="Poll interval while LISTEN is active (catches missed NOTIFYs)")
+    parser.add_argument("--no-listen", dest="listen", action="store_false",
+                        help="Disable LISTEN/NOTIFY wakeups and poll every --poll-interval")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Max claimed tasks running in parallel (1 = sequential)")
+    parser.add_argument("--type-concurrency", action="append", default=[], metavar="TYPE=N",
+                        help="Per-task_type limit within --concurrency, e.g. dreaming=2")
+    parser.add_argument("--heartbeat-interval", type=float, default=60.0)
+    parser.add_argument("--drain-timeout", type=float, default=300.0,
+                        help="Seconds to wait for in-flight tasks on shutdown")
     args = parser.parse_args()
 
     logging.basicConfig(
@@ -210,16 +384,23 @@ def main() -> None:
         tier=args.tier,
         poll_interval=args.poll_interval,
         batch_size=args.batch_size,
+        listen=args.listen,
+        backstop_interval=args.backstop_interval,
+        concurrency=args.concurrency,
+        type_concurrency=_parse_type_limits(args.type_concurrency),
+        heartbeat_interval=args.heartbeat_interval,
+        drain_timeout=args.drain_timeout,
     )
 
     loop = asyncio.new_event_loop()
 
-    def _shutdown(sig, _frame):
+    def _shutdown(sig):
         log.info("Received %s, shutting down...", signal.Signals(sig).name)
         worker.stop()
 
-    signal.signal(signal.SIGTERM, _shutdown)
-    signal.signal(signal.SIGINT, _shutdown)
+    # Loop-level handlers so stop() wakes a worker blocked on LISTEN immediately.
+    loop.add_signal_handler(signal.SIGTERM, _shutdown, signal.SIGTERM)
+    loop.add_signal_handler(signal.SIGINT, _shutdown, signal.SIGINT)
 
     try:
         loop.run_until_complete(worker.run())
@@ -266,6 +266,9 @@ CREATE TABLE IF NOT EXISTS files (
 -- Partial index for file processing queue (KEDA worker polls this)
 CREATE INDEX IF NOT EXISTS idx_files_processing_status
     ON files(processing_status) WHERE processing_status = 'pending';
+-- Drive sync looks up synced state for a whole listing page at once
+CREATE INDEX IF NOT EXISTS idx_files_provider_file_id
+    ON files(user_id, (metadata->>'provider_file_id')) WHERE deleted_at IS NULL;
 
 -- feedback — user ratings on agent responses
 CREATE TABLE IF NOT EXISTS feedback (
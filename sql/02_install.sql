@@ -75,6 +75,30 @@ CREATE UNLOGGED TABLE IF NOT EXISTS embedding_queue (
     UNIQUE (table_name, entity_id, field_name)
 );
 
+-- Query embedding cache — shared second tier behind RemQueryEngine's
+-- in-process LRU. Keyed by content_hash(provider|model|dims|normalized text)
+-- so every API pod reuses SEARCH query vectors. Purged by pg_cron.
+CREATE UNLOGGED TABLE IF NOT EXISTS query_embedding_cache (
+    content_hash VARCHAR(64) PRIMARY KEY,
+    provider     VARCHAR(50) NOT NULL,
+    embedding    vector NOT NULL,
+    created_at   TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-tenant embedding counts + partial HNSW index registry (logged: the
+-- index names must survive a crash). row_count is refreshed by pg_cron via
+-- refresh_embedding_tenant_stats(); index_name is set by the Python
+-- VectorIndexManager when it builds a tenant's partial HNSW index.
+-- rem_search uses row_count to pick an exact scan for small tenants.
+CREATE TABLE IF NOT EXISTS embedding_tenant_indexes (
+    table_name  VARCHAR(100) NOT NULL,
+    tenant_id   VARCHAR(100) NOT NULL,
+    row_count   BIGINT NOT NULL DEFAULT 0,
+    index_name  VARCHAR(63),
+    updated_at  TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (table_name, tenant_id)
+);
+
 
 -- ---------------------------------------------------------------------------
 -- Helper Functions
@@ -271,6 +295,97 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+-- Embedding owner denormalization
+-- embeddings_<table>.tenant_id/user_id mirror the entity row so rem_search can
+-- filter before ranking. The BEFORE trigger fills them on every write path
+-- (upsert_embedding, the bulk Python upsert); the entity-side trigger
+-- propagates ownership changes.
+CREATE OR REPLACE FUNCTION embeddings_set_owner() RETURNS TRIGGER AS $$
+BEGIN
+    -- TG_TABLE_NAME is embeddings_<table>
+    EXECUTE format('SELECT tenant_id, user_id FROM %I WHERE id = $1',
+                   substr(TG_TABLE_NAME, length('embeddings_') + 1))
+       INTO NEW.tenant_id, NEW.user_id
+      USING NEW.entity_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION propagate_embedding_owner() RETURNS TRIGGER AS $$
+BEGIN
+    EXECUTE format(
+        'UPDATE embeddings_%I SET tenant_id = $1, user_id = $2 WHERE entity_id = $3',
+        TG_TABLE_NAME
+    ) USING NEW.tenant_id, NEW.user_id, NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Per-tenant embedding counts for every embeddings table (hourly via pg_cron).
+-- Tenants that no longer have rows are dropped unless they still own a
+-- partial index (VectorIndexManager drops those first).
+CREATE OR REPLACE FUNCTION refresh_embedding_tenant_stats() RETURNS INTEGER AS $$
+DECLARE
+    v_tables TEXT[];
+    v_table  TEXT;
+    v_count  INTEGER := 0;
+    v_batch  INTEGER;
+BEGIN
+    SELECT array_agg(s.name) INTO v_tables
+    FROM schemas s
+    WHERE s.kind = 'table' AND s.deleted_at IS NULL
+      AND (s.json_schema->>'has_embeddings')::boolean = true;
+    IF v_tables IS NULL THEN RETURN 0; END IF;
+
+    FOREACH v_table IN ARRAY v_tables LOOP
+        EXECUTE format(
+            'WITH counts AS (
+                 SELECT tenant_id, count(*) AS n FROM embeddings_%I
+                 WHERE tenant_id IS NOT NULL GROUP BY tenant_id
+             ),
+             upserted AS (
+                 INSERT INTO embedding_tenant_indexes (table_name, tenant_id, row_count)
+                 SELECT %L, c.tenant_id, c.n FROM counts c
+                 ON CONFLICT (table_name, tenant_id) DO UPDATE
+                     SET row_count = EXCLUDED.row_count, updated_at = CURRENT_TIMESTAMP
+                 RETURNING 1
+             )
+             SELECT count(*) FROM upserted',
+            v_table, v_table
+        ) INTO v_batch;
+        v_count := v_count + v_batch;
+
+        EXECUTE format(
+            'DELETE FROM embedding_tenant_indexes s
+             WHERE s.table_name = %L AND s.index_name IS NULL
+               AND NOT EXISTS (SELECT 1 FROM embeddings_%I e WHERE e.tenant_id = s.tenant_id)',
+            v_table, v_table
+        );
+    END LOOP;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- ANN session tuning for one rem_search/rem_hybrid call (transaction-local).
+-- ef_search scales with the requested limit; when rows are filtered after the
+-- index scan, pgvector >= 0.8 iterative scans keep walking the graph until
+-- enough rows pass the filter instead of returning a short list.
+CREATE OR REPLACE FUNCTION rem_tune_ann(p_limit INTEGER, p_filtered BOOLEAN) RETURNS VOID AS $$
+BEGIN
+    PERFORM set_config(
+        'hnsw.ef_search',
+        LEAST(GREATEST(40, p_limit * CASE WHEN p_filtered THEN 4 ELSE 2 END), 1000)::text,
+        true
+    );
+    IF p_filtered AND current_setting('hnsw.iterative_scan', true) IS NOT NULL THEN
+        PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+
 -- Embedding failure handler (retry up to 3 times, then mark failed)
 CREATE OR REPLACE FUNCTION fail_embedding(
     p_table_name VARCHAR,
@@ -410,6 +525,244 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+-- ---------------------------------------------------------------------------
+-- Daily Activity Rollup (backs rem_moments_feed)
+-- ---------------------------------------------------------------------------
+
+-- One row per (user_id, UTC date) with the counters the feed's daily summary
+-- cards show, kept current by statement-level triggers on messages, moments
+-- and resources. The feed reads p_limit rows from here instead of scanning
+-- and re-aggregating the user's whole history on every page load.
+-- Counting rules match the feed: live rows only, moments exclude
+-- session_chunk, resources count only when categorized. user_id may be NULL
+-- (rows without an owner still show in the unscoped feed).
+CREATE TABLE IF NOT EXISTS user_daily_activity (
+    user_id          UUID,
+    activity_date    DATE NOT NULL,
+    message_count    INT NOT NULL DEFAULT 0,
+    total_tokens     BIGINT NOT NULL DEFAULT 0,
+    moment_count     INT NOT NULL DEFAULT 0,
+    reminder_count   INT NOT NULL DEFAULT 0,
+    resource_count   INT NOT NULL DEFAULT 0,
+    resource_counts  JSONB NOT NULL DEFAULT '{}'::jsonb,   -- {category: count}
+    updated_at       TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE NULLS NOT DISTINCT (user_id, activity_date)
+);
+
+-- Sessions with messages on each (user_id, date) — session_count and the
+-- card's session list. Rows that drop to zero are ignored by the feed.
+CREATE TABLE IF NOT EXISTS user_daily_sessions (
+    user_id          UUID,
+    activity_date    DATE NOT NULL,
+    session_id       UUID NOT NULL,
+    message_count    INT NOT NULL DEFAULT 0,
+    UNIQUE NULLS NOT DISTINCT (user_id, activity_date, session_id)
+);
+
+-- Unscoped feed (p_user_id IS NULL) walks dates across all users
+CREATE INDEX IF NOT EXISTS idx_user_daily_activity_date
+    ON user_daily_activity (activity_date DESC);
+
+-- Add two {key: count} objects, dropping keys that net to zero
+CREATE OR REPLACE FUNCTION jsonb_sum_counts(p_a JSONB, p_b JSONB) RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_object_agg(key, total), '{}'::jsonb)
+    FROM (
+        SELECT key, SUM(value::bigint) AS total
+        FROM (
+            SELECT * FROM jsonb_each_text(COALESCE(p_a, '{}'::jsonb))
+            UNION ALL
+            SELECT * FROM jsonb_each_text(COALESCE(p_b, '{}'::jsonb))
+        ) kv
+        GROUP BY key
+        HAVING SUM(value::bigint) <> 0
+    ) sums;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Statement-level triggers: new row images count +1, old images -1. An
+-- UPDATE contributes both, so moved / soft-deleted / re-typed rows net out,
+-- and groups whose delta is zero are not written. Transition tables are
+-- copied into arrays so each trigger is one static (plan-cached) statement
+-- whichever event fired it.
+CREATE OR REPLACE FUNCTION user_daily_activity_on_messages() RETURNS TRIGGER AS $$
+DECLARE
+    v_new messages[];
+    v_old messages[];
+BEGIN
+    IF TG_OP <> 'DELETE' THEN v_new := ARRAY(SELECT n FROM new_rows n); END IF;
+    IF TG_OP <> 'INSERT' THEN v_old := ARRAY(SELECT o FROM old_rows o); END IF;
+
+    WITH delta AS (
+        SELECT r.sign, r.user_id, (r.created_at AT TIME ZONE 'UTC')::date AS activity_date,
+               r.session_id, COALESCE(r.token_count, 0) AS tokens
+        FROM (
+            SELECT 1 AS sign, n.* FROM unnest(v_new) n
+            UNION ALL
+            SELECT -1 AS sign, o.* FROM unnest(v_old) o
+        ) r
+        WHERE r.deleted_at IS NULL
+    ),
+    days AS (
+        INSERT INTO user_daily_activity AS a (user_id, activity_date, message_count, total_tokens)
+        SELECT d.user_id, d.activity_date, SUM(d.sign), SUM(d.sign * d.tokens)
+        FROM delta d
+        GROUP BY 1, 2
+        HAVING SUM(d.sign) <> 0 OR SUM(d.sign * d.tokens) <> 0
+        ON CONFLICT (user_id, activity_date) DO UPDATE
+            SET message_count = a.message_count + EXCLUDED.message_count,
+                total_tokens = a.total_tokens + EXCLUDED.total_tokens,
+                updated_at = CURRENT_TIMESTAMP
+    )
+    INSERT INTO user_daily_sessions AS s (user_id, activity_date, session_id, message_count)
+    SELECT d.user_id, d.activity_date, d.session_id, SUM(d.sign)
+    FROM delta d
+    WHERE d.session_id IS NOT NULL
+    GROUP BY 1, 2, 3
+    HAVING SUM(d.sign) <> 0
+    ON CONFLICT (user_id, activity_date, session_id) DO UPDATE
+        SET message_count = s.message_count + EXCLUDED.message_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION user_daily_activity_on_moments() RETURNS TRIGGER AS $$
+DECLARE
+    v_new moments[];
+    v_old moments[];
+BEGIN
+    IF TG_OP <> 'DELETE' THEN v_new := ARRAY(SELECT n FROM new_rows n); END IF;
+    IF TG_OP <> 'INSERT' THEN v_old := ARRAY(SELECT o FROM old_rows o); END IF;
+
+    INSERT INTO user_daily_activity AS a (user_id, activity_date, moment_count, reminder_count)
+    SELECT r.user_id, (r.created_at AT TIME ZONE 'UTC')::date,
+           SUM(r.sign), COALESCE(SUM(r.sign) FILTER (WHERE r.moment_type = 'reminder'), 0)
+    FROM (
+        SELECT 1 AS sign, n.* FROM unnest(v_new) n
+        UNION ALL
+        SELECT -1 AS sign, o.* FROM unnest(v_old) o
+    ) r
+    WHERE r.deleted_at IS NULL
+      AND r.moment_type != 'session_chunk'
+    GROUP BY 1, 2
+    HAVING SUM(r.sign) <> 0 OR SUM(r.sign) FILTER (WHERE r.moment_type = 'reminder') <> 0
+    ON CONFLICT (user_id, activity_date) DO UPDATE
+        SET moment_count = a.moment_count + EXCLUDED.moment_count,
+            reminder_count = a.reminder_count + EXCLUDED.reminder_count,
+            updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION user_daily_activity_on_resources() RETURNS TRIGGER AS $$
+DECLARE
+    v_new resources[];
+    v_old resources[];
+BEGIN
+    IF TG_OP <> 'DELETE' THEN v_new := ARRAY(SELECT n FROM new_rows n); END IF;
+    IF TG_OP <> 'INSERT' THEN v_old := ARRAY(SELECT o FROM old_rows o); END IF;
+
+    INSERT INTO user_daily_activity AS a (user_id, activity_date, resource_count, resource_counts)
+    SELECT c.user_id, c.activity_date, SUM(c.cnt), jsonb_object_agg(c.category, c.cnt)
+    FROM (
+        SELECT r.user_id, (r.created_at AT TIME ZONE 'UTC')::date AS activity_date,
+               r.category, SUM(r.sign) AS cnt
+        FROM (
+            SELECT 1 AS sign, n.* FROM unnest(v_new) n
+            UNION ALL
+            SELECT -1 AS sign, o.* FROM unnest(v_old) o
+        ) r
+        WHERE r.deleted_at IS NULL
+          AND r.category IS NOT NULL
+        GROUP BY 1, 2, 3
+        HAVING SUM(r.sign) <> 0
+    ) c
+    GROUP BY 1, 2
+    ON CONFLICT (user_id, activity_date) DO UPDATE
+        SET resource_count = a.resource_count + EXCLUDED.resource_count,
+            resource_counts = jsonb_sum_counts(a.resource_counts, EXCLUDED.resource_counts),
+            updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event
+DO $$
+DECLARE
+    v_table TEXT;
+    v_event TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY['messages', 'moments', 'resources'] LOOP
+        FOREACH v_event IN ARRAY ARRAY['insert', 'update', 'delete'] LOOP
+            EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_daily_activity_%s ON %I',
+                           v_table, v_event, v_table);
+            EXECUTE format(
+                'CREATE TRIGGER trg_%s_daily_activity_%s AFTER %s ON %I REFERENCING %s
+                 FOR EACH STATEMENT EXECUTE FUNCTION user_daily_activity_on_%s()',
+                v_table, v_event, upper(v_event), v_table,
+                CASE v_event
+                    WHEN 'insert' THEN 'NEW TABLE AS new_rows'
+                    WHEN 'delete' THEN 'OLD TABLE AS old_rows'
+                    ELSE 'OLD TABLE AS old_rows NEW TABLE AS new_rows'
+                END,
+                v_table
+            );
+        END LOOP;
+    END LOOP;
+END;
+$$;
+
+-- Full rebuild from messages / moments / resources (first install, manual
+-- reset, or after bulk loads that bypass triggers such as TRUNCATE).
+CREATE OR REPLACE FUNCTION rebuild_user_daily_activity() RETURNS VOID AS $$
+BEGIN
+    TRUNCATE user_daily_activity, user_daily_sessions;
+
+    INSERT INTO user_daily_activity (user_id, activity_date, message_count, total_tokens)
+    SELECT m.user_id, (m.created_at AT TIME ZONE 'UTC')::date,
+           COUNT(*), COALESCE(SUM(m.token_count), 0)
+    FROM messages m
+    WHERE m.deleted_at IS NULL
+    GROUP BY 1, 2;
+
+    INSERT INTO user_daily_sessions (user_id, activity_date, session_id, message_count)
+    SELECT m.user_id, (m.created_at AT TIME ZONE 'UTC')::date, m.session_id, COUNT(*)
+    FROM messages m
+    WHERE m.deleted_at IS NULL AND m.session_id IS NOT NULL
+    GROUP BY 1, 2, 3;
+
+    INSERT INTO user_daily_activity AS a (user_id, activity_date, moment_count, reminder_count)
+    SELECT mo.user_id, (mo.created_at AT TIME ZONE 'UTC')::date,
+           COUNT(*), COUNT(*) FILTER (WHERE mo.moment_type = 'reminder')
+    FROM moments mo
+    WHERE mo.deleted_at IS NULL AND mo.moment_type != 'session_chunk'
+    GROUP BY 1, 2
+    ON CONFLICT (user_id, activity_date) DO UPDATE
+        SET moment_count = EXCLUDED.moment_count,
+            reminder_count = EXCLUDED.reminder_count;
+
+    INSERT INTO user_daily_activity AS a (user_id, activity_date, resource_count, resource_counts)
+    SELECT user_id, activity_date, SUM(cnt), jsonb_object_agg(category, cnt)
+    FROM (
+        SELECT r.user_id, (r.created_at AT TIME ZONE 'UTC')::date AS activity_date,
+               r.category, COUNT(*) AS cnt
+        FROM resources r
+        WHERE r.deleted_at IS NULL AND r.category IS NOT NULL
+        GROUP BY 1, 2, 3
+    ) per_category
+    GROUP BY 1, 2
+    ON CONFLICT (user_id, activity_date) DO UPDATE
+        SET resource_count = EXCLUDED.resource_count,
+            resource_counts = EXCLUDED.resource_counts;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill on first install. No-op once populated.
+DO $$ BEGIN
+    IF NOT EXISTS (SELECT 1 FROM user_daily_activity) THEN
+        PERFORM rebuild_user_daily_activity();
+    END IF;
+END $$;
+
+
 -- ---------------------------------------------------------------------------
 -- REM Functions
 -- ---------------------------------------------------------------------------
@@ -450,7 +803,83 @@ END;
 $$ LANGUAGE plpgsql;
 
 
+-- rem_lookup_many — batched LOOKUP for many keys in a handful of queries
+-- Resolves every key against kv_store in one pass, then loads full rows with
+-- one query per entity_type (instead of one EXECUTE per key).
+-- Returns one row per input key in input order; keys that don't resolve (or
+-- whose entity was deleted) come back with entity_type/data NULL so callers
+-- can report them as missing.
+CREATE OR REPLACE FUNCTION rem_lookup_many(
+    p_entity_keys VARCHAR[],
+    p_tenant_id VARCHAR(100) DEFAULT NULL,
+    p_user_id UUID DEFAULT NULL
+) RETURNS TABLE(ord INT, entity_key VARCHAR, entity_type VARCHAR, data JSONB) AS $$
+DECLARE
+    v_ords  INT[];
+    v_keys  VARCHAR[];
+    v_types VARCHAR[];
+    v_ids   UUID[];
+    v_type  VARCHAR;
+    v_part  JSONB;
+    v_rows  JSONB := '{}'::jsonb;
+BEGIN
+    -- Step 1: one kv_store pass for all keys
+    SELECT array_agg(k.ord::int ORDER BY k.ord),
+           array_agg(k.key ORDER BY k.ord),
+           array_agg(r.entity_type ORDER BY k.ord),
+           array_agg(r.entity_id ORDER BY k.ord)
+      INTO v_ords, v_keys, v_types, v_ids
+    FROM unnest(p_entity_keys) WITH ORDINALITY AS k(key, ord)
+    LEFT JOIN LATERAL (
+        SELECT kv.entity_type, kv.entity_id
+        FROM kv_store kv
+        WHERE kv.entity_key = normalize_key(k.key)
+          AND (p_tenant_id IS NULL OR kv.tenant_id = p_tenant_id)
+          AND (p_user_id IS NULL OR kv.user_id IS NULL OR kv.user_id = p_user_id)
+        LIMIT 1
+    ) r ON true;
+
+    IF v_ords IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- Step 2: one query per entity_type for the full rows, keyed by id
+    FOR v_type IN
+        SELECT DISTINCT t FROM unnest(v_types) AS t WHERE t IS NOT NULL
+    LOOP
+        EXECUTE format(
+            'SELECT COALESCE(jsonb_object_agg(t.id::text, row_to_json(t.*)::jsonb), ''{}''::jsonb)
+             FROM %I t WHERE t.id = ANY($1) AND t.deleted_at IS NULL',
+            v_type
+        ) INTO v_part
+        USING ARRAY(SELECT x.id FROM unnest(v_types, v_ids) AS x(t, id) WHERE x.t = v_type);
+        v_rows := v_rows || v_part;
+    END LOOP;
+
+    RETURN QUERY
+    SELECT x.ord,
+           x.key,
+           CASE WHEN v_rows ? x.id::text THEN x.t END,
+           v_rows -> x.id::text
+    FROM unnest(v_ords, v_keys, v_types, v_ids) AS x(ord, key, t, id)
+    ORDER BY x.ord;
+END;
+$$ LANGUAGE plpgsql;
+
+
 -- rem_search — semantic similarity search via pgvector
+--
+-- Owner filters run against the denormalized embeddings_<table>.tenant_id /
+-- user_id columns, i.e. before ranking. Tenant-scoped calls pick a path from
+-- embedding_tenant_indexes:
+--   small tenant (<= 5000 vectors, or not counted yet) → exact scan of that
+--       tenant's rows via idx_embeddings_<table>_owner — full recall
+--   larger tenant → ANN scan with the tenant predicate inlined as a literal,
+--       so the planner can use the tenant's partial HNSW index when
+--       VectorIndexManager has built one
+-- ANN scans are tuned by rem_tune_ann() (ef_search + iterative scan) so
+-- post-filters don't starve the result. The category-column check is baked
+-- in at install time (rem_table_has_category).
 -- Drop old 8-param signature (without p_category) to avoid ambiguous overload
 DROP FUNCTION IF EXISTS rem_search(vector, varchar, varchar, varchar, varchar, real, integer, uuid);
 CREATE OR REPLACE FUNCTION rem_search(
@@ -465,37 +894,72 @@ CREATE OR REPLACE FUNCTION rem_search(
     p_category VARCHAR(100) DEFAULT NULL
 ) RETURNS TABLE(entity_type VARCHAR, similarity_score REAL, data JSONB) AS $$
 DECLARE
-    v_cat_filter TEXT := '';
-    v_has_category BOOLEAN;
+    v_cat_filter   TEXT := '';
+    v_owner_filter TEXT := '';
+    v_rows         BIGINT;
+    v_exact        BOOLEAN := false;
+    v_filters      TEXT;
 BEGIN
-    -- Only filter on category if the target table has that column
-    SELECT EXISTS(
-        SELECT 1 FROM information_schema.columns
-        WHERE table_schema = 'public' AND table_name = p_table_name AND column_name = 'category'
-    ) INTO v_has_category;
-
-    IF v_has_category AND p_category IS NOT NULL THEN
+    IF p_category IS NOT NULL AND rem_table_has_category(p_table_name) THEN
         v_cat_filter := format(' AND t.category = %L', p_category);
     END IF;
 
+    IF p_tenant_id IS NOT NULL THEN
+        v_owner_filter := format(' AND e.tenant_id = %L', p_tenant_id);
+        SELECT s.row_count INTO v_rows
+        FROM embedding_tenant_indexes s
+        WHERE s.table_name = p_table_name AND s.tenant_id = p_tenant_id;
+        v_exact := COALESCE(v_rows, 0) <= 5000;
+    END IF;
+
+    v_filters := ' WHERE e.field_name = $2
+                     AND e.provider = $3'
+                 || v_owner_filter ||
+                 ' AND ($4 IS NULL OR e.user_id IS NULL OR e.user_id = $4)
+                   AND (t.deleted_at IS NULL)
+                   AND (1 - (e.embedding <=> $1)) >= $5'
+                 || v_cat_filter;
+
+    IF v_exact THEN
+        -- Ordering by the similarity expression (not e.embedding <=> $1)
+        -- keeps the planner off the HNSW index: this is a brute-force scan
+        -- of the tenant's rows.
+        RETURN QUERY EXECUTE format(
+            'SELECT %L::varchar AS entity_type,
+                    (1 - (e.embedding <=> $1))::real AS similarity_score,
+                    row_to_json(t.*)::jsonb AS data
+             FROM embeddings_%I e
+             JOIN %I t ON t.id = e.entity_id'
+            || v_filters ||
+            ' ORDER BY similarity_score DESC
+             LIMIT $6',
+            p_table_name, p_table_name, p_table_name
+        ) USING p_query_embedding, p_field_name, p_provider,
+                p_user_id, p_min_similarity, p_limit;
+        RETURN;
+    END IF;
+
+    PERFORM rem_tune_ann(
+        p_limit, p_tenant_id IS NOT NULL OR p_user_id IS NOT NULL OR v_cat_filter <> ''
+    );
+    -- Iterative scans may return rows slightly out of order: re-sort the
+    -- materialized candidates
     RETURN QUERY EXECUTE format(
-        'SELECT %L::varchar AS entity_type,
-                (1 - (e.embedding <=> $1))::real AS similarity_score,
-                row_to_json(t.*)::jsonb AS data
-         FROM embeddings_%I e
-         JOIN %I t ON t.id = e.entity_id
-         WHERE e.field_name = $2
-           AND e.provider = $3
-           AND (t.deleted_at IS NULL)
-           AND ($4 IS NULL OR t.tenant_id = $4)
-           AND ($5 IS NULL OR t.user_id IS NULL OR t.user_id = $5)
-           AND (1 - (e.embedding <=> $1)) >= $6'
-        || v_cat_filter ||
-        ' ORDER BY e.embedding <=> $1
-         LIMIT $7',
+        'WITH ann AS MATERIALIZED (
+             SELECT %L::varchar AS entity_type,
+                    (1 - (e.embedding <=> $1))::real AS similarity_score,
+                    row_to_json(t.*)::jsonb AS data,
+                    e.embedding <=> $1 AS distance
+             FROM embeddings_%I e
+             JOIN %I t ON t.id = e.entity_id'
+            || v_filters ||
+            ' ORDER BY e.embedding <=> $1
+             LIMIT $6
+         )
+         SELECT a.entity_type, a.similarity_score, a.data FROM ann a ORDER BY a.distance',
         p_table_name, p_table_name, p_table_name
     ) USING p_query_embedding, p_field_name, p_provider,
-            p_tenant_id, p_user_id, p_min_similarity, p_limit;
+            p_user_id, p_min_similarity, p_limit;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -536,15 +1000,131 @@ END;
 $$ LANGUAGE plpgsql;
 
 
--- rem_traverse — recursive graph walk via graph_edges JSONB
+-- rem_hybrid — SEARCH + FUZZY in one round-trip, fused with reciprocal-rank fusion
+-- Takes the top p_candidates from the vector index (embeddings_<table>) and
+-- from trigram matching on kv_store (restricted to the same entity_type),
+-- then scores each entity as
+--     p_vector_weight / (p_rrf_k + vector_rank) + p_text_weight / (p_rrf_k + text_rank)
+-- An entity found by only one arm gets only that term. Returns one
+-- deduplicated list ordered by fused score (similarity_score), plus the rank
+-- from each arm (NULL when that arm didn't find it).
+CREATE OR REPLACE FUNCTION rem_hybrid(
+    p_query_embedding vector,
+    p_query_text TEXT,
+    p_table_name VARCHAR(100),
+    p_field_name VARCHAR(100) DEFAULT 'content',
+    p_tenant_id VARCHAR(100) DEFAULT NULL,
+    p_provider VARCHAR(50) DEFAULT 'openai',
+    p_min_similarity REAL DEFAULT 0.3,
+    p_threshold REAL DEFAULT 0.3,
+    p_limit INTEGER DEFAULT 10,
+    p_user_id UUID DEFAULT NULL,
+    p_category VARCHAR(100) DEFAULT NULL,
+    p_vector_weight REAL DEFAULT 1.0,
+    p_text_weight REAL DEFAULT 1.0,
+    p_rrf_k INTEGER DEFAULT 60,
+    p_candidates INTEGER DEFAULT 50
+) RETURNS TABLE(
+    entity_type VARCHAR, similarity_score REAL, data JSONB,
+    vector_rank INT, text_rank INT
+) AS $$
+DECLARE
+    v_cat_filter TEXT := '';
+    v_owner_filter TEXT := '';
+BEGIN
+    IF p_category IS NOT NULL AND rem_table_has_category(p_table_name) THEN
+        v_cat_filter := format(' AND t.category = %L', p_category);
+    END IF;
+    IF p_tenant_id IS NOT NULL THEN
+        v_owner_filter := format(' AND e.tenant_id = %L', p_tenant_id);
+    END IF;
+
+    PERFORM rem_tune_ann(
+        p_candidates, p_tenant_id IS NOT NULL OR p_user_id IS NOT NULL OR v_cat_filter <> ''
+    );
+    RETURN QUERY EXECUTE format(
+        'WITH vec AS (
+             SELECT c.entity_id, row_number() OVER (ORDER BY c.distance)::int AS rank
+             FROM (
+                 SELECT e.entity_id, e.embedding <=> $1 AS distance
+                 FROM embeddings_%I e
+                 JOIN %I t ON t.id = e.entity_id
+                 WHERE e.field_name = $2
+                   AND e.provider = $3'
+                   || v_owner_filter ||
+                 ' AND ($5 IS NULL OR e.user_id IS NULL OR e.user_id = $5)
+                   AND (t.deleted_at IS NULL)
+                   AND (1 - (e.embedding <=> $1)) >= $6'
+                   || v_cat_filter ||
+                 ' ORDER BY e.embedding <=> $1
+                 LIMIT $12
+             ) c
+         ),
+         txt AS (
+             SELECT c.entity_id, row_number() OVER (ORDER BY c.score DESC)::int AS rank
+             FROM (
+                 SELECT kv.entity_id,
+                        GREATEST(similarity(kv.entity_key, $7),
+                                 similarity(kv.content_summary, $7)) AS score
+                 FROM kv_store kv
+                 WHERE kv.entity_type = %L
+                   AND ($4 IS NULL OR kv.tenant_id = $4)
+                   AND ($5 IS NULL OR kv.user_id IS NULL OR kv.user_id = $5)
+                   AND GREATEST(similarity(kv.entity_key, $7),
+                                similarity(kv.content_summary, $7)) >= $8
+                 ORDER BY score DESC
+                 LIMIT $12
+             ) c
+         ),
+         fused AS (
+             SELECT COALESCE(v.entity_id, x.entity_id) AS entity_id,
+                    v.rank AS vector_rank,
+                    x.rank AS text_rank,
+                    COALESCE($9 / ($11 + v.rank), 0)
+                      + COALESCE($10 / ($11 + x.rank), 0) AS score
+             FROM vec v
+             FULL OUTER JOIN txt x ON x.entity_id = v.entity_id
+         )
+         SELECT %L::varchar AS entity_type,
+                f.score::real AS similarity_score,
+                row_to_json(t.*)::jsonb AS data,
+                f.vector_rank,
+                f.text_rank
+         FROM fused f
+         JOIN %I t ON t.id = f.entity_id
+         WHERE (t.deleted_at IS NULL)'
+         || v_cat_filter ||
+        ' ORDER BY f.score DESC, f.entity_id
+         LIMIT $13',
+        p_table_name, p_table_name, p_table_name, p_table_name, p_table_name
+    ) USING p_query_embedding, p_field_name, p_provider,
+            p_tenant_id, p_user_id, p_min_similarity,
+            p_query_text, p_threshold,
+            p_vector_weight::float8, p_text_weight::float8, p_rrf_k::float8,
+            p_candidates, p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- rem_traverse — graph walk via graph_edges JSONB
 --
 -- Three modes controlled by p_keys_only and p_load:
 --   default (both false)  → lazy: keys + summary/metadata from kv_store
 --   p_keys_only = true    → keys only: no entity_record at all
 --   p_load = true         → load: full entity rows from source tables (like LOOKUP)
 --
+-- Walks level by level from the start node. Each node is returned once, via
+-- its cheapest path (visited nodes are deduped across paths), and source
+-- edges are read from the tenant-scoped kv_store row that was reached.
+--   p_max_fanout — follow at most N edges per node (highest weight first)
+--   p_weighted   — shortest-path-first: hop cost is 1/rel_weight, so strong
+--                  edges are "closer"; rows are ordered by path_cost.
+--                  Unweighted, every hop costs 1 and path_cost = depth.
+-- With p_load, full rows are fetched with one query per entity_type.
+--
 -- Prefer lazy mode for agents exploring the graph — LOOKUP specific nodes after.
 DROP FUNCTION IF EXISTS rem_traverse(VARCHAR, VARCHAR, UUID, INTEGER, VARCHAR, BOOLEAN);
+DROP FUNCTION IF EXISTS rem_traverse(VARCHAR, VARCHAR, UUID, INTEGER, VARCHAR, BOOLEAN, BOOLEAN);
 
 CREATE OR REPLACE FUNCTION rem_traverse(
     p_entity_key VARCHAR(255),
@@ -553,75 +1133,146 @@ CREATE OR REPLACE FUNCTION rem_traverse(
     p_max_depth INTEGER DEFAULT 1,
     p_rel_type VARCHAR(100) DEFAULT NULL,
     p_keys_only BOOLEAN DEFAULT FALSE,
-    p_load BOOLEAN DEFAULT FALSE
+    p_load BOOLEAN DEFAULT FALSE,
+    p_max_fanout INTEGER DEFAULT NULL,
+    p_weighted BOOLEAN DEFAULT FALSE
 ) RETURNS TABLE(
     depth INT, entity_key VARCHAR, entity_type VARCHAR,
     entity_id UUID, rel_type VARCHAR, rel_weight REAL,
-    path TEXT[], entity_record JSONB
+    path TEXT[], entity_record JSONB, path_cost REAL
 ) AS $$
 DECLARE
-    v_row RECORD;
-    v_data JSONB;
+    v_nodes    JSONB;  -- entity_key → best node found so far
+    v_frontier JSONB;  -- nodes added or improved in the last level
+    v_level    INT := 0;
+    v_type     VARCHAR;
+    v_part     JSONB;
+    v_rows     JSONB := '{}'::jsonb;
 BEGIN
-    -- Run the recursive CTE and iterate results
-    FOR v_row IN
-        WITH RECURSIVE traversal AS (
-            -- Seed: starting node
-            SELECT 0 AS depth,
-                   kv.entity_key::varchar AS entity_key,
-                   kv.entity_type::varchar AS entity_type,
-                   kv.entity_id,
-                   NULL::varchar AS rel_type, 1.0::real AS rel_weight,
-                   ARRAY[kv.entity_key::text] AS path,
-                   jsonb_build_object('summary', kv.content_summary,
-                                      'metadata', kv.metadata) AS kv_record
-            FROM kv_store kv
-            WHERE kv.entity_key = normalize_key(p_entity_key)
-              AND (p_tenant_id IS NULL OR kv.tenant_id = p_tenant_id)
-              AND (p_user_id IS NULL OR kv.user_id IS NULL OR kv.user_id = p_user_id)
+    -- Seed: starting node(s)
+    SELECT jsonb_object_agg(s.entity_key, s.node), jsonb_agg(s.node)
+      INTO v_nodes, v_frontier
+    FROM (
+        SELECT kv.entity_key,
+               jsonb_build_object(
+                   'depth', 0, 'entity_key', kv.entity_key,
+                   'entity_type', kv.entity_type, 'entity_id', kv.entity_id,
+                   'rel_type', NULL, 'rel_weight', 1.0,
+                   'path', jsonb_build_array(kv.entity_key), 'cost', 0,
+                   'kv_record', jsonb_build_object('summary', kv.content_summary,
+                                                   'metadata', kv.metadata)
+               ) AS node
+        FROM kv_store kv
+        WHERE kv.entity_key = normalize_key(p_entity_key)
+          AND (p_tenant_id IS NULL OR kv.tenant_id = p_tenant_id)
+          AND (p_user_id IS NULL OR kv.user_id IS NULL OR kv.user_id = p_user_id)
+        LIMIT 1
+    ) s;
+
+    IF v_nodes IS NULL THEN
+        RETURN;
+    END IF;
 
-            UNION ALL
+    -- Expand one level at a time; a node enters the next frontier only if
+    -- this level reached it more cheaply than anything seen before
+    WHILE v_level < p_max_depth AND jsonb_array_length(v_frontier) > 0 LOOP
+        v_level := v_level + 1;
 
-            -- Walk edges
-            SELECT t.depth + 1,
-                   normalize_key(edge->>'target')::varchar,
-                   kv2.entity_type::varchar,
-                   kv2.entity_id,
-                   (edge->>'relation')::varchar,
-                   COALESCE((edge->>'weight')::real, 1.0),
-                   t.path || normalize_key(edge->>'target')::text,
-                   jsonb_build_object('summary', kv2.content_summary,
-                                      'metadata', kv2.metadata)
-            FROM traversal t
-            JOIN kv_store kv_src ON kv_src.entity_key = t.entity_key
-            CROSS JOIN LATERAL jsonb_array_elements(kv_src.graph_edges) AS edge
-            JOIN kv_store kv2 ON kv2.entity_key = normalize_key(edge->>'target')
-            WHERE t.depth < p_max_depth
-              AND NOT (normalize_key(edge->>'target') = ANY(t.path))
-              AND (p_rel_type IS NULL OR edge->>'relation' = p_rel_type)
+        WITH frontier AS (
+            SELECT f.entity_key, f.entity_id, f.path, f.cost
+            FROM jsonb_to_recordset(v_frontier)
+                 AS f(entity_key VARCHAR, entity_id UUID, path JSONB, cost REAL)
+        ),
+        edges AS (
+            -- Resolve targets (tenant/user scoped) before applying the fan-out
+            -- cap, so the cap counts only edges that can actually be followed
+            SELECT f.path,
+                   kv2.entity_key, kv2.entity_type, kv2.entity_id,
+                   kv2.content_summary, kv2.metadata,
+                   (e.edge->>'relation')::varchar AS relation,
+                   COALESCE((e.edge->>'weight')::real, 1.0) AS weight,
+                   f.cost + CASE WHEN p_weighted
+                                 THEN 1.0 / GREATEST(COALESCE((e.edge->>'weight')::real, 1.0), 0.001)
+                                 ELSE 1 END AS cost,
+                   row_number() OVER (
+                       PARTITION BY f.entity_key
+                       ORDER BY COALESCE((e.edge->>'weight')::real, 1.0) DESC, e.ord
+                   ) AS rank
+            FROM frontier f
+            JOIN kv_store src ON src.entity_id = f.entity_id
+                             AND src.entity_key = f.entity_key
+            CROSS JOIN LATERAL jsonb_array_elements(src.graph_edges)
+                 WITH ORDINALITY AS e(edge, ord)
+            JOIN kv_store kv2 ON kv2.entity_key = normalize_key(e.edge->>'target')
+            WHERE (p_rel_type IS NULL OR e.edge->>'relation' = p_rel_type)
+              AND NOT f.path ? kv2.entity_key
               AND (p_tenant_id IS NULL OR kv2.tenant_id = p_tenant_id)
               AND (p_user_id IS NULL OR kv2.user_id IS NULL OR kv2.user_id = p_user_id)
+        ),
+        reached AS (
+            -- Cheapest way into each target from this level
+            SELECT DISTINCT ON (ed.entity_key)
+                   ed.entity_key,
+                   jsonb_build_object(
+                       'depth', v_level, 'entity_key', ed.entity_key,
+                       'entity_type', ed.entity_type, 'entity_id', ed.entity_id,
+                       'rel_type', ed.relation, 'rel_weight', ed.weight,
+                       'path', ed.path || to_jsonb(ed.entity_key), 'cost', ed.cost,
+                       'kv_record', jsonb_build_object('summary', ed.content_summary,
+                                                       'metadata', ed.metadata)
+                   ) AS node
+            FROM edges ed
+            WHERE p_max_fanout IS NULL OR ed.rank <= p_max_fanout
+            ORDER BY ed.entity_key, ed.cost, ed.weight DESC
+        ),
+        improved AS (
+            SELECT r.entity_key, r.node
+            FROM reached r
+            WHERE NOT v_nodes ? r.entity_key
+               OR (r.node->>'cost')::real < (v_nodes->r.entity_key->>'cost')::real
         )
-        SELECT * FROM traversal
-    LOOP
-        -- Determine entity_record based on mode
-        IF p_keys_only THEN
-            v_data := NULL;
-        ELSIF p_load THEN
-            -- Dynamic join to source table for full entity data (like LOOKUP)
-            EXECUTE format(
-                'SELECT row_to_json(t.*)::jsonb FROM %I t WHERE t.id = $1 AND t.deleted_at IS NULL',
-                v_row.entity_type
-            ) INTO v_data USING v_row.entity_id;
-        ELSE
-            -- Lazy: summary + metadata from kv_store
-            v_data := v_row.kv_record;
-        END IF;
+        SELECT COALESCE(jsonb_object_agg(i.entity_key, i.node), '{}'::jsonb),
+               COALESCE(jsonb_agg(i.node), '[]'::jsonb)
+          INTO v_part, v_frontier
+        FROM improved i;
 
-        RETURN QUERY SELECT v_row.depth, v_row.entity_key, v_row.entity_type,
-                            v_row.entity_id, v_row.rel_type, v_row.rel_weight,
-                            v_row.path, v_data;
+        v_nodes := v_nodes || v_part;
     END LOOP;
+
+    -- Load: one query per entity_type instead of one per node
+    IF p_load AND NOT p_keys_only THEN
+        FOR v_type IN
+            SELECT DISTINCT n.value->>'entity_type' FROM jsonb_each(v_nodes) n
+        LOOP
+            EXECUTE format(
+                'SELECT COALESCE(jsonb_object_agg(t.id::text, row_to_json(t.*)::jsonb), ''{}''::jsonb)
+                 FROM %I t WHERE t.id = ANY($1) AND t.deleted_at IS NULL',
+                v_type
+            ) INTO v_part
+            USING ARRAY(
+                SELECT (n.value->>'entity_id')::uuid FROM jsonb_each(v_nodes) n
+                WHERE n.value->>'entity_type' = v_type
+            );
+            v_rows := v_rows || v_part;
+        END LOOP;
+    END IF;
+
+    RETURN QUERY
+    SELECT (n.value->>'depth')::int,
+           (n.value->>'entity_key')::varchar,
+           (n.value->>'entity_type')::varchar,
+           (n.value->>'entity_id')::uuid,
+           (n.value->>'rel_type')::varchar,
+           (n.value->>'rel_weight')::real,
+           ARRAY(SELECT jsonb_array_elements_text(n.value->'path')),
+           CASE
+               WHEN p_keys_only THEN NULL
+               WHEN p_load THEN v_rows->(n.value->>'entity_id')
+               ELSE n.value->'kv_record'
+           END,
+           (n.value->>'cost')::real
+    FROM jsonb_each(v_nodes) n
+    ORDER BY (n.value->>'cost')::real, (n.value->>'depth')::int, n.key;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -859,12 +1510,20 @@ $$ LANGUAGE plpgsql;
 
 -- Drop old overload that included p_pai_messages parameter
 DROP FUNCTION IF EXISTS rem_persist_turn(UUID, TEXT, TEXT, UUID, VARCHAR, JSONB, JSONB, INT, INT, INT, INT, VARCHAR, VARCHAR, VARCHAR, UUID, UUID);
+-- Drop overload without p_tool_messages
+DROP FUNCTION IF EXISTS rem_persist_turn(UUID, TEXT, TEXT, UUID, VARCHAR, JSONB, INT, INT, INT, INT, VARCHAR, VARCHAR, VARCHAR, UUID, UUID);
 
--- rem_persist_turn — atomically persist a user+assistant message pair,
--- update session token totals, and optionally trigger moment building
--- if threshold exceeded.
+-- rem_persist_turn — atomically persist a chat turn, update session token
+-- totals, and optionally trigger moment building if threshold exceeded.
 --
--- Batches 2 INSERTs + 1 UPDATE + optional moment build into one round-trip.
+-- p_tool_messages is an optional ordered array of tool_call/tool_response
+-- rows stored between the user and assistant messages:
+--   [{"id", "message_type", "content", "token_count", "tool_calls"}, ...]
+-- Content arrives already encrypted (ids are pre-generated for AAD binding).
+-- created_at is offset by one microsecond per row so the turn keeps its
+-- order when history is loaded by created_at.
+--
+-- Batches the INSERTs + 1 UPDATE + optional moment build into one round-trip.
 -- Returns the user message ID, assistant message ID, and optional moment name.
 CREATE OR REPLACE FUNCTION rem_persist_turn(
     p_session_id       UUID,
@@ -881,7 +1540,8 @@ CREATE OR REPLACE FUNCTION rem_persist_turn(
     p_agent_name       VARCHAR DEFAULT NULL,
     p_encryption_level VARCHAR DEFAULT NULL,
     p_user_msg_id      UUID    DEFAULT NULL,
-    p_asst_msg_id      UUID    DEFAULT NULL
+    p_asst_msg_id      UUID    DEFAULT NULL,
+    p_tool_messages    JSONB   DEFAULT NULL
 ) RETURNS TABLE(
     user_message_id      UUID,
     assistant_message_id UUID,
@@ -894,6 +1554,8 @@ DECLARE
     v_asst_msg_id UUID;
     v_user_tokens INT;
     v_asst_tokens INT;
+    v_tool_tokens INT := 0;
+    v_tool_count  INT := 0;
     v_moment_name VARCHAR;
     v_moment_row RECORD;
 BEGIN
@@ -906,22 +1568,44 @@ BEGIN
     v_asst_msg_id := COALESCE(p_asst_msg_id, gen_random_uuid());
 
     -- 1. Insert user message
-    INSERT INTO messages (id, session_id, message_type, content, token_count, tenant_id, user_id, encryption_level)
-    VALUES (v_user_msg_id, p_session_id, 'user', p_user_content, v_user_tokens, p_tenant_id, p_user_id, p_encryption_level);
+    INSERT INTO messages (id, session_id, message_type, content, token_count, tenant_id, user_id, encryption_level,
+                          created_at)
+    VALUES (v_user_msg_id, p_session_id, 'user', p_user_content, v_user_tokens, p_tenant_id, p_user_id, p_encryption_level,
+            CURRENT_TIMESTAMP);
+
+    -- 2. Insert tool_call / tool_response rows in order
+    IF p_tool_messages IS NOT NULL AND jsonb_typeof(p_tool_messages) = 'array' THEN
+        WITH ins AS (
+            INSERT INTO messages (id, session_id, message_type, content, token_count, tool_calls,
+                                  agent_name, tenant_id, user_id, encryption_level, created_at)
+            SELECT COALESCE((t.elem->>'id')::uuid, gen_random_uuid()),
+                   p_session_id,
+                   t.elem->>'message_type',
+                   t.elem->>'content',
+                   COALESCE((t.elem->>'token_count')::int, LENGTH(t.elem->>'content') / 4, 0),
+                   t.elem->'tool_calls',
+                   p_agent_name, p_tenant_id, p_user_id, p_encryption_level,
+                   CURRENT_TIMESTAMP + t.ord * INTERVAL '1 microsecond'
+            FROM jsonb_array_elements(p_tool_messages) WITH ORDINALITY AS t(elem, ord)
+            RETURNING token_count
+        )
+        SELECT COUNT(*), COALESCE(SUM(ins.token_count), 0) INTO v_tool_count, v_tool_tokens FROM ins;
+    END IF;
 
-    -- 2. Insert assistant message (with usage metrics)
+    -- 3. Insert assistant message (with usage metrics)
     INSERT INTO messages (id, session_id, message_type, content, token_count, tool_calls,
                           input_tokens, output_tokens, latency_ms, model, agent_name,
-                          tenant_id, user_id, encryption_level)
+                          tenant_id, user_id, encryption_level, created_at)
     VALUES (v_asst_msg_id, p_session_id, 'assistant', p_assistant_content, v_asst_tokens, p_tool_calls,
             p_input_tokens, p_output_tokens, p_latency_ms, p_model, p_agent_name,
-            p_tenant_id, p_user_id, p_encryption_level);
+            p_tenant_id, p_user_id, p_encryption_level,
+            CURRENT_TIMESTAMP + (v_tool_count + 1) * INTERVAL '1 microsecond');
 
-    -- 3. Update session token total
-    UPDATE sessions SET total_tokens = total_tokens + v_user_tokens + v_asst_tokens
+    -- 4. Update session token total
+    UPDATE sessions SET total_tokens = total_tokens + v_user_tokens + v_tool_tokens + v_asst_tokens
     WHERE id = p_session_id;
 
-    -- 4. Optionally build moment if threshold > 0
+    -- 5. Optionally build moment if threshold > 0
     v_moment_name := NULL;
     IF p_moment_threshold > 0 THEN
         SELECT bm.moment_name INTO v_moment_name
@@ -1137,6 +1821,8 @@ $$ LANGUAGE sql IMMUTABLE;
 --
 -- Pagination is cursor-based: p_before_date bounds all CTEs so they only scan
 -- the requested date window (p_limit active dates starting before the cursor).
+-- Dates and per-day stats come from the user_daily_activity /
+-- user_daily_sessions rollups, so a page costs O(p_limit) rows.
 -- The client passes the oldest event_date from the previous page as the next
 -- cursor.  First request: p_before_date = NULL (starts from today).
 --
@@ -1165,100 +1851,56 @@ CREATE OR REPLACE FUNCTION rem_moments_feed(
     metadata         JSONB
 ) AS $$
 WITH
--- 1. Find the next p_limit active dates before the cursor.
---    This bounds all downstream CTEs to a small date window.
---    Includes dates from both messages AND moments so upload-only days appear.
+-- 1. Find the next p_limit active dates before the cursor, with their
+--    stats, from the user_daily_activity rollup (an index range scan on
+--    (user_id, activity_date) — cost follows p_limit, not history).
+--    Dates with messages, moments or categorized resources all count, so
+--    upload-only days appear.
 active_dates AS (
-    SELECT DISTINCT d FROM (
-        SELECT (m.created_at AT TIME ZONE 'UTC')::date AS d
-        FROM messages m
-        WHERE m.deleted_at IS NULL
-          AND (p_user_id IS NULL OR m.user_id = p_user_id)
-          AND (p_before_date IS NULL OR (m.created_at AT TIME ZONE 'UTC')::date <= p_before_date)
-        UNION
-        SELECT (mo.created_at AT TIME ZONE 'UTC')::date AS d
-        FROM moments mo
-        WHERE mo.deleted_at IS NULL
-          AND (p_user_id IS NULL OR mo.user_id = p_user_id)
-          AND mo.moment_type != 'session_chunk'
-          AND (p_before_date IS NULL OR (mo.created_at AT TIME ZONE 'UTC')::date <= p_before_date)
-        UNION
-        SELECT (r.created_at AT TIME ZONE 'UTC')::date AS d
-        FROM resources r
-        WHERE r.deleted_at IS NULL
-          AND r.category IS NOT NULL
-          AND (p_user_id IS NULL OR r.user_id = p_user_id)
-          AND (p_before_date IS NULL OR (r.created_at AT TIME ZONE 'UTC')::date <= p_before_date)
-    ) AS all_dates
-    ORDER BY d DESC
-    LIMIT p_limit
-),
-
--- 2. Per-date stats — only for dates in the window
-daily_stats AS (
-    SELECT
-        (m.created_at AT TIME ZONE 'UTC')::date AS d,
-        COUNT(*)                                 AS msg_count,
-        COALESCE(SUM(m.token_count), 0)          AS total_tokens,
-        COUNT(DISTINCT m.session_id)             AS session_count
-    FROM messages m
-    WHERE m.deleted_at IS NULL
-      AND (p_user_id IS NULL OR m.user_id = p_user_id)
-      AND (m.created_at AT TIME ZONE 'UTC')::date IN (SELECT d FROM active_dates)
-    GROUP BY 1
-),
-
-daily_moment_counts AS (
     SELECT
-        (mo.created_at AT TIME ZONE 'UTC')::date AS d,
-        COUNT(*) AS moment_count
-    FROM moments mo
-    WHERE mo.deleted_at IS NULL
-      AND (p_user_id IS NULL OR mo.user_id = p_user_id)
-      AND mo.moment_type != 'session_chunk'
-      AND (mo.created_at AT TIME ZONE 'UTC')::date IN (SELECT d FROM active_dates)
-    GROUP BY 1
-),
-
-daily_reminder_counts AS (
-    SELECT
-        (mo.created_at AT TIME ZONE 'UTC')::date AS d,
-        COUNT(*) AS reminder_count
-    FROM moments mo
-    WHERE mo.deleted_at IS NULL
-      AND mo.moment_type = 'reminder'
-      AND (p_user_id IS NULL OR mo.user_id = p_user_id)
-      AND (mo.created_at AT TIME ZONE 'UTC')::date IN (SELECT d FROM active_dates)
-    GROUP BY 1
+        a.activity_date                      AS d,
+        SUM(a.message_count)::bigint         AS msg_count,
+        SUM(a.total_tokens)::bigint          AS total_tokens,
+        SUM(a.moment_count)::bigint          AS moment_count,
+        SUM(a.reminder_count)::bigint        AS reminder_count
+    FROM user_daily_activity a
+    WHERE (p_user_id IS NULL OR a.user_id = p_user_id)
+      AND (p_before_date IS NULL OR a.activity_date <= p_before_date)
+      AND (a.message_count > 0 OR a.moment_count > 0 OR a.resource_count > 0)
+    GROUP BY a.activity_date
+    ORDER BY a.activity_date DESC
+    LIMIT p_limit
 ),
 
+-- 2. Per-category resource counts — only for dates in the window
 daily_resource_counts AS (
     SELECT sub.d, jsonb_object_agg(sub.category, sub.cnt) AS resource_counts
     FROM (
-        SELECT (r.created_at AT TIME ZONE 'UTC')::date AS d, r.category, COUNT(*) AS cnt
-        FROM resources r
-        WHERE r.deleted_at IS NULL
-          AND r.category IS NOT NULL
-          AND (p_user_id IS NULL OR r.user_id = p_user_id)
-          AND (r.created_at AT TIME ZONE 'UTC')::date IN (SELECT d FROM active_dates)
+        SELECT a.activity_date AS d, rc.key AS category, SUM(rc.value::bigint)::bigint AS cnt
+        FROM user_daily_activity a
+        CROSS JOIN LATERAL jsonb_each_text(a.resource_counts) rc
+        WHERE (p_user_id IS NULL OR a.user_id = p_user_id)
+          AND a.activity_date IN (SELECT d FROM active_dates)
         GROUP BY 1, 2
+        HAVING SUM(rc.value::bigint) > 0
     ) sub GROUP BY sub.d
 ),
 
--- 3. Sessions active on each date (for metadata) — window-bounded
+-- 3. Sessions active on each date (count + metadata) — window-bounded
 daily_sessions AS (
     SELECT
-        (m.created_at AT TIME ZONE 'UTC')::date AS d,
+        uds.activity_date AS d,
+        COUNT(DISTINCT uds.session_id) AS session_count,
         jsonb_agg(DISTINCT jsonb_build_object(
             'session_id', s.id,
             'name', s.name,
             'agent_name', s.agent_name
-        )) AS sessions
-    FROM messages m
-    JOIN sessions s ON s.id = m.session_id AND s.deleted_at IS NULL
-    WHERE m.deleted_at IS NULL
-      AND (p_user_id IS NULL OR m.user_id = p_user_id)
-      AND (m.created_at AT TIME ZONE 'UTC')::date IN (SELECT d FROM active_dates)
+        )) FILTER (WHERE s.id IS NOT NULL) AS sessions
+    FROM user_daily_sessions uds
+    LEFT JOIN sessions s ON s.id = uds.session_id AND s.deleted_at IS NULL
+    WHERE uds.message_count > 0
+      AND (p_user_id IS NULL OR uds.user_id = p_user_id)
+      AND uds.activity_date IN (SELECT d FROM active_dates)
     GROUP BY 1
 ),
 
@@ -1276,27 +1918,24 @@ daily_summaries AS (
                     WHEN ad.d = CURRENT_DATE - 1 THEN 'Yesterday'
                     ELSE to_char(ad.d, 'Mon DD')
                END,
-               COALESCE(ds.msg_count, 0), COALESCE(ds.session_count, 0),
-               COALESCE(ds.total_tokens, 0),
-               COALESCE(dmc.moment_count, 0)
+               ad.msg_count, COALESCE(dss.session_count, 0),
+               ad.total_tokens,
+               ad.moment_count
         )                                                              AS summary,
         rem_daily_session_id(p_user_id, ad.d)                          AS session_id,
         NULL::text                                                     AS image,
         NULL::varchar                                                  AS encryption_level,
         NULL::int                                                      AS rating,
         jsonb_build_object(
-            'message_count', COALESCE(ds.msg_count, 0),
-            'total_tokens', COALESCE(ds.total_tokens, 0),
-            'session_count', COALESCE(ds.session_count, 0),
-            'moment_count', COALESCE(dmc.moment_count, 0),
-            'reminder_count', COALESCE(drc.reminder_count, 0),
+            'message_count', ad.msg_count,
+            'total_tokens', ad.total_tokens,
+            'session_count', COALESCE(dss.session_count, 0),
+            'moment_count', ad.moment_count,
+            'reminder_count', ad.reminder_count,
             'resource_counts', COALESCE(drsc.resource_counts, '{}'::jsonb),
             'sessions', COALESCE(dss.sessions, '[]'::jsonb)
         )                                                              AS metadata
     FROM active_dates ad
-    LEFT JOIN daily_stats ds ON ds.d = ad.d
-    LEFT JOIN daily_moment_counts dmc ON dmc.d = ad.d
-    LEFT JOIN daily_reminder_counts drc ON drc.d = ad.d
     LEFT JOIN daily_resource_counts drsc ON drsc.d = ad.d
     LEFT JOIN daily_sessions dss ON dss.d = ad.d
 ),
@@ -1331,6 +1970,9 @@ real_moments AS (
     WHERE mo.deleted_at IS NULL
       AND (p_user_id IS NULL OR mo.user_id = p_user_id)
       AND mo.moment_type != 'session_chunk'
+      -- Range on created_at first so idx_moments_user_created bounds the scan
+      AND mo.created_at >= (SELECT MIN(d) FROM active_dates)::timestamp AT TIME ZONE 'UTC'
+      AND mo.created_at < ((SELECT MAX(d) FROM active_dates) + 1)::timestamp AT TIME ZONE 'UTC'
       AND (mo.created_at AT TIME ZONE 'UTC')::date IN (SELECT d FROM active_dates)
       AND (p_include_future OR mo.moment_type = 'reminder' OR mo.starts_timestamp IS NULL OR mo.starts_timestamp <= CURRENT_TIMESTAMP)
 ),
@@ -1463,6 +2105,57 @@ END;
 $$;
 
 
+-- Embedding owner columns — tenant_id/user_id denormalized onto
+-- embeddings_<table> (backfilled here, then kept in sync by triggers)
+DO $$
+DECLARE
+    v_tables TEXT[];
+    v_table TEXT;
+BEGIN
+    SELECT array_agg(s.name) INTO v_tables
+    FROM schemas s
+    WHERE s.kind = 'table' AND s.deleted_at IS NULL
+      AND (s.json_schema->>'has_embeddings')::boolean = true;
+    IF v_tables IS NULL THEN RETURN; END IF;
+
+    FOREACH v_table IN ARRAY v_tables LOOP
+        EXECUTE format(
+            'ALTER TABLE embeddings_%I
+                 ADD COLUMN IF NOT EXISTS tenant_id VARCHAR(100),
+                 ADD COLUMN IF NOT EXISTS user_id UUID',
+            v_table
+        );
+        EXECUTE format(
+            'UPDATE embeddings_%I e
+                SET tenant_id = t.tenant_id, user_id = t.user_id
+               FROM %I t
+              WHERE t.id = e.entity_id
+                AND (e.tenant_id IS DISTINCT FROM t.tenant_id
+                     OR e.user_id IS DISTINCT FROM t.user_id)',
+            v_table, v_table
+        );
+        EXECUTE format(
+            'DROP TRIGGER IF EXISTS trg_embeddings_%I_owner ON embeddings_%I;
+             CREATE TRIGGER trg_embeddings_%I_owner
+                 BEFORE INSERT OR UPDATE OF entity_id ON embeddings_%I
+                 FOR EACH ROW EXECUTE FUNCTION embeddings_set_owner()',
+            v_table, v_table, v_table, v_table
+        );
+        EXECUTE format(
+            'DROP TRIGGER IF EXISTS trg_%I_embedding_owner ON %I;
+             CREATE TRIGGER trg_%I_embedding_owner
+                 AFTER UPDATE OF tenant_id, user_id ON %I
+                 FOR EACH ROW
+                 WHEN (OLD.tenant_id IS DISTINCT FROM NEW.tenant_id
+                       OR OLD.user_id IS DISTINCT FROM NEW.user_id)
+                 EXECUTE FUNCTION propagate_embedding_owner()',
+            v_table, v_table, v_table, v_table
+        );
+    END LOOP;
+END;
+$$;
+
+
 -- Schema timemachine — audit trail for schemas table only
 DROP TRIGGER IF EXISTS trg_schemas_timemachine ON schemas;
 CREATE TRIGGER trg_schemas_timemachine
@@ -1497,10 +2190,35 @@ BEGIN
                  ON embeddings_%I (content_hash)',
             v_table, v_table
         );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS idx_embeddings_%I_owner
+                 ON embeddings_%I (tenant_id, user_id)',
+            v_table, v_table
+        );
     END LOOP;
 END;
 $$;
 
+-- rem_table_has_category(table) — which tables have a category column,
+-- baked in at install time so rem_search / rem_hybrid skip the
+-- information_schema lookup per call. Re-run by every `p8 migrate`.
+DO $$
+DECLARE
+    v_tables TEXT[];
+BEGIN
+    SELECT COALESCE(array_agg(c.table_name::text ORDER BY c.table_name), '{}')
+      INTO v_tables
+    FROM information_schema.columns c
+    WHERE c.table_schema = 'public' AND c.column_name = 'category';
+
+    EXECUTE format(
+        'CREATE OR REPLACE FUNCTION rem_table_has_category(p_table TEXT) RETURNS BOOLEAN AS
+             $fn$ SELECT p_table = ANY(%L::text[]) $fn$ LANGUAGE sql IMMUTABLE',
+        v_tables
+    );
+END;
+$$;
+
 -- KV store indexes (idx_kv_store_tenant_key already created with table above)
 CREATE INDEX IF NOT EXISTS idx_kv_store_type ON kv_store (entity_type);
 CREATE INDEX IF NOT EXISTS idx_kv_store_entity_id ON kv_store (entity_id);
@@ -1547,6 +2265,14 @@ CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, created
 CREATE INDEX IF NOT EXISTS idx_messages_session_tokens ON messages (session_id, created_at DESC)
     INCLUDE (token_count);
 
+-- Moments: per-user date window (rem_moments_feed real moments)
+CREATE INDEX IF NOT EXISTS idx_moments_user_created ON moments (user_id, created_at DESC)
+    WHERE deleted_at IS NULL;
+
+-- Moments: per-session lookup (context injection, context-cache freshness check)
+CREATE INDEX IF NOT EXISTS idx_moments_source_session ON moments (source_session_id, created_at DESC)
+    WHERE deleted_at IS NULL;
+
 -- Schemas: kind lookup (agent routing, type discovery, table registry queries)
 CREATE INDEX IF NOT EXISTS idx_schemas_kind ON schemas (kind) WHERE deleted_at IS NULL;
 
@@ -1638,6 +2364,15 @@ SELECT cron.schedule('hnsw-reindex', '0 3 * * 0', $$
     $inner$;
 $$);
 
+-- Per-tenant embedding counts (drive rem_search path choice + partial HNSW indexes)
+SELECT cron.schedule('embedding-tenant-stats', '40 * * * *', 'SELECT refresh_embedding_tenant_stats()');
+
+-- Query embedding cache: hourly purge of entries older than a day
+SELECT cron.schedule('query-embedding-cache-gc', '15 * * * *', $$
+    DELETE FROM query_embedding_cache
+    WHERE created_at < CURRENT_TIMESTAMP - INTERVAL '1 day';
+$$);
+
 -- Dropped column GC: weekly cleanup of staged column drops
 SELECT cron.schedule('gc-dropped-cols', '0 3 * * 0', 'SELECT gc_dropped_columns(30)');
 
@@ -119,6 +119,183 @@ CREATE TRIGGER trg_task_queue_updated_at
     FOR EACH ROW EXECUTE FUNCTION update_updated_at();
 
 
+-- ---------------------------------------------------------------------------
+-- Wakeup notifications — NOTIFY task_queue_<tier> when work becomes claimable
+-- ---------------------------------------------------------------------------
+
+-- Fires on every path that makes a task claimable: QueueService.enqueue,
+-- enqueue_file_task, the enqueue_*_tasks cron functions, and stale-task
+-- recovery. Workers LISTEN on their tier channel and claim immediately
+-- instead of sleeping out a poll interval. Payload is the task_type.
+-- Postgres collapses identical notifications within a transaction, so a cron
+-- function enqueueing thousands of rows sends one NOTIFY per (tier, type).
+-- Future-scheduled tasks (retry backoff) are left to the worker backstop poll.
+CREATE OR REPLACE FUNCTION notify_task_enqueued() RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.scheduled_at <= CURRENT_TIMESTAMP THEN
+        PERFORM pg_notify('task_queue_' || NEW.tier, NEW.task_type);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_task_queue_notify_insert ON task_queue;
+CREATE TRIGGER trg_task_queue_notify_insert
+    AFTER INSERT ON task_queue
+    FOR EACH ROW
+    WHEN (NEW.status = 'pending')
+    EXECUTE FUNCTION notify_task_enqueued();
+
+DROP TRIGGER IF EXISTS trg_task_queue_notify_requeue ON task_queue;
+CREATE TRIGGER trg_task_queue_notify_requeue
+    AFTER UPDATE OF status ON task_queue
+    FOR EACH ROW
+    WHEN (NEW.status = 'pending' AND OLD.status IS DISTINCT FROM 'pending')
+    EXECUTE FUNCTION notify_task_enqueued();
+
+
+-- ---------------------------------------------------------------------------
+-- User activity watermarks — one row per user, bumped on new activity
+-- ---------------------------------------------------------------------------
+
+-- Keyed by the effective user id (sessions.user_id = COALESCE(users.user_id,
+-- users.id)). Statement-level triggers on messages and moments, and a row
+-- trigger on file completion, keep the last_*_at columns current so the
+-- enqueue_*_tasks cron functions read this small table instead of scanning
+-- message/file history. Bumps within a minute of the stored watermark are
+-- skipped (no new row version) unless the user has dreamed since, or the bump
+-- is the first activity after an in-flight dreaming task was created (that
+-- task's created_at becomes last_dreaming_at when it completes).
+-- last_dreaming_at is stamped by complete_task when a dreaming task succeeds
+-- (with the task's created_at), so failed or dead-lettered runs stay due.
+CREATE TABLE IF NOT EXISTS user_activity (
+    user_id             UUID PRIMARY KEY,
+    last_message_at     TIMESTAMPTZ,
+    last_file_at        TIMESTAMPTZ,   -- file reached processing_status = 'completed'
+    last_moment_at      TIMESTAMPTZ,   -- excludes dream / session_chunk moments
+    last_dreaming_at    TIMESTAMPTZ,
+    updated_at          TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+-- created_at of the user's pending/processing dreaming task (NULL if none)
+CREATE OR REPLACE FUNCTION dreaming_inflight_since(p_user_id UUID) RETURNS TIMESTAMPTZ AS $$
+    SELECT MAX(tq.created_at)
+    FROM task_queue tq
+    WHERE tq.user_id = p_user_id
+      AND tq.task_type = 'dreaming'
+      AND tq.status IN ('pending', 'processing');
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION user_activity_on_messages() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO user_activity AS a (user_id, last_message_at)
+    SELECT COALESCE(s.user_id, n.user_id), MAX(COALESCE(n.created_at, CURRENT_TIMESTAMP))
+    FROM new_rows n
+    LEFT JOIN sessions s ON s.id = n.session_id
+    WHERE COALESCE(s.user_id, n.user_id) IS NOT NULL
+      AND COALESCE(s.mode, '') != 'dreaming'
+    GROUP BY 1
+    ON CONFLICT (user_id) DO UPDATE
+        SET last_message_at = GREATEST(a.last_message_at, EXCLUDED.last_message_at),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE a.last_message_at IS NULL
+           OR a.last_message_at < EXCLUDED.last_message_at - INTERVAL '1 minute'
+           OR a.last_message_at <= a.last_dreaming_at
+           OR (EXCLUDED.last_message_at > dreaming_inflight_since(a.user_id)
+               AND a.last_message_at <= dreaming_inflight_since(a.user_id));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_messages_user_activity ON messages;
+CREATE TRIGGER trg_messages_user_activity
+    AFTER INSERT ON messages
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_activity_on_messages();
+
+CREATE OR REPLACE FUNCTION user_activity_on_moments() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO user_activity AS a (user_id, last_moment_at)
+    SELECT n.user_id, MAX(COALESCE(n.created_at, CURRENT_TIMESTAMP))
+    FROM new_rows n
+    WHERE n.user_id IS NOT NULL
+      AND COALESCE(n.moment_type, '') NOT IN ('dream', 'session_chunk')
+    GROUP BY 1
+    ON CONFLICT (user_id) DO UPDATE
+        SET last_moment_at = GREATEST(a.last_moment_at, EXCLUDED.last_moment_at),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE a.last_moment_at IS NULL
+           OR a.last_moment_at < EXCLUDED.last_moment_at - INTERVAL '1 minute'
+           OR a.last_moment_at <= a.last_dreaming_at
+           OR (EXCLUDED.last_moment_at > dreaming_inflight_since(a.user_id)
+               AND a.last_moment_at <= dreaming_inflight_since(a.user_id));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_moments_user_activity ON moments;
+CREATE TRIGGER trg_moments_user_activity
+    AFTER INSERT ON moments
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_activity_on_moments();
+
+-- Files count once processing completes (what dreaming reads), so this is a
+-- row trigger on the status transition rather than on insert.
+CREATE OR REPLACE FUNCTION user_activity_on_file_completed() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.processing_status = 'completed' THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO user_activity AS a (user_id, last_file_at)
+    VALUES (NEW.user_id, CURRENT_TIMESTAMP)
+    ON CONFLICT (user_id) DO UPDATE
+        SET last_file_at = EXCLUDED.last_file_at,
+            updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_files_user_activity ON files;
+CREATE TRIGGER trg_files_user_activity
+    AFTER INSERT OR UPDATE OF processing_status ON files
+    FOR EACH ROW
+    WHEN (NEW.processing_status = 'completed' AND NEW.user_id IS NOT NULL AND NEW.deleted_at IS NULL)
+    EXECUTE FUNCTION user_activity_on_file_completed();
+
+-- Seed watermarks on first install so the first enqueue after upgrading sees
+-- the last day's activity and prior dreaming runs. No-op once populated.
+DO $$ BEGIN
+    IF NOT EXISTS (SELECT 1 FROM user_activity) THEN
+        INSERT INTO user_activity (user_id, last_message_at)
+        SELECT s.user_id, MAX(m.created_at)
+        FROM messages m
+        JOIN sessions s ON s.id = m.session_id
+        WHERE m.created_at > CURRENT_TIMESTAMP - INTERVAL '24 hours'
+          AND m.deleted_at IS NULL AND s.user_id IS NOT NULL
+          AND COALESCE(s.mode, '') != 'dreaming'
+        GROUP BY s.user_id
+        ON CONFLICT (user_id) DO NOTHING;
+
+        INSERT INTO user_activity AS a (user_id, last_file_at)
+        SELECT f.user_id, MAX(f.created_at)
+        FROM files f
+        WHERE f.created_at > CURRENT_TIMESTAMP - INTERVAL '24 hours'
+          AND f.processing_status = 'completed'
+          AND f.deleted_at IS NULL AND f.user_id IS NOT NULL
+        GROUP BY f.user_id
+        ON CONFLICT (user_id) DO UPDATE SET last_file_at = EXCLUDED.last_file_at;
+
+        INSERT INTO user_activity AS a (user_id, last_dreaming_at)
+        SELECT tq.user_id, MAX(tq.created_at)
+        FROM task_queue tq
+        WHERE tq.task_type = 'dreaming' AND tq.user_id IS NOT NULL
+          AND tq.status = 'completed'
+        GROUP BY tq.user_id
+        ON CONFLICT (user_id) DO UPDATE SET last_dreaming_at = EXCLUDED.last_dreaming_at;
+    END IF;
+END $$;
+
+
 -- ---------------------------------------------------------------------------
 -- Core Functions
 -- ---------------------------------------------------------------------------
@@ -162,16 +339,31 @@ $$ LANGUAGE plpgsql;
 
 
 -- complete_task — mark a task as completed with optional result payload.
+-- A completed dreaming task advances the user's last_dreaming_at watermark
+-- to the task's created_at (activity after enqueue still counts as new).
 CREATE OR REPLACE FUNCTION complete_task(
     p_task_id UUID,
     p_result JSONB DEFAULT NULL
 ) RETURNS VOID AS $$
+DECLARE
+    v_task_type  VARCHAR;
+    v_user_id    UUID;
+    v_created_at TIMESTAMPTZ;
 BEGIN
     UPDATE task_queue
     SET status = 'completed',
         completed_at = CURRENT_TIMESTAMP,
         result = p_result
-    WHERE id = p_task_id;
+    WHERE id = p_task_id
+    RETURNING task_type, user_id, created_at INTO v_task_type, v_user_id, v_created_at;
+
+    IF v_task_type = 'dreaming' AND v_user_id IS NOT NULL THEN
+        INSERT INTO user_activity AS a (user_id, last_dreaming_at)
+        VALUES (v_user_id, v_created_at)
+        ON CONFLICT (user_id) DO UPDATE
+            SET last_dreaming_at = GREATEST(a.last_dreaming_at, EXCLUDED.last_dreaming_at),
+                updated_at = CURRENT_TIMESTAMP;
+    END IF;
 
     PERFORM emit_task_event(p_task_id, 'completed', NULL, NULL, p_result);
 END;
@@ -333,75 +525,46 @@ $$ LANGUAGE plpgsql;
 
 
 -- enqueue_dreaming_tasks — called by pg_cron every 12 hours.
--- Creates one dreaming task per user who has had activity since their last
--- dreaming run (or ever, if no prior dreaming task exists).
+-- Creates one dreaming task per user whose user_activity watermark (new
+-- messages OR newly processed file uploads) is past their last dreaming run,
+-- or within the last 24 hours if they have never dreamed.
 -- Enforces a 12-hour cooldown: won't re-enqueue if a dreaming task completed
 -- within the last 12 hours.
--- Activity = new messages OR new processed file uploads.
--- Uses COALESCE(u.user_id, u.id) because sessions reference the auth-level
--- user_id when set, falling back to the row id.
+-- One set-based INSERT. last_dreaming_at only moves when a dreaming task
+-- completes (complete_task), so a failed or dead-lettered run is picked up
+-- again on the next tick, as with the old MAX(created_at) over live tasks.
 CREATE OR REPLACE FUNCTION enqueue_dreaming_tasks() RETURNS INT AS $$
 DECLARE
-    v_count INT := 0;
-    v_user RECORD;
+    v_count INT;
 BEGIN
-    FOR v_user IN
-        WITH last_dreaming AS (
-            SELECT tq.user_id, MAX(tq.created_at) AS last_run
-            FROM task_queue tq
-            WHERE tq.task_type = 'dreaming'
-              AND tq.status IN ('completed', 'processing', 'pending')
-            GROUP BY tq.user_id
-        ),
-        active_users AS (
-            -- Users with new messages since last dreaming
-            SELECT DISTINCT COALESCE(u.user_id, u.id) AS effective_uid, u.tenant_id
-            FROM users u
-            JOIN sessions s ON s.user_id = COALESCE(u.user_id, u.id) AND s.deleted_at IS NULL
-            JOIN messages m ON m.session_id = s.id AND m.deleted_at IS NULL
-            WHERE u.deleted_at IS NULL
-              AND m.created_at > COALESCE(
-                  (SELECT ld.last_run FROM last_dreaming ld WHERE ld.user_id = COALESCE(u.user_id, u.id)),
-                  CURRENT_TIMESTAMP - INTERVAL '24 hours'
-              )
-
-            UNION
-
-            -- Users with new processed file uploads since last dreaming
-            SELECT DISTINCT COALESCE(u.user_id, u.id) AS effective_uid, u.tenant_id
-            FROM users u
-            JOIN files f ON f.user_id = COALESCE(u.user_id, u.id)
-                        AND f.deleted_at IS NULL
-                        AND f.processing_status = 'completed'
-            WHERE u.deleted_at IS NULL
-              AND f.created_at > COALESCE(
-                  (SELECT ld.last_run FROM last_dreaming ld WHERE ld.user_id = COALESCE(u.user_id, u.id)),
-                  CURRENT_TIMESTAMP - INTERVAL '24 hours'
-              )
-        )
-        SELECT effective_uid, tenant_id FROM active_users
-        WHERE NOT EXISTS (
-            -- Skip if there's a pending/processing task OR a completed one within 12 hours
-            SELECT 1 FROM task_queue tq
-            WHERE tq.task_type = 'dreaming'
-              AND tq.user_id = active_users.effective_uid
-              AND (
-                  tq.status IN ('pending', 'processing')
-                  OR (tq.status = 'completed' AND tq.completed_at > CURRENT_TIMESTAMP - INTERVAL '12 hours')
-              )
-        )
-    LOOP
-        INSERT INTO task_queue (task_type, tier, user_id, tenant_id, payload)
-        VALUES (
-            'dreaming',
-            'small',
-            v_user.effective_uid,
-            v_user.tenant_id,
-            jsonb_build_object('trigger', 'scheduled', 'enqueued_at', CURRENT_TIMESTAMP)
-        );
-        v_count := v_count + 1;
-    END LOOP;
+    WITH due AS (
+        SELECT a.user_id, u.tenant_id
+        FROM user_activity a
+        JOIN LATERAL (
+            SELECT u.tenant_id FROM users u
+            WHERE (u.user_id = a.user_id OR (u.user_id IS NULL AND u.id = a.user_id))
+              AND u.deleted_at IS NULL
+            LIMIT 1
+        ) u ON true
+        WHERE GREATEST(a.last_message_at, a.last_file_at)
+              > COALESCE(a.last_dreaming_at, CURRENT_TIMESTAMP - INTERVAL '24 hours')
+          AND NOT EXISTS (
+              -- Skip if there's a pending/processing task OR a completed one within 12 hours
+              SELECT 1 FROM task_queue tq
+              WHERE tq.task_type = 'dreaming'
+                AND tq.user_id = a.user_id
+                AND (
+                    tq.status IN ('pending', 'processing')
+                    OR (tq.status = 'completed' AND tq.completed_at > CURRENT_TIMESTAMP - INTERVAL '12 hours')
+                )
+          )
+    )
+    INSERT INTO task_queue (task_type, tier, user_id, tenant_id, payload)
+    SELECT 'dreaming', 'small', d.user_id, d.tenant_id,
+           jsonb_build_object('trigger', 'scheduled', 'enqueued_at', CURRENT_TIMESTAMP)
+    FROM due d;
 
+    GET DIAGNOSTICS v_count = ROW_COUNT;
     RETURN v_count;
 END;
 $$ LANGUAGE plpgsql;
@@ -414,39 +577,29 @@ $$ LANGUAGE plpgsql;
 -- upserts resources, and creates a reading moment with LLM summary.
 CREATE OR REPLACE FUNCTION enqueue_news_tasks() RETURNS INT AS $$
 DECLARE
-    v_count INT := 0;
-    v_user RECORD;
+    v_count INT;
 BEGIN
-    FOR v_user IN
-        SELECT COALESCE(u.user_id, u.id) AS effective_uid, u.tenant_id
-        FROM users u
-        WHERE u.deleted_at IS NULL
-          AND u.metadata IS NOT NULL
-          AND (
-              u.metadata->>'interests' IS NOT NULL
-              OR u.metadata->>'categories' IS NOT NULL
-              OR u.metadata->>'feeds' IS NOT NULL
-          )
-          -- Skip users who already have a pending/processing/completed news task today
-          AND NOT EXISTS (
-              SELECT 1 FROM task_queue tq
-              WHERE tq.task_type = 'news'
-                AND tq.user_id = COALESCE(u.user_id, u.id)
-                AND tq.created_at >= date_trunc('day', CURRENT_TIMESTAMP)
-                AND tq.status IN ('pending', 'processing', 'completed')
-          )
-    LOOP
-        INSERT INTO task_queue (task_type, tier, user_id, tenant_id, payload)
-        VALUES (
-            'news',
-            'small',
-            v_user.effective_uid,
-            v_user.tenant_id,
-            jsonb_build_object('trigger', 'scheduled', 'enqueued_at', CURRENT_TIMESTAMP)
-        );
-        v_count := v_count + 1;
-    END LOOP;
+    INSERT INTO task_queue (task_type, tier, user_id, tenant_id, payload)
+    SELECT 'news', 'small', COALESCE(u.user_id, u.id), u.tenant_id,
+           jsonb_build_object('trigger', 'scheduled', 'enqueued_at', CURRENT_TIMESTAMP)
+    FROM users u
+    WHERE u.deleted_at IS NULL
+      AND u.metadata IS NOT NULL
+      AND (
+          u.metadata->>'interests' IS NOT NULL
+          OR u.metadata->>'categories' IS NOT NULL
+          OR u.metadata->>'feeds' IS NOT NULL
+      )
+      -- Skip users who already have a pending/processing/completed news task today
+      AND NOT EXISTS (
+          SELECT 1 FROM task_queue tq
+          WHERE tq.task_type = 'news'
+            AND tq.user_id = COALESCE(u.user_id, u.id)
+            AND tq.created_at >= date_trunc('day', CURRENT_TIMESTAMP)
+            AND tq.status IN ('pending', 'processing', 'completed')
+      );
 
+    GET DIAGNOSTICS v_count = ROW_COUNT;
     RETURN v_count;
 END;
 $$ LANGUAGE plpgsql;
@@ -457,42 +610,32 @@ $$ LANGUAGE plpgsql;
 -- with auto_sync=true and a folder selected, and hasn't been synced recently.
 CREATE OR REPLACE FUNCTION enqueue_drive_sync_tasks() RETURNS INT AS $$
 DECLARE
-    v_count INT := 0;
-    v_grant RECORD;
+    v_count INT;
 BEGIN
-    FOR v_grant IN
-        SELECT sg.user_id_ref AS user_id, sg.tenant_id, sg.provider_folder_id
-        FROM storage_grants sg
-        WHERE sg.provider = 'google-drive'
-          AND sg.status = 'active'
-          AND sg.auto_sync = true
-          AND sg.provider_folder_id IS NOT NULL
-          -- Skip users with pending/processing tasks or completed within last hour
-          AND NOT EXISTS (
-              SELECT 1 FROM task_queue tq
-              WHERE tq.task_type = 'drive_sync'
-                AND tq.user_id = sg.user_id_ref
-                AND (
-                    tq.status IN ('pending', 'processing')
-                    OR (tq.status = 'completed' AND tq.completed_at > CURRENT_TIMESTAMP - INTERVAL '1 hour')
-                )
-          )
-    LOOP
-        INSERT INTO task_queue (task_type, tier, user_id, tenant_id, payload)
-        VALUES (
-            'drive_sync',
-            'small',
-            v_grant.user_id,
-            v_grant.tenant_id,
-            jsonb_build_object(
-                'trigger', 'scheduled',
-                'folder_id', v_grant.provider_folder_id,
-                'enqueued_at', CURRENT_TIMESTAMP
+    INSERT INTO task_queue (task_type, tier, user_id, tenant_id, payload)
+    SELECT 'drive_sync', 'small', sg.user_id_ref, sg.tenant_id,
+           jsonb_build_object(
+               'trigger', 'scheduled',
+               'folder_id', sg.provider_folder_id,
+               'enqueued_at', CURRENT_TIMESTAMP
+           )
+    FROM storage_grants sg
+    WHERE sg.provider = 'google-drive'
+      AND sg.status = 'active'
+      AND sg.auto_sync = true
+      AND sg.provider_folder_id IS NOT NULL
+      -- Skip users with pending/processing tasks or completed within last hour
+      AND NOT EXISTS (
+          SELECT 1 FROM task_queue tq
+          WHERE tq.task_type = 'drive_sync'
+            AND tq.user_id = sg.user_id_ref
+            AND (
+                tq.status IN ('pending', 'processing')
+                OR (tq.status = 'completed' AND tq.completed_at > CURRENT_TIMESTAMP - INTERVAL '1 hour')
             )
-        );
-        v_count := v_count + 1;
-    END LOOP;
+      );
 
+    GET DIAGNOSTICS v_count = ROW_COUNT;
     RETURN v_count;
 END;
 $$ LANGUAGE plpgsql;
@@ -514,6 +657,16 @@ SELECT cron.schedule('qms-news-enqueue', '0 6 * * *', 'SELECT enqueue_news_tasks
 -- Drive sync: hourly at :30, enqueue sync for users with auto_sync enabled
 SELECT cron.schedule('qms-drive-sync-enqueue', '30 * * * *', 'SELECT enqueue_drive_sync_tasks()');
 
+-- Per-tenant partial HNSW indexes: weekly, after the hnsw-reindex window.
+-- CREATE INDEX CONCURRENTLY can't run inside pg_cron's transaction, so the
+-- worker's ScheduledHandler does the builds.
+SELECT cron.schedule('qms-vector-indexes-enqueue', '0 4 * * 0', $$
+    INSERT INTO task_queue (task_type, tier, payload)
+    VALUES ('scheduled', 'small',
+            jsonb_build_object('action', 'vector_indexes', 'trigger', 'scheduled',
+                               'enqueued_at', CURRENT_TIMESTAMP))
+$$);
+
 -- Daily system health report: 7am UTC via pg_net → /admin/report
 DO $$ BEGIN
     IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_net') THEN
@@ -148,3 +148,135 @@ BEGIN
     RETURN QUERY SELECT v_used, v_limit, (v_used > v_limit);
 END;
 $$;
+
+
+-- ---------------------------------------------------------------------------
+-- user_storage — per-user storage counter (storage_bytes quota)
+-- ---------------------------------------------------------------------------
+
+-- Kept equal to SUM(size_bytes) / COUNT(*) over the user's live files by a
+-- row trigger on files, in the same transaction as the file change, so the
+-- quota check reads one row instead of aggregating the user's files.
+CREATE TABLE IF NOT EXISTS user_storage (
+    user_id         UUID PRIMARY KEY,
+    bytes_used      BIGINT NOT NULL DEFAULT 0,
+    file_count      BIGINT NOT NULL DEFAULT 0,
+    reconciled_at   TIMESTAMPTZ,             -- last drift correction
+    updated_at      TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Applies the row's old contribution (-) and new contribution (+). A file
+-- counts when it has a user_id and deleted_at IS NULL; NULL size counts 0.
+CREATE OR REPLACE FUNCTION user_storage_on_files() RETURNS TRIGGER AS $$
+DECLARE
+    v_old_user  UUID;
+    v_old_bytes BIGINT := 0;
+    v_old_count INT := 0;
+    v_new_user  UUID;
+    v_new_bytes BIGINT := 0;
+    v_new_count INT := 0;
+BEGIN
+    IF TG_OP <> 'INSERT' AND OLD.deleted_at IS NULL THEN
+        v_old_user := OLD.user_id;
+        v_old_bytes := COALESCE(OLD.size_bytes, 0);
+        v_old_count := 1;
+    END IF;
+    IF TG_OP <> 'DELETE' AND NEW.deleted_at IS NULL THEN
+        v_new_user := NEW.user_id;
+        v_new_bytes := COALESCE(NEW.size_bytes, 0);
+        v_new_count := 1;
+    END IF;
+
+    -- Upserts that rewrite the same values are the common case: no-op
+    IF v_old_user IS NOT DISTINCT FROM v_new_user
+       AND v_old_bytes = v_new_bytes AND v_old_count = v_new_count THEN
+        RETURN NULL;
+    END IF;
+
+    IF v_old_user IS NOT NULL THEN
+        INSERT INTO user_storage AS s (user_id, bytes_used, file_count)
+        VALUES (v_old_user, -v_old_bytes, -v_old_count)
+        ON CONFLICT (user_id) DO UPDATE
+            SET bytes_used = s.bytes_used + EXCLUDED.bytes_used,
+                file_count = s.file_count + EXCLUDED.file_count,
+                updated_at = CURRENT_TIMESTAMP;
+    END IF;
+    IF v_new_user IS NOT NULL THEN
+        INSERT INTO user_storage AS s (user_id, bytes_used, file_count)
+        VALUES (v_new_user, v_new_bytes, v_new_count)
+        ON CONFLICT (user_id) DO UPDATE
+            SET bytes_used = s.bytes_used + EXCLUDED.bytes_used,
+                file_count = s.file_count + EXCLUDED.file_count,
+                updated_at = CURRENT_TIMESTAMP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_files_user_storage ON files;
+CREATE TRIGGER trg_files_user_storage
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, size_bytes, deleted_at ON files
+    FOR EACH ROW EXECUTE FUNCTION user_storage_on_files();
+
+-- reconcile_user_storage() — find and fix counter drift (pg_cron, nightly).
+-- Drift can only come from paths that bypass row triggers (TRUNCATE,
+-- session_replication_role = replica restores, manual fixes). Candidates
+-- are found with one aggregate pass; each is then corrected under its
+-- counter row lock with a fresh count, so concurrent uploads are neither
+-- lost nor double-counted. Returns the number of users corrected.
+CREATE OR REPLACE FUNCTION reconcile_user_storage() RETURNS INT AS $$
+DECLARE
+    v_user_id UUID;
+    v_bytes   BIGINT;
+    v_count   BIGINT;
+    v_fixed   INT := 0;
+BEGIN
+    FOR v_user_id IN
+        SELECT COALESCE(a.user_id, s.user_id)
+        FROM (
+            SELECT f.user_id, SUM(COALESCE(f.size_bytes, 0)) AS bytes_used, COUNT(*) AS file_count
+            FROM files f
+            WHERE f.deleted_at IS NULL AND f.user_id IS NOT NULL
+            GROUP BY f.user_id
+        ) a
+        FULL JOIN user_storage s ON s.user_id = a.user_id
+        WHERE (COALESCE(a.bytes_used, 0), COALESCE(a.file_count, 0))
+              IS DISTINCT FROM (COALESCE(s.bytes_used, 0), COALESCE(s.file_count, 0))
+    LOOP
+        INSERT INTO user_storage (user_id) VALUES (v_user_id) ON CONFLICT DO NOTHING;
+        PERFORM 1 FROM user_storage WHERE user_id = v_user_id FOR UPDATE;
+
+        SELECT COALESCE(SUM(COALESCE(f.size_bytes, 0)), 0), COUNT(*)
+        INTO v_bytes, v_count
+        FROM files f
+        WHERE f.user_id = v_user_id AND f.deleted_at IS NULL;
+
+        UPDATE user_storage
+        SET bytes_used = v_bytes, file_count = v_count,
+            reconciled_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = v_user_id
+          AND (bytes_used, file_count) IS DISTINCT FROM (v_bytes, v_count);
+        IF FOUND THEN
+            v_fixed := v_fixed + 1;
+            RAISE WARNING 'user_storage drift corrected for user %: % bytes / % files',
+                v_user_id, v_bytes, v_count;
+        END IF;
+    END LOOP;
+    RETURN v_fixed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill on first install. No-op once populated.
+DO $$ BEGIN
+    IF NOT EXISTS (SELECT 1 FROM user_storage) THEN
+        INSERT INTO user_storage (user_id, bytes_used, file_count)
+        SELECT f.user_id, SUM(COALESCE(f.size_bytes, 0)), COUNT(*)
+        FROM files f
+        WHERE f.deleted_at IS NULL AND f.user_id IS NOT NULL
+        GROUP BY f.user_id
+        ON CONFLICT (user_id) DO NOTHING;
+    END IF;
+END $$;
+
+-- Nightly drift check (pg_cron upserts the job by name)
+SELECT cron.schedule('user-storage-reconcile', '20 3 * * *', 'SELECT reconcile_user_storage()');
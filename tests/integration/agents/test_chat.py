@@ -656,6 +656,61 @@ async def test_extract_tool_calls_empty():
     assert AgentAdapter._extract_tool_calls([]) == []
 
 
+async def test_persist_turn_with_tool_calls_is_one_round_trip(db, encryption):
+    """Tool-heavy turns are stored by a single rem_persist_turn call, in order."""
+    from unittest.mock import patch
+
+    from pydantic_ai.messages import (
+        ModelRequest,
+        ModelResponse,
+        TextPart,
+        ToolCallPart,
+        ToolReturnPart,
+        UserPromptPart,
+    )
+
+    from p8.agentic.adapter import AgentAdapter
+    from p8.ontology.types import Schema
+    from p8.services.repository import Repository
+
+    await Repository(Schema, db, encryption).upsert(Schema(
+        name="persist-tools-agent", kind="agent", content="You use tools.",
+    ))
+    adapter = await AgentAdapter.from_schema_name("persist-tools-agent", db, encryption)
+
+    all_messages = [ModelRequest(parts=[UserPromptPart(content="look things up")])]
+    for i in range(3):
+        all_messages.append(ModelResponse(parts=[
+            ToolCallPart(tool_name="search", args={"q": f"q{i}"}, tool_call_id=f"tc-{i}"),
+        ]))
+        all_messages.append(ModelRequest(parts=[ToolReturnPart(
+            tool_name="search", content=f"result {i}", tool_call_id=f"tc-{i}",
+        )]))
+    all_messages.append(ModelResponse(parts=[TextPart(content="done")]))
+
+    session_id = uuid4()
+    await db.execute("INSERT INTO sessions (id, name) VALUES ($1, $2)", session_id, "persist-tools")
+    with patch.object(adapter.memory, "persist_message") as per_row:
+        await adapter.persist_turn(
+            session_id, "look things up", "done",
+            all_messages=all_messages, background_compaction=False,
+        )
+    per_row.assert_not_called()
+
+    rows = await db.fetch(
+        "SELECT message_type, content, tool_calls FROM messages"
+        " WHERE session_id = $1 ORDER BY created_at",
+        session_id,
+    )
+    assert [r["message_type"] for r in rows] == (
+        ["user"] + ["tool_call", "tool_response"] * 3 + ["assistant"]
+    )
+    assert [r["content"] for r in rows[2:7:2]] == ["result 0", "result 1", "result 2"]
+    assert rows[1]["tool_calls"]["arguments"] == {"q": "q0"}
+    total = await db.fetchval("SELECT total_tokens FROM sessions WHERE id = $1", session_id)
+    assert total > 0
+
+
 # ---------------------------------------------------------------------------
 # Streaming formatters
 # ---------------------------------------------------------------------------
@@ -726,8 +781,7 @@ def test_format_child_event_skips_done():
 
 async def test_merged_event_stream_no_child_events():
     """_merged_event_stream passes through parent events when no child events."""
-    import asyncio
-
+    from p8.agentic.delegate import EventChannel
     from p8.api.routers.chat import _merged_event_stream
 
     async def mock_parent_stream():
@@ -735,7 +789,7 @@ async def test_merged_event_stream_no_child_events():
         yield "event-2"
         yield "event-3"
 
-    child_sink: asyncio.Queue = asyncio.Queue()
+    child_sink = EventChannel()
     events = []
     async for event in _merged_event_stream(mock_parent_stream(), child_sink):
         events.append(event)
@@ -747,32 +801,55 @@ async def test_merged_event_stream_interleaves_child_events():
     """_merged_event_stream yields child events alongside parent events."""
     import asyncio
 
-    from ag_ui.core.events import CustomEvent
-
+    from p8.agentic.delegate import EventChannel
     from p8.api.routers.chat import _merged_event_stream
 
-    child_sink: asyncio.Queue = asyncio.Queue()
+    child_sink = EventChannel()
 
     async def mock_parent_stream():
         yield "parent-1"
         # Simulate child events arriving during tool execution
         await child_sink.put({"type": "child_content", "agent_name": "child", "content": "hello"})
-        await asyncio.sleep(0.1)  # Give multiplexer time to pick up child event
+        await asyncio.sleep(0)
         yield "parent-2"
 
     events = []
     async for event in _merged_event_stream(mock_parent_stream(), child_sink):
         events.append(event)
 
-    # Should have parent events + at least one child CustomEvent
-    parent_events = [e for e in events if isinstance(e, str)]
-    child_events = [e for e in events if isinstance(e, CustomEvent)]
+    # Child event arrives between the two parent events, in order
+    assert [e if isinstance(e, str) else e.name for e in events] == [
+        "parent-1", "child_content", "parent-2",
+    ]
+    assert events[1].value["agent_name"] == "child"
+
+
+async def test_merged_event_stream_backpressure_and_errors():
+    """A full channel blocks producers; parent exceptions reach the consumer."""
+    import asyncio
+
+    from p8.agentic.delegate import EventChannel
+
+    channel = EventChannel(maxsize=1)
+    produced: list[int] = []
+
+    async def parent():
+        for i in range(3):
+            produced.append(i)
+            yield i
+        raise RuntimeError("parent failed")
+
+    merged = channel.merge(parent(), lambda e: e)
+    assert await merged.__anext__() == 0
+    await asyncio.sleep(0)
+    # consumer holds at 0: pump has queued 1 and is blocked putting 2
+    assert produced == [0, 1, 2] and channel.qsize() == 1
 
-    assert len(parent_events) == 2
-    assert parent_events == ["parent-1", "parent-2"]
-    assert len(child_events) >= 1
-    assert child_events[0].name == "child_content"
-    assert child_events[0].value["agent_name"] == "child"
+    rest = []
+    with pytest.raises(RuntimeError, match="parent failed"):
+        async for e in merged:
+            rest.append(e)
+    assert rest == [1, 2]
 
 
 # ---------------------------------------------------------------------------
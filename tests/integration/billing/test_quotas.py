@@ -198,7 +198,7 @@ async def test_check_quota_exceeded(db):
 
 @pytest.mark.asyncio
 async def test_check_quota_storage_bytes(db):
-    """storage_bytes quota computed from files table."""
+    """storage_bytes quota read from the user_storage counter (files trigger)."""
     uid = uuid4()
     # Insert two files
     for i in range(2):
@@ -239,6 +239,25 @@ async def test_check_quota_storage_ignores_deleted(db):
     assert status.exceeded is False
 
 
+@pytest.mark.asyncio
+async def test_storage_counter_tracks_soft_delete_and_reconciles(db):
+    """Soft-delete/restore adjust user_storage; reconcile fixes drift."""
+    uid, fid = uuid4(), uuid4()
+    await db.execute(
+        "INSERT INTO files (id, name, size_bytes, user_id) VALUES ($1, $2, $3, $4)",
+        fid, "doc.pdf", 3 * MB, uid,
+    )
+    await db.execute("UPDATE files SET deleted_at = CURRENT_TIMESTAMP WHERE id = $1", fid)
+    assert (await check_quota(db, uid, "storage_bytes", "free")).used == 0
+    await db.execute("UPDATE files SET deleted_at = NULL, size_bytes = $2 WHERE id = $1", fid, 4 * MB)
+    assert (await check_quota(db, uid, "storage_bytes", "free")).used == 4 * MB
+
+    await db.execute("UPDATE user_storage SET bytes_used = 1 WHERE user_id = $1", uid)
+    assert await db.fetchval("SELECT reconcile_user_storage()") >= 1
+    row = await db.fetchrow("SELECT bytes_used, file_count FROM user_storage WHERE user_id = $1", uid)
+    assert (row["bytes_used"], row["file_count"]) == (4 * MB, 1)
+
+
 # ── 6. Monthly period isolation ──────────────────────────────────────────
 
 @pytest.mark.asyncio
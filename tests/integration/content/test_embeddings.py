@@ -422,6 +422,25 @@ class TestBatchEdgeCases:
         )
         assert emb2["content_hash"] == original_hash
 
+    async def test_owner_columns_denormalized(self, db, embedding_worker):
+        """Embeddings carry the entity's tenant_id/user_id, and follow changes."""
+        eid = det_id("owner-denorm-resource")
+        await db.execute(
+            """INSERT INTO resources (id, name, content, tenant_id) VALUES ($1, $2, $3, $4)
+               ON CONFLICT (id) DO UPDATE SET content = EXCLUDED.content,
+                                              tenant_id = EXCLUDED.tenant_id""",
+            eid, "owner-denorm-resource", "Tenant scoped text", "tenant-a",
+        )
+        emb = await wait_for_embedding(db, "embeddings_resources", eid)
+        assert emb is not None
+        assert emb["tenant_id"] == "tenant-a"
+
+        await db.execute("UPDATE resources SET tenant_id = 'tenant-b' WHERE id = $1", eid)
+        moved = await db.fetchval(
+            "SELECT tenant_id FROM embeddings_resources WHERE entity_id = $1", eid,
+        )
+        assert moved == "tenant-b"
+
     async def test_no_requeue_on_unrelated_field_change(self, db):
         """Updating a non-embedded field does NOT re-queue."""
         eid = det_id("no-requeue-schema")
@@ -434,6 +453,58 @@ class TestBatchEdgeCases:
         await db.execute("UPDATE schemas SET kind='agent' WHERE id=$1", eid)
         assert await db.fetchrow("SELECT 1 FROM embedding_queue WHERE entity_id=$1", eid) is None
 
+    async def test_bulk_batch_across_tables_and_sub_batches(self, db, encryption, settings):
+        """One claimed batch spanning two tables, split into overlapping provider calls."""
+        await db.execute("DELETE FROM embedding_queue")
+        schema_ids = [det_id(f"bulk-schema-{i}") for i in range(5)]
+        ontology_ids = [det_id(f"bulk-ontology-{i}") for i in range(3)]
+        for i, eid in enumerate(schema_ids):
+            await db.execute(
+                """INSERT INTO schemas (id, name, kind, description) VALUES ($1, $2, $3, $4)
+                   ON CONFLICT (id) DO UPDATE SET description = EXCLUDED.description""",
+                eid, f"bulk-schema-{i}", "model", f"Bulk schema description {i}",
+            )
+        for i, eid in enumerate(ontology_ids):
+            await db.execute(
+                """INSERT INTO ontologies (id, name, content) VALUES ($1, $2, $3)
+                   ON CONFLICT (id) DO UPDATE SET content = EXCLUDED.content""",
+                eid, f"bulk-ontology-{i}", f"Bulk ontology content {i}",
+            )
+        await db.execute("DELETE FROM embeddings_schemas WHERE entity_id = ANY($1)", schema_ids)
+        await db.execute("DELETE FROM embeddings_ontologies WHERE entity_id = ANY($1)", ontology_ids)
+
+        service = EmbeddingService(
+            db, LocalEmbeddingProvider(dimensions=settings.embedding_dimensions), encryption,
+            batch_size=50, sub_batch_size=3, max_concurrency=2,
+        )
+        result = await service.process_batch()
+        assert result["processed"] >= 8
+        assert result["failed"] == 0
+
+        n_schemas = await db.fetchval(
+            "SELECT COUNT(*) FROM embeddings_schemas WHERE entity_id = ANY($1)", schema_ids,
+        )
+        n_ontologies = await db.fetchval(
+            "SELECT COUNT(*) FROM embeddings_ontologies WHERE entity_id = ANY($1)", ontology_ids,
+        )
+        assert (n_schemas, n_ontologies) == (5, 3)
+        remaining = await db.fetchval(
+            "SELECT COUNT(*) FROM embedding_queue WHERE entity_id = ANY($1)",
+            schema_ids + ontology_ids,
+        )
+        assert remaining == 0
+
+        # Same content re-queued → all skipped by the content-hash check
+        await db.execute(
+            """INSERT INTO embedding_queue (table_name, entity_id, field_name, status)
+               SELECT 'schemas', unnest($1::uuid[]), 'description', 'pending'
+               ON CONFLICT (table_name, entity_id, field_name) DO UPDATE SET status = 'pending'""",
+            schema_ids,
+        )
+        result = await service.process_batch()
+        assert result["processed"] == 0
+        assert result["skipped"] == 5
+
 
 # ---------------------------------------------------------------------------
 # Schema registration (kind='table') correctness
@@ -39,7 +39,7 @@ async def test_rem_functions(db):
         " WHERE routine_schema='public' AND routine_name LIKE 'rem_%'"
     )
     names = {r["routine_name"] for r in rows}
-    assert names >= {"rem_lookup", "rem_search", "rem_fuzzy", "rem_traverse", "rem_load_messages"}
+    assert names >= {"rem_lookup", "rem_lookup_many", "rem_search", "rem_fuzzy", "rem_traverse", "rem_load_messages"}
 
 
 @pytest.mark.asyncio
@@ -132,6 +132,21 @@ async def test_rem_lookup(db, clean_db):
     assert any(r["entity_type"] == "schemas" for r in results)
 
 
+@pytest.mark.asyncio
+async def test_rem_lookup_many(db, clean_db):
+    for name in ("lookup-many-a", "lookup-many-b"):
+        await db.execute(
+            "INSERT INTO schemas (id, name, kind) VALUES ($1, $2, $3)"
+            " ON CONFLICT (id) DO UPDATE SET kind = EXCLUDED.kind",
+            det_id("schemas", name), name, "agent",
+        )
+    results = await db.rem_lookup_many(["lookup-many-b", "no-such-key", "lookup-many-a"])
+    assert [r["key"] for r in results] == ["lookup-many-b", "no-such-key", "lookup-many-a"]
+    assert results[0]["data"]["name"] == "lookup-many-b"
+    assert results[1]["entity_type"] is None and results[1]["data"] is None
+    assert results[2]["entity_type"] == "schemas"
+
+
 @pytest.mark.asyncio
 async def test_rem_fuzzy(db, clean_db):
     sid = det_id("schemas", "data-analysis-agent")
@@ -166,6 +181,37 @@ async def test_rem_traverse(db, clean_db):
     assert "child-schema" in keys
 
 
+@pytest.mark.asyncio
+async def test_rem_traverse_dedupes_and_weights(db, clean_db):
+    # hub → strong (0.9) → leaf, hub → weak (0.1) → leaf: leaf is returned once
+    graph = {
+        "trav-hub": [
+            {"target": "trav-strong", "relation": "rel", "weight": 0.9},
+            {"target": "trav-weak", "relation": "rel", "weight": 0.1},
+        ],
+        "trav-strong": [{"target": "trav-leaf", "relation": "rel", "weight": 1.0}],
+        "trav-weak": [{"target": "trav-leaf", "relation": "rel", "weight": 1.0}],
+        "trav-leaf": [],
+    }
+    for name, edges in graph.items():
+        await db.execute(
+            "INSERT INTO schemas (id, name, kind, graph_edges) VALUES ($1, $2, $3, $4)"
+            " ON CONFLICT (id) DO UPDATE SET graph_edges = EXCLUDED.graph_edges",
+            det_id("schemas", name), name, "model", edges,
+        )
+
+    results = await db.rem_traverse("trav-hub", max_depth=2, weighted=True, load=True)
+    keys = [r["entity_key"] for r in results]
+    assert keys.count("trav-leaf") == 1
+    assert keys[:2] == ["trav-hub", "trav-strong"]
+    leaf = next(r for r in results if r["entity_key"] == "trav-leaf")
+    assert leaf["path"] == ["trav-hub", "trav-strong", "trav-leaf"]
+    assert leaf["entity_record"]["name"] == "trav-leaf"
+
+    capped = await db.rem_traverse("trav-hub", max_depth=1, max_fanout=1)
+    assert [r["entity_key"] for r in capped] == ["trav-hub", "trav-strong"]
+
+
 @pytest.mark.asyncio
 async def test_rem_load_messages(db, clean_db):
     session_id = det_id("sessions", "db-load-msg-session")
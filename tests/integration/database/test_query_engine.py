@@ -119,6 +119,29 @@ class TestRemQueryParserTraverse:
         q = self.parser.parse('TRAVERSE "overview"')
         assert "load" not in q.params
 
+    def test_fanout_and_weighted(self):
+        q = self.parser.parse('TRAVERSE "overview" DEPTH 3 FANOUT 5 WEIGHTED')
+        assert q.params["max_fanout"] == 5
+        assert q.params["weighted"] is True
+
+
+class TestRemQueryParserHybrid:
+    def setup_method(self):
+        self.parser = RemQueryParser()
+
+    def test_clauses(self):
+        q = self.parser.parse(
+            'HYBRID "atlas roadmap" FROM resources LIMIT 5 TEXT_WEIGHT 2 threshold=0.2'
+        )
+        assert q.mode == "HYBRID"
+        assert q.params == {
+            "query_text": "atlas roadmap",
+            "table": "resources",
+            "limit": 5,
+            "text_weight": 2.0,
+            "threshold": 0.2,
+        }
+
 
 class TestRemQueryParserSQL:
     def setup_method(self):
@@ -153,8 +176,10 @@ class TestRemQueryEngineDispatch:
     def mock_db(self):
         db = MagicMock()
         db.rem_lookup = AsyncMock(return_value=[{"entity_type": "user", "data": {}}])
+        db.rem_lookup_many = AsyncMock(return_value=[])
         db.rem_fuzzy = AsyncMock(return_value=[{"entity_type": "user", "data": {}}])
         db.rem_search = AsyncMock(return_value=[{"entity_type": "schema", "data": {}}])
+        db.rem_hybrid = AsyncMock(return_value=[{"entity_type": "resources", "data": {}}])
         db.rem_traverse = AsyncMock(return_value=[{"entity_type": "user", "data": {}}])
         db.fetch = AsyncMock(return_value=[])
         return db
@@ -200,12 +225,27 @@ class TestRemQueryEngineDispatch:
         await engine.execute('SEARCH "database" FROM schemas')
         mock_db.rem_search.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_hybrid_dispatch(self, mock_db, mock_provider):
+        mock_provider.provider_name = "local"
+        settings = Settings()
+        engine = RemQueryEngine(mock_db, settings, _embedding_provider=mock_provider)
+        await engine.execute('HYBRID "database" FROM resources VECTOR_WEIGHT 0.5')
+        mock_provider.embed.assert_called_once_with(["database"])
+        args, kwargs = mock_db.rem_hybrid.call_args
+        assert args[1:] == ("database", "resources")
+        assert kwargs["vector_weight"] == 0.5
+        assert kwargs["text_weight"] == settings.hybrid_text_weight
+        assert kwargs["rrf_k"] == settings.hybrid_rrf_k
+        assert kwargs["provider"] == "local"
+
     @pytest.mark.asyncio
     async def test_traverse_dispatch(self, mock_db):
         engine = RemQueryEngine(mock_db, Settings())
         await engine.execute('TRAVERSE "sarah-chen" DEPTH 2 TYPE member')
         mock_db.rem_traverse.assert_called_once_with(
-            "sarah-chen", tenant_id=None, user_id=None, max_depth=2, rel_type="member", load=False
+            "sarah-chen", tenant_id=None, user_id=None, max_depth=2, rel_type="member",
+            load=False, max_fanout=None, weighted=False,
         )
 
     @pytest.mark.asyncio
@@ -227,7 +267,10 @@ class TestRemQueryEngineDispatch:
     async def test_multi_key_lookup(self, mock_db):
         engine = RemQueryEngine(mock_db, Settings())
         await engine.execute('LOOKUP "a", "b"')
-        assert mock_db.rem_lookup.call_count == 2
+        mock_db.rem_lookup.assert_not_called()
+        mock_db.rem_lookup_many.assert_called_once_with(
+            ["a", "b"], tenant_id=None, user_id=None
+        )
 
 
 # ============================================================================
@@ -388,6 +431,22 @@ class TestQueryEngineIntegration:
         # Fuzzy should find it via trigram matching on kv_store
         assert isinstance(results, list)
 
+    async def test_hybrid_roundtrip(self, db):
+        """No embeddings yet — HYBRID still ranks the trigram match."""
+        from tests.conftest import det_id
+        sid = det_id("schemas", "hybrid-target-entity")
+        await db.execute(
+            "INSERT INTO schemas (id, name, kind, description, content, json_schema)"
+            " VALUES ($1, 'hybrid-target-entity', 'model',"
+            " 'A hybrid test', 'hybrid content', '{}'::jsonb)"
+            " ON CONFLICT (id) DO UPDATE SET description = EXCLUDED.description",
+            sid,
+        )
+        results = await db.rem_query('HYBRID "hybrid target entity" FROM schemas LIMIT 5')
+        hit = next(r for r in results if r["data"]["name"] == "hybrid-target-entity")
+        assert hit["text_rank"] is not None
+        assert hit["similarity_score"] > 0
+
     async def test_sql_roundtrip(self, db):
         """SQL mode executes raw queries."""
         results = await db.rem_query("SQL SELECT name FROM schemas LIMIT 5")
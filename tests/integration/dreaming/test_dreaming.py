@@ -122,3 +122,69 @@ async def test_handler_skips_no_user(db, encryption):
     result = await handler.handle({}, ctx)
 
     assert result["status"] == "skipped_no_user"
+
+
+async def _dreaming_tasks(db, user_id: UUID, status: str) -> list:
+    return await db.fetch(
+        "SELECT id FROM task_queue WHERE task_type = 'dreaming' AND user_id = $1 AND status = $2",
+        user_id, status,
+    )
+
+
+async def test_failed_dreaming_run_is_enqueued_again(db):
+    """A failed dreaming task leaves the watermark alone; only completion advances it."""
+    uid, sid = uuid4(), uuid4()
+    await db.execute("INSERT INTO users (id, name, tenant_id) VALUES ($1, $2, $3)", uid, "Dreamer", "t1")
+    await db.execute("INSERT INTO sessions (id, name, user_id) VALUES ($1, $2, $3)", sid, "chat", uid)
+    await db.execute(
+        "INSERT INTO messages (session_id, message_type, content, user_id) VALUES ($1, 'user', 'hi', $2)",
+        sid, uid,
+    )
+
+    await db.fetchval("SELECT enqueue_dreaming_tasks()")
+    [task] = await _dreaming_tasks(db, uid, "pending")
+    await db.execute("UPDATE task_queue SET max_retries = 0 WHERE id = $1", task["id"])
+    await db.execute("SELECT fail_task($1, 'llm timeout')", task["id"])
+    assert await db.fetchval("SELECT last_dreaming_at FROM user_activity WHERE user_id = $1", uid) is None
+
+    # Next tick retries the user
+    await db.fetchval("SELECT enqueue_dreaming_tasks()")
+    [retry] = await _dreaming_tasks(db, uid, "pending")
+    await db.execute("SELECT complete_task($1)", retry["id"])
+    assert await db.fetchval(
+        "SELECT a.last_dreaming_at = t.created_at FROM user_activity a, task_queue t"
+        " WHERE a.user_id = $1 AND t.id = $2",
+        uid, retry["id"],
+    )
+
+    # Completed and no new activity → nothing more to enqueue
+    await db.fetchval("SELECT enqueue_dreaming_tasks()")
+    assert await _dreaming_tasks(db, uid, "pending") == []
+
+
+async def test_message_during_running_dreaming_task_is_not_throttled(db):
+    """Activity after an in-flight task was created stays visible once it completes."""
+    uid, sid = uuid4(), uuid4()
+    await db.execute("INSERT INTO users (id, name, tenant_id) VALUES ($1, $2, $3)", uid, "Night owl", "t1")
+    await db.execute("INSERT INTO sessions (id, name, user_id) VALUES ($1, $2, $3)", sid, "chat", uid)
+
+    async def _message(seconds_ago: int) -> None:
+        await db.execute(
+            "INSERT INTO messages (session_id, message_type, content, user_id, created_at)"
+            " VALUES ($1, 'user', 'hi', $2, CURRENT_TIMESTAMP - make_interval(secs => $3))",
+            sid, uid, seconds_ago,
+        )
+
+    await _message(30)
+    task_id = await db.fetchval(
+        "INSERT INTO task_queue (task_type, tier, user_id, status, created_at)"
+        " VALUES ('dreaming', 'small', $1, 'processing', CURRENT_TIMESTAMP - INTERVAL '20 seconds')"
+        " RETURNING id",
+        uid,
+    )
+    await _message(10)  # within a minute of the stored watermark, but after the task
+    await db.execute("SELECT complete_task($1)", task_id)
+
+    assert await db.fetchval(
+        "SELECT last_message_at > last_dreaming_at FROM user_activity WHERE user_id = $1", uid,
+    )
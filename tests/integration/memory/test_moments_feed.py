@@ -294,3 +294,26 @@ async def test_feed_moment_has_session_id(db, encryption):
 
     for m in moments:
         assert m["session_id"] is not None
+
+
+async def test_daily_activity_rollup_matches_rebuild(db, encryption):
+    """Trigger-maintained user_daily_activity equals a full rebuild after moves and soft deletes."""
+    await _load_seed(db, encryption, user_id=USER_ID)
+    await db.execute(
+        "UPDATE messages SET deleted_at = CURRENT_TIMESTAMP"
+        " WHERE id = (SELECT id FROM messages WHERE user_id = $1 AND deleted_at IS NULL LIMIT 1)",
+        USER_ID,
+    )
+
+    query = (
+        "SELECT activity_date, message_count, total_tokens, moment_count, reminder_count,"
+        "       resource_count, resource_counts"
+        " FROM user_daily_activity"
+        " WHERE user_id = $1 AND (message_count > 0 OR moment_count > 0 OR resource_count > 0)"
+        " ORDER BY activity_date"
+    )
+    live = [dict(r) for r in await db.fetch(query, USER_ID)]
+    await db.execute("SELECT rebuild_user_daily_activity()")
+    rebuilt = [dict(r) for r in await db.fetch(query, USER_ID)]
+
+    assert live and live == rebuilt
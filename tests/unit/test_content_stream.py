@@ -0,0 +1,171 @@
+"""Unit tests for the streaming ingest path (ContentService.ingest_stream + FileProcessingHandler)."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from p8.ontology.types import File, Resource
+from p8.services import content
+from p8.services.content import ContentService
+from p8.workers.handlers.file_processing import FileProcessingHandler
+
+
+def _service(**settings):
+    cfg = SimpleNamespace(**{
+        "content_chunk_max_chars": 100, "content_chunk_overlap": 0,
+        "content_stream_batch_size": 4, "content_stream_preview_chars": 25, **settings,
+    })
+    return ContentService(db=MagicMock(), encryption=MagicMock(), file_service=MagicMock(), settings=cfg)
+
+
+async def test_subprocess_yields_ndjson_chunks(tmp_path):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("\n\n".join(f"Paragraph {i} " + "word " * 30 for i in range(20)))
+
+    chunks = [c async for c in _service()._stream_document_chunks(doc, "text/plain", 200, 0)]
+
+    assert len(chunks) > 1
+    assert all(0 < len(c) <= 200 for c in chunks)
+    assert "Paragraph 19" in chunks[-1]
+
+
+async def test_subprocess_failure_raises(tmp_path):
+    with pytest.raises(RuntimeError, match="Document extraction failed"):
+        async for _ in _service()._stream_document_chunks(tmp_path / "missing.pdf", "application/pdf", 200, 0):
+            pass
+
+
+class _FakeRepo:
+    """Minimal in-memory Repository: records every upsert batch."""
+
+    def __init__(self, *stored: File):
+        self.rows = {f.id: f for f in stored}
+        self.batches: list[list] = []
+
+    async def get(self, entity_id, **_):
+        row = self.rows.get(entity_id)
+        return row.model_copy() if row else None
+
+    async def upsert(self, entities):
+        entities = entities if isinstance(entities, list) else [entities]
+        self.batches.append([e.model_copy() for e in entities])
+        for e in entities:
+            if isinstance(e, File):
+                self.rows[e.id] = e.model_copy()
+        return entities
+
+
+async def _ten_chunks(*args):
+    for i in range(10):
+        yield f"chunk {i} text"
+
+
+async def test_ingest_stream_persists_fixed_size_batches(tmp_path):
+    doc = tmp_path / "big.pdf"
+    doc.write_bytes(b"%PDF" * 10)
+    svc = _service()
+    stored = File(name="big", uri="s3://b/k", mime_type="application/pdf")
+    repo = _FakeRepo(stored)
+
+    with patch.object(svc, "_stream_document_chunks", _ten_chunks), \
+            patch.object(content, "Repository", return_value=repo):
+        result = await svc.ingest_stream(
+            doc, "big", mime_type="application/pdf", uri="s3://b/k", file_id=stored.id, create_moment=False,
+        )
+
+    files = [b[0] for b in repo.batches if isinstance(b[0], File)]
+    chunk_batches = [b for b in repo.batches if isinstance(b[0], Resource)]
+    assert [len(b) for b in chunk_batches] == [4, 4, 2]
+    assert [r.ordinal for b in chunk_batches for r in b] == list(range(10))
+    assert all(r.metadata["file_id"] == str(stored.id) for b in chunk_batches for r in b)
+    assert [f.id for f in files] == [stored.id, stored.id]
+    assert files[0].parsed_content is None and files[0].size_bytes == 40
+    assert files[-1].parsed_content == "chunk 0 textchunk 1 textchunk 2 text"[:25]
+    assert (result.chunk_count, len(result.resources)) == (10, 4)
+    assert result.total_chars == sum(len(f"chunk {i} text") for i in range(10))
+
+
+async def test_ingest_stream_keeps_existing_file_fields(tmp_path):
+    doc = tmp_path / "sync.pdf"
+    doc.write_bytes(b"%PDF" * 10)
+    created = datetime(2024, 1, 2, tzinfo=UTC)
+    stored = File(
+        name="sync", uri="s3://b/sync.pdf", tags=["google-drive-sync", "work"],
+        created_at=created, processing_status="processing", user_id=uuid4(),
+    )
+    repo = _FakeRepo(stored)
+
+    with patch.object(content, "Repository", return_value=repo):
+        for _ in range(2):  # re-ingesting the same file changes nothing else
+            svc = _service()
+            with patch.object(svc, "_stream_document_chunks", _ten_chunks):
+                await svc.ingest_stream(doc, "sync", uri=stored.uri, file_id=stored.id, create_moment=False)
+
+    row = repo.rows[stored.id]
+    assert row.tags == ["google-drive-sync", "work"]
+    assert (row.created_at, row.processing_status, row.user_id) == (created, "processing", stored.user_id)
+    assert (row.size_bytes, row.parsed_content) == (40, "chunk 0 textchunk 1 textchunk 2 text"[:25])
+
+
+async def test_ingest_stream_closes_extractor_on_persist_failure(tmp_path):
+    doc = tmp_path / "big.pdf"
+    doc.write_bytes(b"%PDF")
+    svc = _service()
+    stored = File(name="big", uri="s3://b/k")
+    repo = _FakeRepo(stored)
+    closed = []
+
+    async def _chunks(*args):
+        try:
+            for i in range(10):
+                yield f"chunk {i}"
+        finally:
+            closed.append(True)
+
+    async def _fail(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    with patch.object(svc, "_stream_document_chunks", _chunks), \
+            patch.object(svc, "_persist_chunks", _fail), \
+            patch.object(content, "Repository", return_value=repo), \
+            pytest.raises(RuntimeError, match="db down"):
+        await svc.ingest_stream(doc, "big", file_id=stored.id, create_moment=False)
+
+    assert closed == [True]
+
+
+async def test_handler_streams_large_documents_to_disk():
+    file_id = uuid4()
+
+    async def _download(uri, fileobj):
+        fileobj.write(b"x" * 2048)
+        return 2048
+
+    ctx = SimpleNamespace(
+        db=MagicMock(execute=AsyncMock()),
+        file_service=MagicMock(download_to=AsyncMock(side_effect=_download)),
+        content_service=MagicMock(
+            ingest=AsyncMock(),
+            ingest_stream=AsyncMock(return_value=SimpleNamespace(
+                chunk_count=3, total_chars=30, file=SimpleNamespace(id=file_id),
+            )),
+        ),
+        settings=SimpleNamespace(content_stream_threshold_bytes=1024),
+    )
+    task = {"payload": {"file_id": str(file_id), "uri": "s3://b/k", "name": "report",
+                        "mime_type": "application/pdf", "size_bytes": 2048}}
+
+    result = await FileProcessingHandler().handle(task, ctx)
+
+    assert result["status"] == "ok" and result["chunks"] == 3
+    ctx.content_service.ingest.assert_not_awaited()
+    kwargs = ctx.content_service.ingest_stream.await_args.kwargs
+    assert (kwargs["file_id"], kwargs["uri"]) == (file_id, "s3://b/k")
+    assert ctx.db.execute.await_args.args[:2] == (
+        "UPDATE files SET processing_status = $1, updated_at = CURRENT_TIMESTAMP WHERE id = $2", "completed",
+    )
@@ -0,0 +1,148 @@
+"""Unit tests for streamed uploads and ranged / conditional downloads on /content."""
+
+from __future__ import annotations
+
+import io
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from p8.api.routers import content as content_router
+from p8.ontology.types import File
+from p8.services.files import FileService
+
+DATA = bytes(range(256)) * 40  # 10 KiB
+
+
+def _settings(**extra):
+    return SimpleNamespace(
+        s3_bucket="bucket", s3_region="", s3_endpoint_url="", s3_access_key_id="",
+        s3_multipart_chunk_bytes=8 * 1024 * 1024, s3_transfer_concurrency=2,
+        file_processing_threshold_bytes=1024, **extra,
+    )
+
+
+@pytest.fixture
+def stored(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(DATA)
+    return File(id=uuid4(), name="clip", uri=str(path), mime_type="video/mp4")
+
+
+@pytest.fixture
+def client(stored):
+    app = FastAPI()
+    app.include_router(content_router.router, prefix="/content")
+    app.state.settings = _settings()
+    app.state.db = MagicMock()
+    app.state.encryption = MagicMock()
+    app.state.file_service = FileService(app.state.settings)
+    app.state.content_service = MagicMock(ingest=AsyncMock())
+    app.state.queue_service = MagicMock(enqueue_file=AsyncMock(return_value=uuid4()))
+    repo = MagicMock(get=AsyncMock(return_value=stored))
+    with patch.object(content_router, "Repository", return_value=repo), TestClient(app) as c:
+        c.app = app
+        yield c
+
+
+def test_download_streams_full_file_with_validators(client, stored):
+    resp = client.get(f"/content/files/{stored.id}")
+
+    assert resp.status_code == 200
+    assert resp.content == DATA
+    assert resp.headers["content-length"] == str(len(DATA))
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert resp.headers["etag"].startswith('"')
+    assert resp.headers["content-type"] == "video/mp4"
+
+
+@pytest.mark.parametrize(("header", "start", "end"), [
+    ("bytes=100-199", 100, 199),
+    ("bytes=10000-", 10000, len(DATA) - 1),
+    ("bytes=-300", len(DATA) - 300, len(DATA) - 1),
+    ("bytes=10200-99999", 10200, len(DATA) - 1),
+])
+def test_download_serves_ranges(client, stored, header, start, end):
+    resp = client.get(f"/content/files/{stored.id}", headers={"Range": header})
+
+    assert resp.status_code == 206
+    assert resp.content == DATA[start:end + 1]
+    assert resp.headers["content-range"] == f"bytes {start}-{end}/{len(DATA)}"
+    assert resp.headers["content-length"] == str(end - start + 1)
+
+
+def test_download_unsatisfiable_and_ignored_ranges(client, stored):
+    url = f"/content/files/{stored.id}"
+    resp = client.get(url, headers={"Range": f"bytes={len(DATA)}-"})
+    assert resp.status_code == 416
+    assert resp.headers["content-range"] == f"bytes */{len(DATA)}"
+
+    # Malformed and multi-range requests fall back to the whole body
+    for header in ("bytes=abc", "bytes=0-1,5-6", "items=0-1"):
+        assert client.get(url, headers={"Range": header}).status_code == 200
+
+
+def test_download_conditional_requests(client, stored):
+    url = f"/content/files/{stored.id}"
+    first = client.get(url)
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    # If-Range: matching validator honours the range, stale one sends everything
+    ranged = client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert (ranged.status_code, ranged.content) == (206, DATA[:10])
+    stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert (stale.status_code, len(stale.content)) == (200, len(DATA))
+
+
+def test_large_upload_streams_spool_file_to_s3(client):
+    uploaded = {}
+
+    async def _write_fileobj(key, fileobj, bucket=None):
+        uploaded["key"], uploaded["body"] = key, fileobj.read()
+        return f"s3://bucket/{key}"
+
+    fs = client.app.state.file_service
+    saved = []
+
+    async def _upsert(entity):
+        saved.append(entity)
+        return [entity]
+
+    with patch.object(fs, "write_fileobj_to_bucket", side_effect=_write_fileobj), \
+            patch.object(fs, "write_to_bucket", AsyncMock()) as write_bytes, \
+            patch.object(content_router, "Repository", return_value=MagicMock(upsert=_upsert)):
+        resp = client.post("/content/", files={"file": ("big.pdf", io.BytesIO(DATA), "application/pdf")})
+
+    assert resp.status_code == 201, resp.text
+    assert resp.json()["status"] == "queued"
+    assert uploaded == {"key": "big.pdf", "body": DATA}
+    write_bytes.assert_not_awaited()
+    client.app.state.content_service.ingest.assert_not_awaited()
+    assert saved[0].size_bytes == len(DATA)
+
+
+async def test_s3_ranged_get_and_missing_object():
+    fs = FileService(_settings())
+    body = MagicMock(read=MagicMock(side_effect=[b"abc", b"de", b""]))
+    fs._s3_client = MagicMock(
+        get_object=MagicMock(return_value={"Body": body}),
+        head_object=MagicMock(side_effect=ClientError({"Error": {"Code": "404"}}, "HeadObject")),
+    )
+
+    chunks = [c async for c in fs.iter_bytes("s3://b/k", 5, 9, etag='"e1"', chunk_size=3)]
+
+    assert chunks == [b"abc", b"de"]
+    fs._s3_client.get_object.assert_called_once_with(Bucket="b", Key="k", Range="bytes=5-9", IfMatch='"e1"')
+    body.close.assert_called_once()
+    with pytest.raises(FileNotFoundError):
+        await fs.stat("s3://b/missing")
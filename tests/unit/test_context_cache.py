@@ -0,0 +1,153 @@
+"""Unit tests for incremental MemoryService.load_context via SessionContextCache."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from p8.services.memory import MemoryService, SessionContextCache, _apply_budget
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _msg(i: int, tokens: int = 10) -> dict:
+    return {
+        "id": uuid4(), "message_type": "user" if i % 2 == 0 else "assistant",
+        "content": f"m{i}", "token_count": tokens, "tool_calls": None,
+        "created_at": T0 + timedelta(seconds=i),
+    }
+
+
+def _service(history: list[dict], cache: SessionContextCache):
+    db = MagicMock()
+    db.rem_load_messages = AsyncMock(side_effect=lambda *a, **k: list(history))
+    db.fetchval = AsyncMock(return_value=None)  # no moments
+
+    async def fetch(sql, *args):
+        if "FROM moments" in sql:
+            return []
+        known = set(args[3])
+        return [m for m in history if m["id"] not in known and m["created_at"] >= args[1] - timedelta(seconds=args[2])]
+
+    db.fetch = AsyncMock(side_effect=fetch)
+    encryption = MagicMock()
+    encryption.decrypted = 0
+
+    def _decrypt_rows(model, rows, tenant):
+        encryption.decrypted += len(rows)
+        return rows
+
+    encryption.decrypt_rows = MagicMock(side_effect=_decrypt_rows)
+    return MemoryService(db, encryption, context_cache=cache), db, encryption
+
+
+def test_apply_budget_matches_window_rule():
+    rows = [_msg(i, tokens=t) for i, t in enumerate([50, 30, 20, 10])]
+    assert [r["content"] for r in _apply_budget(rows, 35, None)] == ["m2", "m3"]
+    assert [r["content"] for r in _apply_budget(rows, None, 3)] == ["m1", "m2", "m3"]
+    assert _apply_budget(rows, 5, None) == []
+
+
+async def test_second_turn_fetches_and_decrypts_only_new_rows():
+    sid = uuid4()
+    history = [_msg(i) for i in range(4)]
+    cache = SessionContextCache()
+    memory, db, encryption = _service(history, cache)
+
+    first = await memory.load_context(sid)
+    assert [m["content"] for m in first] == ["m0", "m1", "m2", "m3"]
+    decrypted = encryption.decrypted
+
+    history += [_msg(4), _msg(5)]
+    second = await memory.load_context(sid)
+    assert [m["content"] for m in second] == ["m0", "m1", "m2", "m3", "m4", "m5"]
+    assert db.rem_load_messages.await_count == 1
+    assert encryption.decrypted == decrypted + 2
+    assert cache.stats() == {"sessions": 1, "hits": 1, "misses": 1}
+
+
+async def test_budget_trims_oldest_on_extend():
+    sid = uuid4()
+    history = [_msg(i) for i in range(3)]
+    memory, _, _ = _service(history, SessionContextCache())
+    await memory.load_context(sid, max_tokens=30)
+    history.append(_msg(3))
+    result = await memory.load_context(sid, max_tokens=30)
+    assert [m["content"] for m in result] == ["m1", "m2", "m3"]
+
+
+async def test_new_moment_forces_rebuild():
+    sid = uuid4()
+    history = [_msg(i) for i in range(2)]
+    memory, db, _ = _service(history, SessionContextCache())
+    await memory.load_context(sid)
+    db.fetchval.return_value = uuid4()  # another pod built a moment
+    await memory.load_context(sid)
+    assert db.rem_load_messages.await_count == 2
+
+
+async def test_build_moment_invalidates_and_idle_expiry(monkeypatch):
+    sid = uuid4()
+    cache = SessionContextCache(idle_ttl=60)
+    memory, db, _ = _service([_msg(0)], cache)
+    await memory.load_context(sid)
+
+    db.rem_build_moment = AsyncMock(return_value=None)
+    await memory.maybe_build_moment(sid)
+    assert cache.stats()["sessions"] == 1  # below threshold — nothing built
+
+    db.rem_build_moment = AsyncMock(return_value={"name": "chunk"})
+    monkeypatch.setattr(MemoryService, "_moment_from_row", staticmethod(lambda row: row))
+    await memory.maybe_build_moment(sid)
+    assert cache.stats()["sessions"] == 0
+
+    await memory.load_context(sid)
+
+    now = [1e9]
+    monkeypatch.setattr("p8.services.memory.time.monotonic", lambda: now[0])
+    cache.put(sid, (None, 8000, None, 3), cache._sessions[sid][(None, 8000, None, 3)])
+    now[0] += 61
+    assert cache.get(sid, (None, 8000, None, 3)) is None
+    assert cache.stats()["sessions"] == 0
+
+
+async def test_hits_refresh_idle_ttl(monkeypatch):
+    sid = uuid4()
+    now = [1e9]
+    monkeypatch.setattr("p8.services.memory.time.monotonic", lambda: now[0])
+    cache = SessionContextCache(idle_ttl=60)
+    memory, db, _ = _service([_msg(0)], cache)
+
+    await memory.load_context(sid)
+    for _ in range(3):
+        now[0] += 40  # past the TTL since put(), but never 60s idle
+        await memory.load_context(sid)
+    assert db.rem_load_messages.await_count == 1
+    assert cache.stats()["hits"] == 3
+
+    now[0] += 61
+    await memory.load_context(sid)
+    assert db.rem_load_messages.await_count == 2
+
+
+async def test_cache_hits_with_max_moments_zero():
+    sid = uuid4()
+    memory, db, _ = _service([_msg(0), _msg(1)], SessionContextCache())
+    db.fetchval.return_value = uuid4()  # session has a moment, none rendered
+    await memory.load_context(sid, max_moments=0)
+    await memory.load_context(sid, max_moments=0)
+    assert db.rem_load_messages.await_count == 1
+
+    db.fetchval.return_value = uuid4()
+    await memory.load_context(sid, max_moments=0)
+    assert db.rem_load_messages.await_count == 2
+
+
+def test_lru_by_session():
+    cache = SessionContextCache(max_sessions=2)
+    a, b, c = uuid4(), uuid4(), uuid4()
+    for sid in (a, b, c):
+        cache.put(sid, ("v",), MagicMock())
+    assert cache.get(a, ("v",)) is None
+    assert cache.get(c, ("v",)) is not None
@@ -0,0 +1,138 @@
+"""Unit tests for DEK resolution — single fetch, single-flight, refresh-ahead, bounded caches."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+
+from p8.services import encryption as enc_mod
+from p8.services.encryption import EncryptionService
+from p8.services.kms import KeyRecord, KMSProvider, VaultTransitKMS
+
+SYSTEM_DEK = b"s" * 32
+
+
+class FakeKMS(KMSProvider):
+    """In-memory tenant_keys; counts record fetches and unwraps."""
+
+    def __init__(self, records: dict[str, KeyRecord], delay: float = 0.0):
+        self.records = records
+        self.delay = delay
+        self.fetches = 0
+        self.unwraps = 0
+
+    async def get_key_record(self, tenant_id):
+        self.fetches += 1
+        await asyncio.sleep(self.delay)
+        return self.records.get(tenant_id)
+
+    async def unwrap_record(self, tenant_id, record):
+        self.unwraps += 1
+        return record.wrapped_dek
+
+    async def unwrap_dek(self, tenant_id):
+        record = await self.get_key_record(tenant_id)
+        return await self.unwrap_record(tenant_id, record) if record else None
+
+    wrap_and_store_dek = is_disabled = set_disabled = remove_key = AsyncMock()
+    get_mode = set_mode = store_sealed_key = get_sealed_public_key = AsyncMock()
+
+
+def _records(**extra: KeyRecord) -> dict[str, KeyRecord]:
+    return {"__system__": KeyRecord("active", "platform", SYSTEM_DEK, "local-file"), **extra}
+
+
+async def test_concurrent_misses_share_one_resolution():
+    kms = FakeKMS(_records(acme=KeyRecord("active", "client", b"a" * 32, "local-file")), delay=0.02)
+    enc = EncryptionService(kms)
+
+    deks = await asyncio.gather(*(enc.get_dek("acme") for _ in range(20)))
+
+    assert set(deks) == {b"a" * 32}
+    assert (kms.fetches, kms.unwraps) == (1, 1)
+    # Mode came from the same fetch
+    assert await enc.get_tenant_mode("acme") == "client"
+    assert kms.fetches == 1
+    assert not enc._inflight
+
+
+async def test_fallback_disabled_and_sealed_from_single_record():
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    pem = rsa.generate_private_key(public_exponent=65537, key_size=2048).public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    kms = FakeKMS(_records(
+        off=KeyRecord("disabled", None, b"", "none"),
+        sealed=KeyRecord("active", "sealed", pem, "sealed-server"),
+    ))
+    enc = EncryptionService(kms)
+
+    assert await enc.get_dek("nokey") == SYSTEM_DEK
+    assert await enc.get_tenant_mode("nokey") == "platform"
+    assert await enc.get_dek("off") is None
+    assert enc._dek_cache.get("off")[0] is enc_mod._DISABLED
+    assert await enc.get_dek("sealed") is None
+    assert await enc.get_tenant_mode("sealed") == "sealed"
+    assert "sealed" in enc._sealed_cache
+    assert kms.fetches == 4  # nokey, __system__, off, sealed — one each
+
+
+async def test_refresh_ahead_serves_cached_and_renews():
+    kms = FakeKMS(_records(acme=KeyRecord("active", "platform", b"a" * 32, "local-file")))
+    enc = EncryptionService(kms, cache_ttl=100)
+    await enc.get_dek("acme")
+
+    # Inside the refresh window: hit is served, renewal happens in background
+    enc._dek_cache["acme"] = (b"a" * 32, time.time() + 5)
+    kms.records["acme"] = KeyRecord("active", "platform", b"b" * 32, "local-file")
+    assert await enc.get_dek("acme") == b"a" * 32
+    await asyncio.sleep(0)  # let the refresh task register its resolution
+    await enc._inflight["acme"]
+    assert enc._dek_cache.get("acme")[0] == b"b" * 32
+    assert enc._dek_cache.get("acme")[1] > time.time() + 90
+
+
+def test_caches_are_bounded_lru():
+    enc = EncryptionService(MagicMock(), cache_size=3)
+    for t in "abc":
+        enc._dek_cache[t] = (b"k", 0)
+    enc._dek_cache.get("a")  # refresh recency
+    enc._dek_cache["d"] = (b"k", 0)
+    assert list(enc._dek_cache) == ["c", "a", "d"]
+
+
+async def test_vault_reuses_one_pooled_client():
+    clients: list[httpx.AsyncClient] = []
+    seen: list[httpx.Request] = []
+
+    def _handle(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"data": {"plaintext": base64.b64encode(b"k" * 32).decode()}})
+
+    kms = VaultTransitKMS("http://vault:8200/", "tok", "p8-master", MagicMock())
+    real = kms._http
+
+    def _http():
+        client = real()
+        if not clients or clients[-1] is not client:
+            client._transport = httpx.MockTransport(_handle)
+            clients.append(client)
+        return client
+
+    kms._http = _http  # type: ignore[method-assign]
+    record = KeyRecord("active", "platform", b"vault:v1:abc", "p8-master-acme")
+    try:
+        for _ in range(3):
+            assert await kms.unwrap_record("acme", record) == b"k" * 32
+    finally:
+        await kms.aclose()
+
+    assert len(clients) == 1
+    assert [str(r.url) for r in seen] == ["http://vault:8200/v1/transit/decrypt/p8-master-acme"] * 3
+    assert all(r.headers["X-Vault-Token"] == "tok" for r in seen)
@@ -0,0 +1,95 @@
+"""Unit tests for DreamingHandler fan-out (phase 1 sessions, phase 2 dreamers)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from p8.workers.handlers import dreaming
+from p8.workers.handlers.dreaming import DreamingHandler
+
+
+def _ctx():
+    return SimpleNamespace(db=MagicMock(), encryption=MagicMock(), queue=MagicMock(heartbeat=AsyncMock()))
+
+
+async def test_phase1_consolidates_sessions_concurrently():
+    db = MagicMock()
+    db.fetch = AsyncMock(return_value=[{"id": uuid4()} for _ in range(6)])
+    active = peak = 0
+
+    async def _build(session_id, **kw):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if session_id == db.fetch.return_value[0]["id"]:
+            raise RuntimeError("boom")
+        return SimpleNamespace(id=uuid4(), metadata={})
+
+    memory = MagicMock(maybe_build_moment=AsyncMock(side_effect=_build))
+    handler = DreamingHandler()
+    with patch.object(dreaming, "MemoryService", return_value=memory), \
+            patch.object(handler, "_enrich_moment_with_resources", new_callable=AsyncMock):
+        result = await handler._build_session_moments(uuid4(), None, db, MagicMock())
+
+    assert result == {"sessions_checked": 6, "moments_built": 5}
+    assert peak == dreaming.PHASE1_CONCURRENCY
+
+
+async def test_dreamers_run_concurrently_with_per_agent_accounting():
+    handler = DreamingHandler()
+    ctx = _ctx()
+    started: list[str] = []
+
+    async def _dream(agent_name, *args):
+        started.append(agent_name)
+        await asyncio.sleep(0.05)
+        if agent_name == "broken":
+            raise RuntimeError("model down")
+        return {"status": "ok", "io_tokens": 100, "moments_saved": 1, "session_id": f"s-{agent_name}"}
+
+    with patch.object(handler, "_load_dreaming_context", new_callable=AsyncMock,
+                      return_value=("context", {"moments": 1})) as load, \
+            patch.object(handler, "_resolve_dreamer_agents", new_callable=AsyncMock,
+                         return_value=["a", "broken", "b"]), \
+            patch.object(handler, "_has_recent_activity", new_callable=AsyncMock, return_value=True), \
+            patch.object(handler, "_run_single_dreamer", side_effect=_dream):
+        t0 = asyncio.get_running_loop().time()
+        result = await handler._run_dreaming_agent(uuid4(), 1, ctx, task={"id": "t1"})
+        elapsed = asyncio.get_running_loop().time() - t0
+
+    assert elapsed < 0.12  # three 50ms dreamers overlapped
+    load.assert_awaited_once()
+    assert result["io_tokens"] == 200
+    assert result["moments_saved"] == 2
+    assert result["session_ids"] == ["s-a", "s-b"]
+    by_agent = {d["agent_name"]: d for d in result["dreamers"]}
+    assert by_agent["broken"]["status"] == "error"
+    assert by_agent["a"]["io_tokens"] == 100
+    assert ctx.queue.heartbeat.await_count == 3
+
+
+async def test_heartbeat_is_noop_outside_worker():
+    await DreamingHandler._heartbeat({}, SimpleNamespace(db=None))
+    ctx = _ctx()
+    ctx.queue.heartbeat.side_effect = RuntimeError("db gone")
+    await DreamingHandler._heartbeat({"id": "t1"}, ctx)  # logged, not raised
+
+
+async def test_inactive_user_skips_context_load():
+    handler = DreamingHandler()
+    ctx = _ctx()
+    ctx.db.fetchrow = AsyncMock(return_value={"last_active": datetime.now(timezone.utc) - timedelta(days=3)})
+
+    with patch.object(handler, "_load_dreaming_context", new_callable=AsyncMock) as load:
+        result = await handler._run_dreaming_agent(uuid4(), 1, ctx, task={})
+    assert result == {"status": "skipped_no_data", "io_tokens": 0}
+    load.assert_not_awaited()
+
+    ctx.db.fetchrow = AsyncMock(return_value=None)  # no watermark yet → treated as active
+    assert await handler._has_recent_activity(ctx.db, uuid4(), 1)
@@ -0,0 +1,83 @@
+"""Unit tests for ExtractionPool — warm worker reuse, recycling, timeouts."""
+
+from __future__ import annotations
+
+import pytest
+
+from p8.services import extraction
+from p8.services.extraction import ExtractionPool
+
+# Same protocol as the real worker, without kreuzberg: "slow" paths hang,
+# "bad" paths return an error reply, anything else echoes the path.
+_FAKE_WORKER = """
+import json, os, sys, time
+out = sys.stdout
+out.write(json.dumps({"ready": True, "rss_kb": 1}) + "\\n"); out.flush()
+for line in sys.stdin:
+    job = json.loads(line)
+    if "slow" in job["path"]:
+        time.sleep(60)
+    msg = {"error": "ValueError: bad"} if "bad" in job["path"] else {"content": job["path"], "chunks": [str(os.getpid())]}
+    msg["rss_kb"] = 4096 if "fat" in job["path"] else 1
+    out.write(json.dumps(msg) + "\\n"); out.flush()
+"""
+
+
+@pytest.fixture
+def fake_worker(monkeypatch):
+    monkeypatch.setattr(extraction, "_WORKER_SCRIPT", _FAKE_WORKER)
+
+
+async def _pid(pool, path="doc.txt") -> str:
+    _, [pid] = await pool.extract(path, "text/plain", 100, 0)
+    return pid
+
+
+async def test_workers_are_reused_and_recycled(fake_worker):
+    pool = ExtractionPool(1, max_jobs=2, max_rss_mb=2)
+    try:
+        first = await _pid(pool)
+        assert await _pid(pool) == first  # warm reuse
+        third = await _pid(pool)
+        assert third != first  # recycled after max_jobs
+        await _pid(pool, "fat.txt")
+        assert await _pid(pool) != third  # recycled on RSS growth
+    finally:
+        await pool.close()
+
+
+async def test_error_reply_keeps_worker(fake_worker):
+    pool = ExtractionPool(1)
+    try:
+        first = await _pid(pool)
+        with pytest.raises(RuntimeError, match="ValueError: bad"):
+            await pool.extract("bad.txt", "text/plain", 100, 0)
+        assert await _pid(pool) == first
+    finally:
+        await pool.close()
+
+
+async def test_timeout_kills_worker(fake_worker):
+    pool = ExtractionPool(1, timeout=0.5)
+    try:
+        await pool.start()
+        [worker] = pool._idle
+        with pytest.raises(RuntimeError, match="timed out"):
+            await pool.extract("slow.txt", "text/plain", 100, 0)
+        assert worker.proc.returncode is not None
+        assert not pool._idle
+        assert (await pool.extract("ok.txt", "text/plain", 100, 0))[0] == "ok.txt"
+    finally:
+        await pool.close()
+
+
+async def test_real_kreuzberg_worker(tmp_path):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("hello warm pool " * 50)
+    pool = ExtractionPool(1)
+    try:
+        text, chunks = await pool.extract(doc, "text/plain", 200, 0)
+        assert "hello warm pool" in text
+        assert len(chunks) > 1
+    finally:
+        await pool.close()
@@ -0,0 +1,175 @@
+"""Unit tests for the Google Drive sync engine (listing, changes feed, hand-off)."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from p8.ontology.types import StorageGrant
+from p8.services.providers import gdrive
+from p8.services.providers.gdrive import GoogleDriveService
+
+USER = uuid4()
+PDF = "application/pdf"
+
+
+def _f(fid, mtime="2026-01-02T00:00:00Z", mime=PDF, parents=("fold",)):
+    return {"id": fid, "name": f"{fid}.pdf", "mimeType": mime, "modifiedTime": mtime, "parents": list(parents)}
+
+
+def _service(grant: StorageGrant, synced: dict | None = None, **settings):
+    db = MagicMock()
+    db.fetchrow = AsyncMock(return_value=grant.model_dump())
+    db.execute = AsyncMock()
+    synced = synced or {}
+    db.fetch = AsyncMock(side_effect=lambda sql, user_id, ids: [
+        {"provider_file_id": i, **synced[i]} for i in ids if i in synced
+    ])
+    cfg = SimpleNamespace(**{
+        "gdrive_sync_concurrency": 2, "file_processing_threshold_bytes": 1024, "s3_bucket": "", **settings,
+    })
+    content = MagicMock()
+    content.ingest = AsyncMock(side_effect=lambda data, name, **kw: SimpleNamespace(file=SimpleNamespace(id=uuid4())))
+    svc = GoogleDriveService(db, MagicMock(), cfg, content)
+    svc._get_access_token = AsyncMock(return_value="tok")  # type: ignore[method-assign]
+    return svc
+
+
+@pytest.fixture
+def drive_api(monkeypatch):
+    """Route httpx.AsyncClient to a MockTransport; returns the request log + route table."""
+    routes: dict[str, object] = {}
+    seen: list[httpx.Request] = []
+
+    def _handle(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        key = request.url.path.removeprefix("/drive/v3")
+        if key.startswith("/files/") and request.url.params.get("alt") == "media":
+            body = routes.get(key, b"x" * 10)
+            if isinstance(body, Exception):
+                return httpx.Response(500)
+            return httpx.Response(200, content=body)
+        handler = routes[key]
+        return httpx.Response(200, json=handler(request) if callable(handler) else handler)
+
+    real = httpx.AsyncClient
+    monkeypatch.setattr(gdrive.httpx, "AsyncClient", lambda **kw: real(transport=httpx.MockTransport(_handle), **kw))
+    return routes, seen
+
+
+def _executes(svc, needle):
+    return [c.args for c in svc.db.execute.await_args_list if needle in c.args[0]]
+
+
+async def test_full_listing_checkpoints_pages_and_switches_to_changes(drive_api):
+    routes, _ = drive_api
+    routes["/changes/startPageToken"] = {"startPageToken": "start-1"}
+    pages = {
+        None: {"files": [_f("same"), _f("newer", "2026-03-01T00:00:00Z"), _f("sheet", mime="image/png")],
+               "nextPageToken": "p2"},
+        "p2": {"files": [_f("fresh")]},
+    }
+    routes["/files"] = lambda req: pages[req.url.params.get("pageToken")]
+    old_id = uuid4()
+    grant = StorageGrant(user_id_ref=USER, provider="google-drive", metadata={"refresh_token": "r"})
+    svc = _service(grant, {
+        "same": {"id": uuid4(), "provider_modified_time": "2026-01-02T00:00:00Z"},
+        "newer": {"id": old_id, "provider_modified_time": "2026-01-02T00:00:00Z"},
+    })
+
+    result = await svc.sync_folder(USER, "t", folder_id="fold")
+
+    assert (result.synced, result.updated, result.skipped, result.errors) == (1, 1, 2, 0)
+    assert svc.db.fetch.await_count == 2  # one synced-state query per page
+    [checkpoint] = _executes(svc, "sync_checkpoint', $2")
+    assert checkpoint[2] == {"folder_id": "fold", "start_page_token": "start-1", "page_token": "p2"}
+    [final] = _executes(svc, "sync_cursor = $2,")
+    assert final[2] == "start-1"
+    assert _executes(svc, "deleted_at = NOW()")[0][1] == old_id
+
+
+async def test_resumes_from_checkpoint(drive_api):
+    routes, seen = drive_api
+    routes["/files"] = {"files": [_f("fresh")]}
+    grant = StorageGrant(user_id_ref=USER, provider="google-drive", metadata={
+        "refresh_token": "r",
+        "sync_checkpoint": {"folder_id": "fold", "start_page_token": "s0", "page_token": "p7"},
+    })
+    svc = _service(grant)
+
+    await svc.sync_folder(USER, "t", folder_id="fold")
+
+    listing = [r for r in seen if r.url.path.endswith("/files")]
+    assert listing[0].url.params["pageToken"] == "p7"
+    assert not any(r.url.path.endswith("/startPageToken") for r in seen)
+    assert _executes(svc, "sync_cursor = $2,")[0][2] == "s0"
+
+
+async def test_changes_feed_filters_folder_and_holds_cursor_on_error(drive_api):
+    routes, _ = drive_api
+    routes["/files/bad"] = RuntimeError("boom")
+    feeds = {
+        "c1": {"changes": [
+            {"fileId": "a", "file": _f("a")},
+            {"fileId": "elsewhere", "file": _f("elsewhere", parents=("other",))},
+            {"fileId": "gone", "removed": True},
+        ], "nextPageToken": "c2"},
+        "c2": {"changes": [{"fileId": "bad", "file": _f("bad")}], "newStartPageToken": "c3"},
+    }
+    routes["/changes"] = lambda req: feeds[req.url.params["pageToken"]]
+    grant = StorageGrant(user_id_ref=USER, provider="google-drive", sync_cursor="c1",
+                         metadata={"refresh_token": "r"})
+    svc = _service(grant)
+
+    result = await svc.sync_folder(USER, "t", folder_id="fold")
+
+    assert (result.synced, result.errors) == (1, 1)
+    assert [a[2] for a in _executes(svc, "SET sync_cursor = $2 WHERE")] == ["c2"]
+
+
+async def test_large_files_are_handed_to_file_processing(drive_api):
+    routes, _ = drive_api
+    routes["/files"] = {"files": [_f("big"), _f("small")]}
+    routes["/changes/startPageToken"] = {"startPageToken": "s"}
+    routes["/files/big"] = b"x" * 4096
+    grant = StorageGrant(user_id_ref=USER, provider="google-drive", metadata={"refresh_token": "r"})
+    svc = _service(grant, s3_bucket="bucket")
+    svc.content_service.file_service.write_fileobj_to_bucket = AsyncMock(return_value="s3://bucket/k")
+    queue = MagicMock(enqueue_file=AsyncMock())
+    repo = MagicMock(upsert=AsyncMock(side_effect=lambda e: [e]))
+
+    with patch.object(gdrive, "QueueService", return_value=queue), \
+            patch.object(gdrive, "Repository", return_value=repo):
+        result = await svc.sync_folder(USER, "t", folder_id="fold")
+
+    assert (result.synced, result.queued) == (2, 1)
+    [entity] = repo.upsert.await_args.args
+    assert entity.size_bytes == 4096 and entity.metadata["provider_file_id"] == "big"
+    queue.enqueue_file.assert_awaited_once_with(entity.id, user_id=USER, tenant_id="t")
+    assert svc.content_service.ingest.await_count == 1  # only the small file inline
+
+
+async def test_token_error_cancels_sibling_file_syncs():
+    svc = _service(StorageGrant(user_id_ref=USER, provider="google-drive", metadata={"refresh_token": "r"}))
+    cancelled = []
+
+    async def sync_file(drive, df, existing, user_id, tenant_id, result):
+        if df.id == "revoked":
+            raise gdrive.OAuthTokenError("token revoked")
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(df.id)
+            raise
+
+    svc._sync_file = sync_file  # type: ignore[method-assign]
+    files = [gdrive._drive_file(_f(fid)) for fid in ("slow", "revoked")]
+
+    with pytest.raises(gdrive.OAuthTokenError):
+        await svc._sync_page(MagicMock(), files, USER, "t", asyncio.Semaphore(2), gdrive.SyncResult(), force=False)
+    assert cancelled == ["slow"]
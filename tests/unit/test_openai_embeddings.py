@@ -0,0 +1,156 @@
+"""Unit tests for OpenAIRestProvider against a local stub embeddings server."""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from p8.services.embeddings import OpenAIRestProvider
+
+
+@pytest.fixture(autouse=True)
+def _word_tokens(monkeypatch):
+    """Whitespace token counts — keeps batching deterministic and offline."""
+    monkeypatch.setattr(
+        "p8.utils.tokens.estimate_tokens_many",
+        lambda texts, model="gpt-4o": [len(t.split()) if t else 0 for t in texts],
+    )
+
+
+class _StubState:
+    def __init__(self):
+        self.requests: list[list[str]] = []
+        self.throttle_first = 0  # respond 429 to the first N requests
+        self.lock = threading.Lock()
+
+
+@pytest.fixture
+def stub_server():
+    state = _StubState()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with state.lock:
+                throttle = state.throttle_first > 0
+                if throttle:
+                    state.throttle_first -= 1
+                else:
+                    state.requests.append(body["input"])
+
+            if throttle:
+                payload = b'{"error": {"message": "rate limited"}}'
+                self.send_response(429)
+                self.send_header("retry-after-ms", "20")
+            else:
+                data = [
+                    # Reverse order — the provider must sort by index
+                    {"index": i, "embedding": [float(len(text)), float(i)]}
+                    for i, text in reversed(list(enumerate(body["input"])))
+                ]
+                payload = json.dumps({"data": data}).encode()
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+async def test_embed_preserves_input_order(stub_server):
+    provider = OpenAIRestProvider("sk-test", dimensions=2, base_url=stub_server.url)
+    try:
+        texts = ["a", "bb", "ccc"]
+        vectors = await provider.embed(texts)
+    finally:
+        await provider.aclose()
+    assert [v[0] for v in vectors] == [1.0, 2.0, 3.0]
+
+
+async def test_client_is_reused_across_calls(stub_server):
+    provider = OpenAIRestProvider("sk-test", dimensions=2, base_url=stub_server.url)
+    try:
+        await provider.embed(["one"])
+        client = provider._client
+        await provider.embed(["two"])
+        assert provider._client is client
+    finally:
+        await provider.aclose()
+
+
+async def test_inputs_split_by_count_and_tokens(stub_server):
+    provider = OpenAIRestProvider(
+        "sk-test", dimensions=2, base_url=stub_server.url,
+        max_batch_inputs=3, max_batch_tokens=10_000, max_concurrency=2,
+    )
+    try:
+        texts = [f"text number {i}" for i in range(7)]
+        vectors = await provider.embed(texts)
+    finally:
+        await provider.aclose()
+    assert len(vectors) == 7
+    assert sorted(len(r) for r in stub_server.requests) == [1, 3, 3]
+    assert [v[0] for v in vectors] == [float(len(t)) for t in texts]
+
+    token_limited = OpenAIRestProvider("sk-test", max_batch_tokens=5)
+    batches = await token_limited._plan_batches(["one two three four", "five six seven eight", "x"])
+    assert batches == [[0], [1, 2]]  # 4 | 4 + 1 under a 5-token budget
+
+
+
+async def test_plan_batches_counts_off_loop_only_for_large_input(monkeypatch):
+    from p8.utils import tokens
+
+    offloaded = []
+
+    async def fake_to_thread(fn, *args):
+        offloaded.append(len(args[0]))
+        return fn(*args)
+
+    monkeypatch.setattr(tokens.asyncio, "to_thread", fake_to_thread)
+    provider = OpenAIRestProvider("sk-test")
+    assert await provider._plan_batches(["what did I say about rust"]) == [[0]]
+    assert offloaded == []
+    await provider._plan_batches(["word " * 1000] * 20)
+    assert offloaded == [20]
+
+async def test_rate_limit_retried_with_retry_after(stub_server):
+    stub_server.throttle_first = 2
+    provider = OpenAIRestProvider(
+        "sk-test", dimensions=2, base_url=stub_server.url, backoff_base=0.01,
+    )
+    try:
+        vectors = await provider.embed(["hello"])
+    finally:
+        await provider.aclose()
+    assert vectors == [[5.0, 0.0]]
+    assert stub_server.requests == [["hello"]]
+
+
+async def test_rate_limit_gives_up_after_max_retries(stub_server):
+    import httpx
+
+    stub_server.throttle_first = 10
+    provider = OpenAIRestProvider(
+        "sk-test", dimensions=2, base_url=stub_server.url, max_retries=1,
+    )
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            await provider.embed(["hello"])
+    finally:
+        await provider.aclose()
@@ -0,0 +1,123 @@
+"""Unit tests for QueryEmbeddingCache and its use in RemQueryEngine SEARCH."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from p8.services.database.query_engine import RemQueryEngine
+from p8.services.embeddings import LocalEmbeddingProvider, QueryEmbeddingCache
+
+
+class CountingProvider(LocalEmbeddingProvider):
+    def __init__(self, dimensions: int = 8):
+        super().__init__(dimensions)
+        self.calls: list[list[str]] = []
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        return await super().embed(texts)
+
+
+async def test_repeated_and_near_identical_queries_hit():
+    provider = CountingProvider()
+    cache = QueryEmbeddingCache(max_entries=10)
+
+    v1 = await cache.get_or_embed(provider, "database migration")
+    v2 = await cache.get_or_embed(provider, "  Database   MIGRATION ")
+    assert v1 == v2
+    assert provider.calls == [["database migration"]]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+async def test_miss_embeds_original_text():
+    provider = CountingProvider()
+    cache = QueryEmbeddingCache()
+    await cache.get_or_embed(provider, "Apple  ｉＰｈｏｎｅ")
+    await cache.get_or_embed(provider, "apple iphone")
+    assert provider.calls == [["Apple  ｉＰｈｏｎｅ"]]
+
+async def test_key_includes_provider_and_dimensions():
+    cache = QueryEmbeddingCache()
+    small, large = CountingProvider(8), CountingProvider(16)
+    await cache.get_or_embed(small, "topic")
+    await cache.get_or_embed(large, "topic")
+    assert len(small.calls) == len(large.calls) == 1
+    assert cache.stats()["misses"] == 2
+
+
+async def test_lru_eviction():
+    provider = CountingProvider()
+    cache = QueryEmbeddingCache(max_entries=2)
+    await cache.get_or_embed(provider, "a")
+    await cache.get_or_embed(provider, "b")
+    await cache.get_or_embed(provider, "a")  # refresh a
+    await cache.get_or_embed(provider, "c")  # evicts b
+    await cache.get_or_embed(provider, "a")
+    await cache.get_or_embed(provider, "b")
+    assert [c[0] for c in provider.calls] == ["a", "b", "c", "b"]
+    assert cache.stats()["entries"] == 2
+
+
+async def test_ttl_expiry(monkeypatch):
+    provider = CountingProvider()
+    cache = QueryEmbeddingCache(ttl=10)
+    now = [1000.0]
+    monkeypatch.setattr("p8.services.embeddings.time.monotonic", lambda: now[0])
+
+    await cache.get_or_embed(provider, "x")
+    now[0] += 5
+    await cache.get_or_embed(provider, "x")
+    now[0] += 11
+    await cache.get_or_embed(provider, "x")
+    assert len(provider.calls) == 2
+
+
+async def test_shared_tier_hit_skips_provider():
+    provider = CountingProvider(dimensions=3)
+    db = MagicMock()
+    db.fetchval = AsyncMock(return_value=json.dumps([0.1, 0.2, 0.3]))
+    db.execute = AsyncMock()
+    cache = QueryEmbeddingCache(db=db)
+
+    vec = await cache.get_or_embed(provider, "shared query")
+    assert vec == [0.1, 0.2, 0.3]
+    assert provider.calls == []
+    assert cache.stats()["shared_hits"] == 1
+
+    # Now in the local tier — no second DB read
+    await cache.get_or_embed(provider, "shared query")
+    assert db.fetchval.await_count == 1
+
+
+async def test_shared_tier_miss_writes_back():
+    provider = CountingProvider(dimensions=3)
+    db = MagicMock()
+    db.fetchval = AsyncMock(return_value=None)
+    db.execute = AsyncMock()
+    cache = QueryEmbeddingCache(db=db)
+
+    await cache.get_or_embed(provider, "fresh")
+    assert len(provider.calls) == 1
+    db.execute.assert_awaited_once()
+    assert "query_embedding_cache" in db.execute.await_args.args[0]
+
+
+async def test_engine_search_uses_cache():
+    provider = CountingProvider()
+    db = MagicMock()
+    db.rem_search = AsyncMock(return_value=[])
+    settings = MagicMock()
+    settings.query_embedding_cache_size = 100
+    settings.query_embedding_cache_ttl = 60
+    settings.query_embedding_cache_shared = False
+    settings.embedding_min_similarity = 0.3
+
+    engine = RemQueryEngine(db, settings, _embedding_provider=provider)
+    await engine.execute('SEARCH "quarterly planning" FROM resources')
+    await engine.execute('SEARCH "quarterly planning" FROM moments LIMIT 3')
+
+    assert len(provider.calls) == 1
+    assert db.rem_search.await_count == 2
+    assert engine.embedding_cache.stats()["hits"] == 1
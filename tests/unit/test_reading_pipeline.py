@@ -0,0 +1,120 @@
+"""Unit tests for ReadingSummaryHandler — off-loop feed fetch, bulk upsert, concurrent stages."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from types import ModuleType, SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from p8.workers.handlers import reading
+from p8.workers.handlers.reading import ReadingSummaryHandler
+
+
+def _resource(rid, name):
+    return SimpleNamespace(
+        id=rid, name=name, uri=f"https://x/{name}", content="c", category="news",
+        image_uri=None, related_entities=[], tags=["t"], metadata={},
+    )
+
+
+@pytest.fixture
+def platoon(monkeypatch):
+    """Fake platoon whose FeedProvider.run blocks like real network I/O."""
+    state = SimpleNamespace(resources=[], delay=0.0, thread=None)
+
+    class FeedProvider:
+        def __init__(self, tavily_key=None):
+            pass
+
+        def run(self, config, user_id=None):
+            state.thread = threading.current_thread().name
+            time.sleep(state.delay)
+            return SimpleNamespace(resources=state.resources)
+
+    config = ModuleType("platoon.config")
+    config.resolve_for_user = lambda meta, config=None: {}  # type: ignore[attr-defined]
+    providers = ModuleType("platoon.providers")
+    providers.FeedProvider = FeedProvider  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "platoon", ModuleType("platoon"))
+    monkeypatch.setitem(sys.modules, "platoon.config", config)
+    monkeypatch.setitem(sys.modules, "platoon.providers", providers)
+    return state
+
+
+def _ctx():
+    db = MagicMock()
+    db.fetchrow = AsyncMock(return_value={"metadata": {"interests": ["ai"]}})
+    return SimpleNamespace(db=db, encryption=MagicMock(), queue=MagicMock(heartbeat=AsyncMock()), settings=None)
+
+
+async def test_feed_fetch_runs_off_the_event_loop(platoon):
+    platoon.delay = 0.2
+    ticks = 0
+
+    async def _ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(_ticker())
+    try:
+        result = await ReadingSummaryHandler().handle({"user_id": str(uuid4())}, _ctx())
+    finally:
+        ticker.cancel()
+
+    assert result == {"status": "ok", "resources": 0}
+    assert platoon.thread.startswith("platoon")
+    assert ticks >= 10  # loop kept running during the blocking fetch
+
+
+async def test_feed_fetch_timeout_raises(platoon, monkeypatch):
+    platoon.delay = 0.3
+    monkeypatch.setattr(reading, "FEED_FETCH_TIMEOUT", 0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        await ReadingSummaryHandler().handle({"user_id": str(uuid4())}, _ctx())
+
+
+async def test_bulk_upsert_and_concurrent_summary(platoon):
+    rid = uuid4()
+    platoon.resources = [_resource(rid, "a"), _resource(uuid4(), "b"), _resource(rid, "a2")]
+    repo = MagicMock(upsert=AsyncMock(side_effect=lambda es: list(es)))
+    memory = MagicMock(create_moment_session=AsyncMock(
+        return_value=(SimpleNamespace(id=uuid4()), SimpleNamespace(id=uuid4())),
+    ))
+    handler = ReadingSummaryHandler()
+    order: list[str] = []
+
+    async def _stage(name, value):
+        order.append(f"{name}-start")
+        await asyncio.sleep(0.02)
+        order.append(f"{name}-end")
+        return value
+
+    async def _mosaic(items):
+        return await _stage("mosaic", "data:img")
+
+    async def _summarize(items):
+        return await _stage("llm", "You have news.")
+
+    with patch.object(reading, "Repository", return_value=repo), \
+            patch.object(reading, "MemoryService", return_value=memory), \
+            patch.object(handler, "_mosaic", _mosaic), \
+            patch.object(handler, "_llm_summarize", _summarize), \
+            patch("p8.services.usage.get_user_plan", new_callable=AsyncMock), \
+            patch("p8.services.usage.increment_usage", new_callable=AsyncMock):
+        result = await handler.handle({"user_id": str(uuid4())}, _ctx())
+
+    repo.upsert.assert_awaited_once()
+    [entities] = repo.upsert.await_args.args
+    assert [e.name for e in entities] == ["a2", "b"]  # deduped by id, last wins
+    assert result["resources"] == 2
+    assert order[:2] == ["mosaic-start", "llm-start"]
+    kwargs = memory.create_moment_session.await_args.kwargs
+    assert (kwargs["summary"], kwargs["image_uri"]) == ("You have news.", "data:img")
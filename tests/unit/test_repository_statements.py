@@ -0,0 +1,73 @@
+"""Unit tests for Repository SQL canonicalization and the statement cache."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from p8.ontology.types import Resource
+from p8.services.repository import Repository, StatementCache, statement_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    statement_cache.clear()
+    yield
+    statement_cache.clear()
+
+
+def _repo():
+    db = MagicMock()
+    db.fetch = AsyncMock(return_value=[])
+    encryption = MagicMock()
+    encryption.encrypt_fields = lambda model, data, tenant_id: data
+    return Repository(Resource, db, encryption), db
+
+
+async def test_upsert_sql_is_independent_of_field_subset():
+    repo, db = _repo()
+    await repo.upsert(Resource(name="a", content="x", category="doc"))
+    await repo.upsert(Resource(name="b", uri="s3://b/k", ordinal=3, user_id=uuid4()))
+    await repo.upsert([Resource(name="c"), Resource(name="d", summary="s", image_uri="i")])
+
+    first, *rest = (c.args[0] for c in db.fetch.await_args_list)
+    assert all(sql == first for sql in rest)
+    assert f"INSERT INTO resources ({', '.join(Resource.model_fields)})" in first
+    # Fields a row doesn't carry arrive as NULL and keep the stored value
+    assert "uri = COALESCE(EXCLUDED.uri, resources.uri)" in first
+    assert statement_cache.stats() == {"entries": 1, "hits": 2, "misses": 1}
+
+
+async def test_upsert_preserve_set_is_part_of_key():
+    repo, db = _repo()
+    await repo.upsert(Resource(name="a"))
+    await repo.upsert(Resource(name="b", tags=[]))
+
+    first, second = (c.args[0] for c in db.fetch.await_args_list)
+    assert "tags = COALESCE(resources.tags, EXCLUDED.tags)" in first
+    assert "tags = COALESCE(EXCLUDED.tags, resources.tags)" in second
+    assert statement_cache.misses == 2
+
+
+async def test_find_filters_are_canonicalized():
+    repo, db = _repo()
+    await repo.find(tenant_id="t1", filters={"name": "a", "category": "doc"})
+    await repo.find(tenant_id="t2", filters={"category": "note", "name": "b"})
+
+    (sql1, *args1), (sql2, *args2) = (c.args for c in db.fetch.await_args_list)
+    assert sql1 == sql2
+    assert sql1.index("name = $2") < sql1.index("category = $3")
+    assert args1 == ["t1", "a", "doc", 50, 0]
+    assert args2 == ["t2", "b", "note", 50, 0]
+    assert statement_cache.hits == 1
+
+
+def test_lru_bound():
+    cache = StatementCache(max_entries=2)
+    for key in ("a", "b", "a", "c"):
+        cache.get(key, lambda k=key: f"SELECT '{k}'")
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 3}
+    cache.get("b", lambda: "SELECT 'b'")
+    assert cache.misses == 4
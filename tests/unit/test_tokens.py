@@ -0,0 +1,86 @@
+"""Unit tests for p8.utils.tokens — LRU, batch and approximate paths (offline)."""
+
+from __future__ import annotations
+
+import pytest
+
+from p8.utils import tokens
+
+
+class _WordEncoder:
+    """Stand-in for a tiktoken Encoding: one token per word, counts calls."""
+
+    def __init__(self):
+        self.encoded: list[str] = []
+
+    def encode_ordinary(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_ordinary_batch(self, texts, num_threads=8):
+        self.encoded.extend(texts)
+        return [t.split() for t in texts]
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    enc = _WordEncoder()
+    monkeypatch.setitem(tokens._encoder_cache, "test-model", enc)
+    monkeypatch.setattr(tokens, "_count_cache", type(tokens._count_cache)())
+    return enc
+
+
+def _doc(words: int, tag: str = "w") -> str:
+    return " ".join(f"{tag}{i % 97}" for i in range(words))
+
+
+def test_repeated_text_hits_lru(encoder):
+    doc = _doc(500)
+    assert tokens.estimate_tokens(doc, "test-model") == 500
+    assert tokens.estimate_tokens(doc, "test-model") == 500
+    assert encoder.encoded == [doc]
+
+
+def test_short_texts_bypass_cache(encoder):
+    tokens.estimate_tokens("two words", "test-model")
+    assert tokens.token_cache_stats()["entries"] == 0
+
+
+def test_many_preserves_order_and_batches_misses(encoder):
+    cached = _doc(300, "c")
+    tokens.estimate_tokens(cached, "test-model")
+    encoder.encoded.clear()
+
+    counts = tokens.estimate_tokens_many([_doc(400), None, cached, "a b c", ""], "test-model")
+    assert counts == [400, 0, 300, 3, 0]
+    assert cached not in encoder.encoded
+    assert len(encoder.encoded) == 2
+
+
+def test_approximate_is_close_and_bounded(encoder):
+    doc = _doc(20_000)
+    exact = len(doc.split())
+    approx = tokens.estimate_tokens(doc, "test-model", approximate=True)
+    assert abs(approx - exact) / exact < 0.05
+    assert approx <= len(doc.encode("utf-8"))
+    # Only the samples were encoded, not the whole document
+    assert sum(len(t) for t in encoder.encoded) < len(doc) // 4
+
+
+def test_approximate_short_text_is_exact(encoder):
+    assert tokens.estimate_tokens(_doc(50), "test-model", approximate=True) == 50
+
+
+async def test_async_many_offloads_large_batches(encoder, monkeypatch):
+    calls = []
+
+    async def fake_to_thread(fn, *args):
+        calls.append(fn)
+        return fn(*args)
+
+    monkeypatch.setattr(tokens.asyncio, "to_thread", fake_to_thread)
+    assert await tokens.aestimate_tokens_many(["a b"], "test-model") == [2]
+    assert calls == []
+    big = _doc(20_000)
+    assert await tokens.aestimate_tokens_many([big], "test-model") == [20_000]
+    assert calls == [tokens.estimate_tokens_many]
@@ -0,0 +1,80 @@
+"""Unit tests for VectorIndexManager planning and apply."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from p8.services.vector_indexes import IndexAction, VectorIndexManager, tenant_index_name
+
+
+def _row(table, tenant, rows, index_name=None, exists=False):
+    return {
+        "table_name": table,
+        "tenant_id": tenant,
+        "row_count": rows,
+        "index_name": index_name,
+        "index_exists": exists,
+    }
+
+
+def _db(rows):
+    db = MagicMock()
+    db.fetch = AsyncMock(return_value=rows)
+    db.fetchval = AsyncMock(return_value="CREATE INDEX CONCURRENTLY ...")
+    db.execute = AsyncMock()
+    return db
+
+
+def test_index_name_is_deterministic_and_short():
+    name = tenant_index_name("resources", "acme")
+    assert name == tenant_index_name("resources", "acme")
+    assert name != tenant_index_name("resources", "globex")
+    assert len(tenant_index_name("x" * 100, "t" * 100)) <= 63
+
+
+async def test_plan_creates_for_large_and_drops_for_shrunk():
+    existing = tenant_index_name("moments", "shrunk")
+    db = _db([
+        _row("resources", "big", 80_000),
+        _row("resources", "indexed", 90_000, tenant_index_name("resources", "indexed"), True),
+        _row("resources", "small", 100),
+        _row("moments", "shrunk", 10_000, existing, True),
+        _row("moments", "hovering", 30_000, tenant_index_name("moments", "hovering"), True),
+    ])
+    manager = VectorIndexManager(db, min_rows=50_000)
+
+    plan = await manager.plan()
+    assert [(a.action, a.tenant_id) for a in plan] == [("create", "big"), ("drop", "shrunk")]
+    assert plan[1].index_name == existing
+
+
+async def test_plan_rebuilds_missing_registered_index():
+    name = tenant_index_name("resources", "big")
+    manager = VectorIndexManager(_db([_row("resources", "big", 80_000, name, False)]), min_rows=50_000)
+    assert [(a.action, a.index_name) for a in await manager.plan()] == [("create", name)]
+
+
+async def test_apply_create_registers_index():
+    db = _db([])
+    manager = VectorIndexManager(db)
+    action = IndexAction("create", "resources", "acme", "idx_x", 60_000)
+
+    done = await manager.apply([action])
+    assert done == [action]
+    assert db.fetchval.await_args.args[1:] == ("idx_x", "embeddings_resources", "acme")
+    db.execute.assert_any_await("CREATE INDEX CONCURRENTLY ...")
+    assert "SET index_name = $3" in db.execute.await_args.args[0]
+
+
+async def test_apply_failed_build_drops_invalid_index_and_continues():
+    db = _db([])
+    db.execute = AsyncMock(side_effect=[RuntimeError("boom"), None, None, None])
+    manager = VectorIndexManager(db)
+    failed = IndexAction("create", "resources", "acme", "idx_a", 60_000)
+    dropped = IndexAction("drop", "resources", "old", "idx_b", 10)
+
+    done = await manager.apply([failed, dropped])
+    assert done == [dropped]
+    statements = [c.args[0] for c in db.execute.await_args_list]
+    assert statements[1] == 'DROP INDEX CONCURRENTLY IF EXISTS "idx_a"'
+    assert statements[2] == 'DROP INDEX CONCURRENTLY IF EXISTS "idx_b"'
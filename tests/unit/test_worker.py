@@ -0,0 +1,205 @@
+"""Unit tests for TieredWorker — LISTEN/NOTIFY wakeups and concurrent execution."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from p8.services.queue import tier_channel
+from p8.workers.processor import TaskHandler, TieredWorker, _parse_type_limits, register_handler
+
+
+def test_tier_channel():
+    assert tier_channel("small") == "task_queue_small"
+
+
+async def test_notify_wakes_idle_worker_before_backstop():
+    worker = TieredWorker(tier="small", backstop_interval=30.0)
+    worker._listener = MagicMock()  # pretend LISTEN is active
+
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.05, worker._on_notify, "file_processing")
+
+    start = time.monotonic()
+    await worker._wait_for_work()
+    assert time.monotonic() - start < 1.0
+
+
+async def test_falls_back_to_poll_interval_without_listener():
+    worker = TieredWorker(tier="small", poll_interval=0.05, backstop_interval=30.0)
+    assert worker._listener is None
+
+    start = time.monotonic()
+    await worker._wait_for_work()
+    assert time.monotonic() - start < 1.0
+
+
+async def test_stop_wakes_waiting_worker():
+    worker = TieredWorker(tier="small", backstop_interval=30.0)
+    worker._listener = MagicMock()
+    worker._running = True
+
+    asyncio.get_running_loop().call_later(0.05, worker.stop)
+    await asyncio.wait_for(worker._wait_for_work(), timeout=1.0)
+    assert worker._running is False
+
+
+def test_listener_loss_reverts_to_polling():
+    worker = TieredWorker(tier="small")
+    worker._listener = MagicMock()
+    worker._on_listener_closed(worker._listener)
+    assert worker._listener is None
+
+
+# ---------------------------------------------------------------------------
+# Concurrent execution
+# ---------------------------------------------------------------------------
+
+
+def _fake_queue(tasks: list[dict]) -> MagicMock:
+    """Queue mock that hands out ``tasks`` in claim-sized slices, then nothing."""
+    pending = list(tasks)
+    queue = MagicMock()
+
+    async def claim(_tier, _worker_id, batch_size=1):
+        batch, pending[:] = pending[:batch_size], pending[batch_size:]
+        return batch
+
+    queue.claim = AsyncMock(side_effect=claim)
+    queue.listen = AsyncMock(side_effect=OSError("no LISTEN in unit tests"))
+    queue.check_task_quota = AsyncMock(return_value=True)
+    queue.track_usage = AsyncMock()
+    queue.fail = AsyncMock()
+    queue.heartbeat = AsyncMock()
+    queue.emit_event = AsyncMock()
+    return queue
+
+
+def _patch_bootstrap(queue: MagicMock):
+    @asynccontextmanager
+    async def _bootstrap():
+        yield MagicMock(), MagicMock(), MagicMock(), None, None, None, queue
+
+    return patch("p8.workers.processor.bootstrap_services", _bootstrap)
+
+
+class _SleepHandler(TaskHandler):
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+
+    async def handle(self, task, ctx):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return {"status": "ok"}
+
+
+async def _run_until_idle(worker: TieredWorker, queue: MagicMock, n_tasks: int) -> None:
+    runner = asyncio.create_task(worker.run())
+    while queue.track_usage.await_count + queue.fail.await_count < n_tasks:
+        await asyncio.sleep(0.01)
+    worker.stop()
+    await asyncio.wait_for(runner, timeout=2.0)
+
+
+async def test_concurrent_tasks_overlap():
+    handler = _SleepHandler(0.2)
+    register_handler("unit_sleep", handler)
+    tasks = [{"id": uuid4(), "task_type": "unit_sleep"} for _ in range(4)]
+    queue = _fake_queue(tasks)
+    worker = TieredWorker(tier="small", batch_size=4, concurrency=4, poll_interval=0.01)
+
+    start = time.monotonic()
+    with _patch_bootstrap(queue):
+        await _run_until_idle(worker, queue, len(tasks))
+
+    assert time.monotonic() - start < 0.6  # 4 × 0.2s sequential would be 0.8s
+    assert handler.peak == 4
+    assert queue.track_usage.await_count == 4
+
+
+async def test_type_concurrency_caps_parallelism():
+    handler = _SleepHandler(0.05)
+    register_handler("unit_capped", handler)
+    tasks = [{"id": uuid4(), "task_type": "unit_capped"} for _ in range(6)]
+    queue = _fake_queue(tasks)
+    worker = TieredWorker(
+        tier="small", batch_size=6, concurrency=6, poll_interval=0.01,
+        type_concurrency={"unit_capped": 2},
+    )
+
+    with _patch_bootstrap(queue):
+        await _run_until_idle(worker, queue, len(tasks))
+
+    assert handler.peak == 2
+
+
+async def test_inflight_tasks_are_heartbeated():
+    register_handler("unit_slow", _SleepHandler(0.2))
+    queue = _fake_queue([{"id": uuid4(), "task_type": "unit_slow"}])
+    worker = TieredWorker(
+        tier="small", concurrency=2, poll_interval=0.01, heartbeat_interval=0.05,
+    )
+
+    with _patch_bootstrap(queue):
+        await _run_until_idle(worker, queue, 1)
+
+    assert queue.heartbeat.await_count >= 2
+
+
+async def test_tasks_waiting_on_type_cap_are_heartbeated():
+    events: list[tuple[str, object]] = []
+
+    class _Recording(_SleepHandler):
+        async def handle(self, task, ctx):
+            events.append(("start", task["id"]))
+            return await super().handle(task, ctx)
+
+    register_handler("unit_queued", _Recording(0.3))
+    first, second = ({"id": uuid4(), "task_type": "unit_queued"} for _ in range(2))
+    queue = _fake_queue([first, second])
+    queue.heartbeat = AsyncMock(side_effect=lambda task_id: events.append(("beat", task_id)))
+    worker = TieredWorker(
+        tier="small", batch_size=2, concurrency=2, poll_interval=0.01, heartbeat_interval=0.05,
+        type_concurrency={"unit_queued": 1},
+    )
+
+    with _patch_bootstrap(queue):
+        await _run_until_idle(worker, queue, 2)
+
+    # second was claimed alongside first but sat behind the cap; it must
+    # already be heartbeated before its handler starts
+    assert ("beat", second["id"]) in events[:events.index(("start", second["id"]))]
+
+
+async def test_drain_requeues_tasks_past_timeout():
+    register_handler("unit_stuck", _SleepHandler(10.0))
+    task = {"id": uuid4(), "task_type": "unit_stuck"}
+    queue = _fake_queue([task])
+    worker = TieredWorker(tier="small", concurrency=2, poll_interval=0.01, drain_timeout=0.05)
+
+    with _patch_bootstrap(queue):
+        runner = asyncio.create_task(worker.run())
+        while not worker._inflight:
+            await asyncio.sleep(0.01)
+        worker.stop()
+        await asyncio.wait_for(runner, timeout=2.0)
+
+    queue.fail.assert_awaited_once()
+    assert queue.fail.await_args.args[0] == task["id"]
+
+
+def test_parse_type_limits():
+    assert _parse_type_limits(["dreaming=2", "news = 4"]) == {"dreaming": 2, "news": 4}
+    with pytest.raises(SystemExit):
+        _parse_type_limits(["dreaming"])